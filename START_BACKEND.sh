@@ -11,6 +11,15 @@ fi
 # Убиваем процесс на порту 8000 если занят
 lsof -ti:8000 | xargs kill -9 2>/dev/null
 
+# Миграции - до старта воркера и API, иначе скраперы пишут в старую схему
+alembic upgrade head || exit 1
+
+# Фоновый воркер (скраперы по расписанию, ручные запуски парсинга)
+echo "⚙️  Запускаю фоновый воркер EventHub..."
+python3 -m app.worker &
+WORKER_PID=$!
+trap 'kill $WORKER_PID 2>/dev/null' EXIT
+
 # Запускаем бэкенд
 echo "🚀 Запускаю бэкенд EventHub на порту 8000..."
 python3 -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
@@ -0,0 +1,59 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_add_hot_path_indexes"
+down_revision = "0004_add_resume_path_to_users"
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    # Фильтры GET /events/ + сортировка по (date_start, id)
+    ("ix_events_city_type_date_start", "events", ["city", "type", "date_start", "id"], {}),
+    ("ix_events_date_start_id", "events", ["date_start", "id"], {}),
+    # События организатора в порядке дат
+    ("ix_events_organizer_id_date_start", "events", ["organizer_id", "date_start"], {}),
+    ("ix_events_tags", "events", ["tags"], {"postgresql_using": "gin"}),
+    ("ix_event_registrations_event_id_user_id", "event_registrations", ["event_id", "user_id"], {}),
+    # PK chat_participants начинается с chat_id, поиск по user_id его не использует
+    ("ix_chat_participants_user_id", "chat_participants", ["user_id"], {}),
+    ("ix_messages_chat_id_created_at", "messages", ["chat_id", "created_at", "id"], {}),
+    # Доступные слоты - только опубликованные
+    (
+        "ix_internship_slots_published_slot_start",
+        "internship_slots",
+        ["slot_start", "id"],
+        {"postgresql_where": sa.text("status = 'published'")},
+    ),
+    ("ix_internship_slots_status_slot_start", "internship_slots", ["status", "slot_start"], {}),
+    # Используется InternshipSlot.required_skills.overlap()
+    ("ix_internship_slots_required_skills", "internship_slots", ["required_skills"], {"postgresql_using": "gin"}),
+    ("ix_users_created_at_id", "users", ["created_at", "id"], {}),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
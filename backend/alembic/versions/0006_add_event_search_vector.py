@@ -0,0 +1,56 @@
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0006_add_event_search_vector"
+down_revision = "0005_add_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+# Вектор поддерживается триггером, а не GENERATED колонкой: array_to_string
+# не IMMUTABLE. Триггер срабатывает и на INSERT ... ON CONFLICT DO UPDATE скрапера.
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION events_search_vector_update() RETURNS trigger AS $$
+DECLARE
+    tags_text text := coalesce(array_to_string(NEW.tags, ' '), '');
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', tags_text), 'B') ||
+        setweight(to_tsvector('english', tags_text), 'B') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER events_search_vector_trigger
+BEFORE INSERT OR UPDATE OF title, description, tags ON events
+FOR EACH ROW EXECUTE FUNCTION events_search_vector_update();
+"""
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute(SEARCH_VECTOR_TRIGGER)
+    # Заполняем вектор для существующих строк через тот же триггер
+    op.execute("UPDATE events SET title = title")
+    op.create_index(
+        "ix_events_search_vector",
+        "events",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_search_vector", table_name="events")
+    op.execute("DROP TRIGGER IF EXISTS events_search_vector_trigger ON events")
+    op.execute("DROP FUNCTION IF EXISTS events_search_vector_update()")
+    op.drop_column("events", "search_vector")
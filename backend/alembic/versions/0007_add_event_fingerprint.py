@@ -0,0 +1,59 @@
+import hashlib
+from datetime import timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_add_event_fingerprint"
+down_revision = "0006_add_event_search_vector"
+branch_labels = None
+depends_on = None
+
+
+def _fingerprint(source_url, title, date_start) -> str:
+    # Копия app.repositories.event_repository.event_fingerprint на момент миграции
+    if source_url:
+        raw = f"url:{source_url.strip()}"
+    else:
+        if date_start is not None:
+            if date_start.tzinfo is None:
+                date_start = date_start.replace(tzinfo=timezone.utc)
+            date_start = date_start.astimezone(timezone.utc)
+        raw = f"title:{(title or '').strip().lower()}|{date_start.isoformat() if date_start else ''}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("fingerprint", sa.String(length=64), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, source, source_url, title, date_start FROM events "
+            "WHERE source = 'external' ORDER BY id"
+        )
+    ).all()
+    seen = set()
+    for row in rows:
+        fingerprint = _fingerprint(row.source_url, row.title, row.date_start)
+        # Старые дубликаты оставляем без отпечатка, иначе уникальный индекс не создастся
+        if (row.source, fingerprint) in seen:
+            continue
+        seen.add((row.source, fingerprint))
+        conn.execute(
+            sa.text("UPDATE events SET fingerprint = :fingerprint WHERE id = :id"),
+            {"fingerprint": fingerprint, "id": row.id},
+        )
+
+    op.create_index(
+        "uq_events_source_fingerprint",
+        "events",
+        ["source", "fingerprint"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_events_source_fingerprint", table_name="events")
+    op.drop_column("events", "fingerprint")
@@ -0,0 +1,39 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_add_scraper_runs"
+down_revision = "0007_add_event_fingerprint"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scraper_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("source", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("fetch_ms", sa.Integer(), nullable=True),
+        sa.Column("http_status", sa.Integer(), nullable=True),
+        sa.Column("bytes_received", sa.Integer(), nullable=True),
+        sa.Column("parse_ms", sa.Integer(), nullable=True),
+        sa.Column("cards_found", sa.Integer(), nullable=True),
+        sa.Column("events_parsed", sa.Integer(), nullable=True),
+        sa.Column("inserted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("unchanged", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("db_ms", sa.Integer(), nullable=True),
+        sa.Column("error_class", sa.String(length=255), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_scraper_runs_source_started_at", "scraper_runs", ["source", "started_at"])
+    op.create_index("ix_scraper_runs_started_at", "scraper_runs", ["started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scraper_runs_started_at", table_name="scraper_runs")
+    op.drop_index("ix_scraper_runs_source_started_at", table_name="scraper_runs")
+    op.drop_table("scraper_runs")
@@ -0,0 +1,19 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_add_scraper_run_pages"
+down_revision = "0008_add_scraper_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "scraper_runs",
+        sa.Column("pages_fetched", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("scraper_runs", "pages_fetched")
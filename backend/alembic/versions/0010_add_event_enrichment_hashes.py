@@ -0,0 +1,19 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_add_event_enrichment_hashes"
+down_revision = "0009_add_scraper_run_pages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Существующие внешние события получат card_hash при следующем скрейпе и будут обогащены один раз
+    op.add_column("events", sa.Column("card_hash", sa.String(length=64), nullable=True))
+    op.add_column("events", sa.Column("enriched_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("events", "enriched_hash")
+    op.drop_column("events", "card_hash")
@@ -5,18 +5,16 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
+from app.core.principals import Principal, principal_cache
 from app.core.security import decode_token
-from app.models.user import User, UserRole
-from app.repositories.user_repository import UserRepository
+from app.models.user import UserRole
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+async def authenticate_token(db: AsyncSession, token: str) -> Principal:
+    """Access-токен -> активный принципал; иначе 401"""
     try:
         payload = decode_token(token)
     except Exception:
@@ -35,19 +33,26 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
-    user_repo = UserRepository()
-    user = await user_repo.get(db, int(user_id))
-    if not user or not user.is_active:
+    # Сессия берет соединение из пула только при промахе кеша
+    principal = await principal_cache.get(db, int(user_id))
+    if not principal or not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
-    return user
+    return principal
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> Principal:
+    return await authenticate_token(db, token)
 
 
 def require_roles(*roles: UserRole):
-    async def _role_checker(user: User = Depends(get_current_user)) -> User:
-        if UserRole(user.role) not in roles:
+    async def _role_checker(user: Principal = Depends(get_current_user)) -> Principal:
+        if not user.has_role(*roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
@@ -55,4 +60,3 @@ def require_roles(*roles: UserRole):
         return user
 
     return _role_checker
-
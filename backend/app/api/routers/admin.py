@@ -1,18 +1,36 @@
 import logging
-from typing import Dict, List
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, require_roles
 from app.core.db import get_db
+from app.core.job_queue import job_queue
+from app.core.leader import SCHEDULER_LEADER, read_lease
+from app.core.metrics import metrics
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
+from app.core.principals import Principal, principal_cache
 from app.models.user import User, UserRole
 from app.models.event import Event
 from app.repositories.user_repository import UserRepository
 from app.repositories.event_repository import EventRepository
-from app.services.scraper_service import run_all_scrapers
+from app.repositories.scraper_run_repository import ScraperRunRepository
+from app.scrapers.circuit_breaker import circuit_breaker
+from app.services.scrape_job_service import scrape_job_service
 from app.schemas.auth import UserRead
+from app.schemas.scraper import (
+    ScheduledJobRead,
+    SchedulerStatusRead,
+    ScrapeJobRead,
+    ScraperRunRead,
+    ScraperRunsReport,
+    ScraperRunStats,
+    SourceHealthRead,
+)
+from app.schemas.user import UserUpdate
 from app.schemas.event import EventRead
 
 logger = logging.getLogger(__name__)
@@ -22,7 +40,7 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/stats")
 async def get_stats(
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
     db: AsyncSession = Depends(get_db),
 ) -> Dict:
     """Получить статистику системы"""
@@ -59,19 +77,29 @@ async def get_stats(
         )
 
 
+@router.get("/metrics")
+async def get_metrics(
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+) -> Dict:
+    """In-process метрики текущего воркера (счетчики и латентности)"""
+    return metrics.snapshot()
+
+
 @router.get("/users", response_model=List[UserRead])
 async def list_users(
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    response: Response,
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
     db: AsyncSession = Depends(get_db),
     offset: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
 ) -> List[UserRead]:
     """Получить список всех пользователей"""
+    after = decode_cursor("admin.users", cursor)
     try:
         user_repo = UserRepository()
-        stmt = select(User).offset(offset).limit(limit).order_by(User.created_at.desc())
-        result = await db.execute(stmt)
-        users = result.scalars().all()
+        users = await user_repo.list_recent(db, offset=offset, limit=limit, after=after)
+        set_next_cursor(response, next_cursor("admin.users", users, limit, lambda u: (u.created_at, u.id)))
         return [UserRead.model_validate(user) for user in users]
     except Exception as e:
         logger.error(f"Error listing users: {e}", exc_info=True)
@@ -81,17 +109,44 @@ async def list_users(
         )
 
 
+@router.patch("/users/{user_id}", response_model=UserRead)
+async def update_user(
+    user_id: int,
+    user_in: UserUpdate,
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_db),
+) -> UserRead:
+    """Смена роли или деактивация пользователя"""
+    user_repo = UserRepository()
+    user = await user_repo.get(db, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    data = user_in.dict(exclude_unset=True)
+    if "role" in data:
+        data["role"] = data["role"].value
+    user = await user_repo.update(db, user, data)
+    await db.commit()
+    # Закешированный принципал больше не актуален
+    await principal_cache.invalidate(user_id)
+    logger.info(f"User {user_id} updated by admin {current_user.id}: {data}")
+    return UserRead.model_validate(user)
+
+
 @router.get("/events", response_model=List[EventRead])
 async def list_all_events(
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
+    response: Response,
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
     db: AsyncSession = Depends(get_db),
     offset: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> List[EventRead]:
     """Получить список всех событий"""
+    after = decode_cursor("admin.events", cursor)
     try:
         event_repo = EventRepository()
-        events = await event_repo.search(db, offset=offset, limit=limit)
+        events = await event_repo.search(db, offset=offset, limit=limit, after=after)
+        set_next_cursor(response, next_cursor("admin.events", events, limit, lambda e: (e.date_start, e.id)))
         return [EventRead.model_validate(event) for event in events]
     except Exception as e:
         logger.error(f"Error listing events: {e}", exc_info=True)
@@ -103,25 +158,105 @@ async def list_all_events(
 
 @router.post(
     "/run-scraper",
-    response_model=Dict[str, int],
-    status_code=status.HTTP_200_OK,
+    response_model=ScrapeJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def run_scraper(
-    current_user: User = Depends(require_roles(UserRole.ADMIN)),
-    db: AsyncSession = Depends(get_db),
-) -> Dict[str, int]:
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+) -> ScrapeJobRead:
     """
-    Ручной запуск всех скраперов событий.
-    Доступно только для администраторов.
+    Ручной запуск всех скраперов событий. Не ждет парсинга - возвращает задачу,
+    статус: GET /admin/scrape-jobs/{id}. Доступно только для администраторов.
     """
+    logger.info(f"Manual scraper run triggered by user {current_user.id}")
+    job, coalesced = await scrape_job_service.trigger(requested_by=f"admin:{current_user.id}")
+    return ScrapeJobRead.from_job(job, coalesced=coalesced)
+
+
+@router.get("/scrape-jobs/{job_id}", response_model=ScrapeJobRead)
+async def get_scrape_job(
+    job_id: str,
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+) -> ScrapeJobRead:
+    return ScrapeJobRead.from_job(await scrape_job_service.get(job_id))
+
+
+def _timestamp(value: float) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value else None
+
+
+@router.get("/scrapers/health", response_model=List[SourceHealthRead])
+async def list_scraper_health(
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+) -> List[SourceHealthRead]:
+    """Состояние circuit breaker'ов источников; источника нет в списке - он ни разу не падал"""
+    return [
+        SourceHealthRead(
+            source=health.source,
+            state=health.state,
+            failures=health.failures,
+            cooldown_seconds=health.cooldown_seconds,
+            opened_until=_timestamp(health.opened_until),
+            last_error=health.last_error,
+            updated_at=_timestamp(health.updated_at),
+        )
+        for health in await circuit_breaker.list()
+    ]
+
+
+@router.post("/scrapers/{source}/reset", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_scraper_health(
+    source: str,
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+) -> Response:
+    """Принудительно закрыть цепь источника (например, после починки сайта)"""
+    await circuit_breaker.reset(source)
+    logger.info(f"Circuit breaker for {source} reset by admin {current_user.id}")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/scheduler", response_model=SchedulerStatusRead)
+async def get_scheduler_status(
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+) -> SchedulerStatusRead:
+    """Какой процесс фонового воркера сейчас лидер и его расписание"""
     try:
-        logger.info(f"Manual scraper run triggered by user {current_user.id}")
-        results = await run_all_scrapers()
-        return results
+        lease = await read_lease(SCHEDULER_LEADER)
+        queued = await job_queue.size()
     except Exception as e:
-        logger.error(f"Error running scrapers: {e}", exc_info=True)
+        logger.error(f"Failed to read scheduler leader: {e}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error running scrapers: {str(e)}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Leader lease store unavailable",
         )
+    return SchedulerStatusRead(
+        leader=lease.holder,
+        lease_remaining_seconds=lease.remaining_seconds,
+        jobs=[ScheduledJobRead(**job) for job in lease.info.get("jobs", [])],
+        queued_jobs=queued,
+    )
+
 
+@router.get("/scrapers/runs", response_model=ScraperRunsReport)
+async def list_scraper_runs(
+    response: Response,
+    current_user: Principal = Depends(require_roles(UserRole.ADMIN)),
+    db: AsyncSession = Depends(get_db),
+    source: Optional[str] = None,
+    days: int = Query(7, ge=1, le=90),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+) -> ScraperRunsReport:
+    """
+    История запусков скраперов и p50/p95 длительностей (всего запуска и стадий
+    fetch / parse / db) по источникам за последние days дней.
+    """
+    after = decode_cursor("admin.scraper_runs", cursor)
+    repo = ScraperRunRepository()
+    runs = await repo.list_recent(db, source=source, limit=limit, after=after)
+    set_next_cursor(response, next_cursor("admin.scraper_runs", runs, limit, lambda r: (r.started_at, r.id)))
+    stats = await repo.duration_stats(db, since=datetime.now(timezone.utc) - timedelta(days=days))
+    return ScraperRunsReport(
+        stats=[ScraperRunStats(**row) for row in stats],
+        runs=[ScraperRunRead.model_validate(run) for run in runs],
+    )
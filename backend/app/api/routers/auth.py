@@ -9,8 +9,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.db import get_db
+from app.core.principals import Principal
 from app.core.security import create_access_token, create_refresh_token, decode_token
 from app.models.user import User
+from app.repositories.user_repository import UserRepository
 from app.schemas.auth import Token, UserCreate, UserRead
 from app.services.auth_service import AuthService
 
@@ -112,5 +114,11 @@ async def refresh_token(refresh_token: str) -> Token:
 
 
 @router.get("/me", response_model=UserRead)
-async def get_me(current_user: User = Depends(get_current_user)) -> User:
-    return current_user
+async def get_me(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    user = await UserRepository().get(db, current_user.id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
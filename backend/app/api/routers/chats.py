@@ -1,13 +1,17 @@
-from typing import List
+import json
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Response, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.db import get_db
-from app.core.redis import get_redis
-from app.models.user import User
+from app.api.deps import authenticate_token, get_current_user
+from app.core.db import AsyncSessionLocal, get_db
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
+from app.core.principals import Principal
+from app.core.redis import get_redis_client
 from app.schemas.chat import ChatRead, MessageCreate, MessageRead
+from app.services.chat_hub import connection_manager
+from app.services.chat_participant_cache import chat_participant_cache
 from app.services.chat_service import ChatService
 
 
@@ -18,7 +22,7 @@ router = APIRouter(prefix="/chats", tags=["chats"])
 async def create_personal_chat(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> ChatRead:
     service = ChatService()
     chat = await service.get_or_create_personal_chat(db, current_user, user_id)
@@ -29,11 +33,18 @@ async def create_personal_chat(
 @router.get("/{chat_id}/messages", response_model=List[MessageRead])
 async def list_messages(
     chat_id: int,
+    response: Response,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> List[MessageRead]:
     service = ChatService()
-    messages = await service.list_messages(db, chat_id)
+    messages = await service.list_messages(
+        db, chat_id, offset, limit, after=decode_cursor("chat.messages", cursor)
+    )
+    set_next_cursor(response, next_cursor("chat.messages", messages, limit, lambda m: (m.created_at, m.id)))
     return [MessageRead.model_validate(m) for m in messages]
 
 
@@ -42,70 +53,87 @@ async def send_message(
     chat_id: int,
     message_in: MessageCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> MessageRead:
     service = ChatService()
     message = await service.create_message(db, chat_id, current_user, message_in)
     await db.commit()
-    return MessageRead.model_validate(message)
-
-
-class ConnectionManager:
-    def __init__(self) -> None:
-        self.active_connections: dict[int, list[WebSocket]] = {}
-
-    async def connect(self, chat_id: int, websocket: WebSocket) -> None:
-        await websocket.accept()
-        connections = self.active_connections.setdefault(chat_id, [])
-        connections.append(websocket)
-
-    def disconnect(self, chat_id: int, websocket: WebSocket) -> None:
-        connections = self.active_connections.get(chat_id, [])
-        if websocket in connections:
-            connections.remove(websocket)
-
-    async def broadcast(self, chat_id: int, message: dict) -> None:
-        connections = self.active_connections.get(chat_id, [])
-        for connection in connections:
-            await connection.send_json(message)
-
-
-manager = ConnectionManager()
+    message_read = MessageRead.model_validate(message)
+    # Открытые WebSocket'ы чата получают сообщение, отправленное через REST, сразу
+    await connection_manager.publish(chat_id, message_read.model_dump(mode="json"))
+    return message_read
+
+
+async def _receive_frame(websocket: WebSocket) -> Optional[dict[str, Any]]:
+    """Следующий кадр клиента как JSON-объект; None - кадр не текстовый JSON-объект"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE), message.get("reason"))
+    text = message.get("text")
+    if text is None:
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
 
 
 @router.websocket("/ws/{chat_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
     chat_id: int,
-    db: AsyncSession = Depends(get_db),
-    redis=Depends(get_redis),
+    token: Optional[str] = None,
 ) -> None:
-    await manager.connect(chat_id, websocket)
-    await redis.set(f"chat:{chat_id}:online", "1", ex=60)
+    """
+    Токен (?token=<access token>) проверяется один раз при подключении, принципал
+    кешируется на все соединение; user_id из кадров не используется. Соединение
+    с БД берется только на время записи сообщения.
+
+    Кадры клиента - JSON-объекты {"content": "..."} или {"type": "pong"};
+    на любой другой кадр соединение закрывается с 1003.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await authenticate_token(db, token or "")
+            is_participant = await chat_participant_cache.is_participant(db, chat_id, user.id)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not is_participant:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    conn = await connection_manager.connect(chat_id, websocket)
     service = ChatService()
     try:
+        await get_redis_client().set(f"chat:{chat_id}:online", "1", ex=60)
         while True:
-            data = await websocket.receive_json()
-            user_id = data.get("user_id")
-            content = data.get("content")
-            if not user_id or not content:
+            data = await _receive_frame(websocket)
+            conn.touch()
+            if data is not None and data.get("type") == "pong":
                 continue
-            user = await db.get(User, user_id)
-            if not user:
+            content = data.get("content") if data is not None else None
+            if not isinstance(content, str):
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA, reason="Expected {\"content\": string}")
+                break
+            if not content:
                 continue
-            msg = await service.create_message(
-                db, chat_id, user, MessageCreate(content=content)
-            )
-            await db.commit()
-            await manager.broadcast(
-                chat_id,
-                {
-                    "id": msg.id,
-                    "chat_id": msg.chat_id,
-                    "sender_id": msg.sender_id,
-                    "content": msg.content,
-                },
+            try:
+                async with AsyncSessionLocal() as db:
+                    msg = await service.create_message(
+                        db, chat_id, user, MessageCreate(content=content)
+                    )
+                    await db.commit()
+            except HTTPException as e:
+                # Отказ проверок ChatService (чат или участник не найден)
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+                break
+            await connection_manager.publish(
+                chat_id, MessageRead.model_validate(msg).model_dump(mode="json")
             )
     except WebSocketDisconnect:
-        manager.disconnect(chat_id, websocket)
-
+        pass
+    finally:
+        # Иначе при любой ошибке сокет и подписка на канал чата остались бы висеть
+        await connection_manager.disconnect(conn)
@@ -1,14 +1,19 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, require_roles
 from app.core.db import get_db
-from app.models.user import User, UserRole
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from app.core.principals import Principal
+from app.models.user import UserRole
 from app.schemas.event import EventCreate, EventRead, EventRegistrationRead, EventUpdate
+from app.schemas.scraper import ScrapeJobRead
+from app.services.event_cache import event_cache
 from app.services.event_service import EventService
+from app.services.scrape_job_service import scrape_job_service
 
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -23,11 +28,12 @@ router = APIRouter(prefix="/events", tags=["events"])
 async def create_event(
     event_in: EventCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> EventRead:
     service = EventService()
     event = await service.create_event(db, current_user, event_in)
     await db.commit()
+    await service.flush_cache()
     return EventRead.model_validate(event)
 
 
@@ -40,11 +46,12 @@ async def update_event(
     event_id: int,
     event_in: EventUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> EventRead:
     service = EventService()
     event = await service.update_event(db, current_user, event_id, event_in)
     await db.commit()
+    await service.flush_cache()
     return EventRead.model_validate(event)
 
 
@@ -52,10 +59,16 @@ async def update_event(
 async def get_event(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-) -> EventRead:
+) -> Response:
+    cached = await event_cache.get_detail(event_id)
+    if cached:
+        return Response(content=cached.body, media_type="application/json")
+
     service = EventService()
     event = await service.get_event(db, event_id)
-    return EventRead.model_validate(event)
+    body = event_cache.serialize_one(EventRead.model_validate(event))
+    await event_cache.set_detail(event_id, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/", response_model=List[EventRead])
@@ -65,21 +78,58 @@ async def search_events(
     type: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
+    tags: Optional[List[str]] = Query(None),
+    q: Optional[str] = Query(None, max_length=200),
     offset: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> List[EventRead]:
     """
     КРИТИЧЕСКИ ВАЖНО: ВСЕГДА возвращает события!
     Сначала пробует из БД, если пусто - возвращает fallback события.
+
+    Пагинация: cursor из заголовка X-Next-Cursor предыдущего ответа (offset - legacy).
+    q - полнотекстовый поиск по названию, описанию и тегам с ранжированием (только
+    offset; q вместе с cursor - 400).
+    Ответы из БД кешируются в Redis уже сериализованными (см. app.services.event_cache).
     """
     import logging
     
     logger = logging.getLogger(__name__)
     logger.info("🚀 API: search_events called")
     
+    q = q.strip() if q else None
+    if q and cursor:
+        # Поиск ранжируется по релевантности, курсор по (date_start, id) к нему не применим
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor is not supported with q, use offset",
+        )
+    after = None if q else decode_cursor("events", cursor)
+
+    cache_key = event_cache.list_key(
+        {
+            "city": city,
+            "is_online": is_online,
+            "type": type,
+            "date_from": date_from.isoformat() if date_from else None,
+            "date_to": date_to.isoformat() if date_to else None,
+            "tags": tags,
+            "q": q,
+            "offset": None if after else offset,
+            "limit": limit,
+            "cursor": cursor if after else None,
+        }
+    )
+    cached = await event_cache.get_list(cache_key)
+    if cached:
+        headers = {NEXT_CURSOR_HEADER: cached.cursor} if cached.cursor else None
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
     # КРИТИЧЕСКИ ВАЖНО: ВСЕГДА возвращаем события
     db_events = []
+    new_cursor = None
     try:
         service = EventService()
         events = await service.search_events(
@@ -89,25 +139,38 @@ async def search_events(
             type=type,
             date_from=date_from,
             date_to=date_to,
+            tags=tags,
+            q=q,
             offset=offset,
             limit=limit,
+            after=after,
         )
         
         db_events = [EventRead.model_validate(e) for e in events]
+        if not q:
+            new_cursor = next_cursor("events", events, limit, lambda e: (e.date_start, e.id))
         logger.info(f"✅ API: Found {len(db_events)} events in DB")
     except Exception as e:
         logger.error(f"❌ API: Error fetching from DB: {e}", exc_info=True)
         db_events = []
     
     # КРИТИЧЕСКИ ВАЖНО: Если БД пустая - ВСЕГДА возвращаем fallback
-    if len(db_events) == 0:
+    # (но не на следующих страницах курсора - там пустой список означает конец)
+    if len(db_events) == 0 and after is None and not q:
         logger.warning("⚠️ API: DB is empty, returning fallback events")
         fallback = _get_fallback_events()
         logger.info(f"✅ API: Returning {len(fallback)} fallback events")
         return fallback
     
     logger.info(f"✅ API: Returning {len(db_events)} events from DB")
-    return db_events
+    body = event_cache.serialize_list(db_events)
+    # Fallback и пустые ответы (в т.ч. из-за ошибки БД) не кешируем
+    if db_events:
+        await event_cache.set_list(
+            cache_key, body, new_cursor, event_cache.list_tags(city, type)
+        )
+    headers = {NEXT_CURSOR_HEADER: new_cursor} if new_cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 def _get_fallback_events() -> List[EventRead]:
@@ -241,7 +304,7 @@ def _get_fallback_events() -> List[EventRead]:
 async def register_for_event(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> EventRegistrationRead:
     service = EventService()
     registration = await service.register_for_event(db, current_user, event_id)
@@ -257,39 +320,24 @@ async def register_for_event(
 async def list_event_participants(
     event_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> List[EventRegistrationRead]:
     service = EventService()
     participants = await service.list_participants(db, current_user, event_id)
     return [EventRegistrationRead.model_validate(p) for p in participants]
 
 
-@router.post("/scrape-now", response_model=dict)
-async def scrape_events_now() -> dict:
+@router.post("/scrape-now", response_model=ScrapeJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def scrape_events_now() -> ScrapeJobRead:
     """
-    СРОЧНЫЙ запуск парсинга всех источников.
-    Публичный endpoint для немедленного парсинга событий.
+    Срочный запуск парсинга всех источников (публичный).
+    Возвращает задачу сразу; повторные запросы присоединяются к идущему
+    или недавно завершенному запуску. Статус: GET /events/scrape-now/{id}.
     """
-    import logging
-    from app.services.scraper_service import run_all_scrapers
-    
-    logger = logging.getLogger(__name__)
-    
-    try:
-        logger.info("🚀 URGENT: Manual scrape triggered via /events/scrape-now")
-        results = await run_all_scrapers()
-        logger.info(f"✅ URGENT: Scraping completed. Results: {results}")
-        return {
-            "success": True,
-            "message": "Парсинг завершен",
-            "results": results,
-            "total": sum(results.values())
-        }
-    except Exception as e:
-        logger.error(f"❌ URGENT: Error in scrape: {e}", exc_info=True)
-        return {
-            "success": False,
-            "message": f"Ошибка при парсинге: {str(e)}",
-            "results": {}
-        }
+    job, coalesced = await scrape_job_service.trigger(requested_by="public")
+    return ScrapeJobRead.from_job(job, coalesced=coalesced)
+
 
+@router.get("/scrape-now/{job_id}", response_model=ScrapeJobRead)
+async def get_scrape_job(job_id: str) -> ScrapeJobRead:
+    return ScrapeJobRead.from_job(await scrape_job_service.get(job_id))
@@ -2,13 +2,15 @@ import logging
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, require_roles
 from app.core.db import get_db
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
+from app.core.principals import Principal
 from app.models.internship import SlotStatus, ApplicationStatus
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.internship import (
     InternshipSlotCreate,
     InternshipSlotRead,
@@ -38,7 +40,7 @@ router = APIRouter(prefix="/internship", tags=["internship"])
 async def create_slot(
     slot_in: InternshipSlotCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> InternshipSlotRead:
     """Создание слота стажировки (для компаний)"""
     service = InternshipService()
@@ -49,6 +51,7 @@ async def create_slot(
 
 @router.get("/slots", response_model=List[InternshipSlotRead])
 async def list_slots(
+    response: Response,
     city: Optional[str] = Query(None),
     status: Optional[SlotStatus] = Query(None),
     date_from: Optional[datetime] = Query(None),
@@ -56,6 +59,7 @@ async def list_slots(
     skills: Optional[List[str]] = Query(None),
     offset: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
 ) -> List[InternshipSlotRead]:
     """Список доступных слотов"""
@@ -69,7 +73,9 @@ async def list_slots(
         skills=skills,
         offset=offset,
         limit=limit,
+        after=decode_cursor("internship.slots", cursor),
     )
+    set_next_cursor(response, next_cursor("internship.slots", slots, limit, lambda s: (s.slot_start, s.id)))
     return [InternshipSlotRead.model_validate(slot) for slot in slots]
 
 
@@ -97,7 +103,7 @@ async def update_slot(
     slot_id: int,
     slot_in: InternshipSlotUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> InternshipSlotRead:
     """Обновление слота"""
     service = InternshipService()
@@ -114,7 +120,7 @@ async def update_slot(
 async def publish_slot(
     slot_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> InternshipSlotRead:
     """Публикация слота"""
     service = InternshipService()
@@ -131,7 +137,7 @@ async def publish_slot(
 async def apply_for_slot(
     application_in: SlotApplicationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> SlotApplicationRead:
     """Подача заявки на слот (для студентов)"""
     service = InternshipService()
@@ -148,7 +154,7 @@ async def apply_for_slot(
 async def approve_application(
     application_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> SlotApplicationRead:
     """Одобрение заявки компанией"""
     service = InternshipService()
@@ -167,7 +173,7 @@ async def approve_application(
 async def complete_slot(
     completion_in: SlotCompletionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> SlotCompletionRead:
     """Завершение слота студентом"""
     service = InternshipService()
@@ -185,7 +191,7 @@ async def confirm_completion(
     completion_id: int,
     completion_in: SlotCompletionUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> SlotCompletionRead:
     """Подтверждение завершения мастером (1 клик)"""
     service = InternshipService()
@@ -200,7 +206,7 @@ async def confirm_completion(
 async def match_slots(
     matching_request: MatchingRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> List[MatchedSlot]:
     """Матчинг слотов для студента по навыкам, времени и расстоянию"""
     if matching_request.student_id != current_user.id:
@@ -234,7 +240,7 @@ async def match_slots(
 @router.get("/my/applications", response_model=List[SlotApplicationRead])
 async def get_my_applications(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> List[SlotApplicationRead]:
     """Получение моих заявок"""
     service = InternshipService()
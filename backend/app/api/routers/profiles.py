@@ -1,11 +1,12 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.db import get_db
-from app.models.user import User
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
+from app.core.principals import Principal
 from app.schemas.profile import ProfileRead, ProfileUpdate
 from app.services.profile_service import ProfileService
 
@@ -15,7 +16,7 @@ router = APIRouter(prefix="/profiles", tags=["profiles"])
 
 @router.get("/me", response_model=ProfileRead)
 async def get_my_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProfileRead:
     service = ProfileService()
@@ -27,7 +28,7 @@ async def get_my_profile(
 @router.patch("/me", response_model=ProfileRead)
 async def update_my_profile(
     profile_in: ProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProfileRead:
     service = ProfileService()
@@ -48,12 +49,14 @@ async def get_profile(
 
 @router.get("/", response_model=List[ProfileRead])
 async def search_profiles(
+    response: Response,
     city: Optional[str] = None,
     experience_level: Optional[str] = None,
     interests: Optional[List[str]] = None,
     skills: Optional[List[str]] = None,
     offset: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> List[ProfileRead]:
     service = ProfileService()
@@ -65,6 +68,8 @@ async def search_profiles(
         skills=skills,
         offset=offset,
         limit=limit,
+        after=decode_cursor("profiles", cursor),
     )
+    set_next_cursor(response, next_cursor("profiles", profiles, limit, lambda p: (p.id,)))
     return [ProfileRead.model_validate(p) for p in profiles]
 
@@ -1,11 +1,12 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.db import get_db
-from app.models.user import User
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
+from app.core.principals import Principal
 from app.schemas.team import (
     TeamCreate,
     TeamOpenPositionCreate,
@@ -24,7 +25,7 @@ router = APIRouter(prefix="/teams", tags=["teams"])
 async def create_team(
     team_in: TeamCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> TeamRead:
     service = TeamService()
     team = await service.create_team(db, current_user, team_in)
@@ -47,7 +48,7 @@ async def update_team(
     team_id: int,
     team_in: TeamUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> TeamRead:
     service = TeamService()
     team = await service.update_team(db, current_user, team_id, team_in)
@@ -57,13 +58,18 @@ async def update_team(
 
 @router.get("/", response_model=List[TeamRead])
 async def search_teams(
+    response: Response,
     name: Optional[str] = None,
     offset: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ) -> List[TeamRead]:
     service = TeamService()
-    teams = await service.search_teams(db, name=name, offset=offset, limit=limit)
+    teams = await service.search_teams(
+        db, name=name, offset=offset, limit=limit, after=decode_cursor("teams", cursor)
+    )
+    set_next_cursor(response, next_cursor("teams", teams, limit, lambda t: (t.id,)))
     return [TeamRead.model_validate(t) for t in teams]
 
 
@@ -72,7 +78,7 @@ async def create_open_position(
     team_id: int,
     position_in: TeamOpenPositionCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> TeamOpenPositionRead:
     service = TeamService()
     position = await service.create_open_position(
@@ -87,7 +93,7 @@ async def update_open_position(
     position_id: int,
     position_in: TeamOpenPositionUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> TeamOpenPositionRead:
     service = TeamService()
     position = await service.update_open_position(
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,6 +24,121 @@ class SecuritySettings(BaseModel):
     refresh_token_expire_minutes: int = 60 * 24 * 7
 
 
+class HashingSettings(BaseModel):
+    # bcrypt выполняется в отдельном пуле потоков, чтобы не блокировать event loop
+    workers: int = 4
+    # Сколько операций может ждать в очереди пула, прежде чем отвечать 503
+    max_pending: int = 64
+
+
+class CacheSettings(BaseModel):
+    # Кеш принципалов (id, role, is_active) для get_current_user
+    principal_ttl_seconds: int = 300
+    # Локальный LRU воркера живет меньше, чтобы ограничить устаревание между воркерами
+    principal_local_ttl_seconds: int = 30
+    principal_local_max_size: int = 10_000
+    # Участники чатов для проверки членства при отправке сообщений
+    chat_participants_ttl_seconds: int = 300
+    chat_participants_local_ttl_seconds: int = 30
+    chat_participants_local_max_size: int = 10_000
+    # Кеш ответов GET /events/ и /events/{id}; инвалидируется по тегам, TTL - страховка
+    events_ttl_seconds: int = 300
+
+
+class SourceSchedule(BaseModel):
+    # Пустое значение - берется значение по умолчанию из класса скрапера
+    interval_seconds: Optional[float] = None
+    jitter_seconds: Optional[float] = None
+    timeout_seconds: Optional[float] = None
+    enabled: bool = True
+
+
+class ScraperSettings(BaseModel):
+    # Плагины-скраперы "module:Class"; дополнительно подключаются entry points
+    # группы "eventhub.scrapers" из установленных пакетов
+    plugins: list[str] = [
+        "app.scrapers.astana_hub_scraper:AstanaHubScraper",
+        "app.scrapers.nu_scraper:NUScraper",
+        "app.scrapers.aitu_scraper:AITUScraper",
+        "app.scrapers.nfactorial_scraper:NFactorialScraper",
+        "app.scrapers.techorda_scraper:TechOrdaScraper",
+    ]
+    # Переопределения расписаний по имени источника, например
+    # EVENTHUB_SCRAPER__SCHEDULES='{"NU": {"interval_seconds": 7200}}'
+    schedules: dict[str, SourceSchedule] = {}
+
+    # Пул процессов для parse(); 0 - парсить в потоке внутри процесса
+    parse_workers: int = 2
+    parse_timeout_seconds: float = 30.0
+    # Лимит адресного пространства процесса-воркера (RLIMIT_AS)
+    parse_memory_limit_mb: int = 1024
+    parse_max_html_mb: int = 20
+    parse_max_tasks_per_child: int = 50
+    # Дисковый кеш ETag/Last-Modified для условных GET; пустая строка - отключено
+    http_cache_dir: str = "/tmp/eventhub-http-cache"
+    # Общий HTTP транспорт скраперов (keep-alive пул на процесс)
+    http_timeout_seconds: float = 5.0
+    # Требует пакет h2 (httpx[http2]); без него - HTTP/1.1
+    http2: bool = False
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 60.0
+    http_global_concurrency: int = 8
+    http_per_host_concurrency: int = 2
+    # Минимальный интервал между началом запросов к одному хосту (вежливость к источникам)
+    http_per_host_delay_seconds: float = 0.5
+    # Обход пагинации листинга: переходов от первой страницы и всего страниц за запуск
+    crawl_max_depth: int = 3
+    crawl_max_pages: int = 10
+    # Фоновая загрузка страниц деталей для новых и изменившихся карточек
+    enrich_enabled: bool = True
+    enrich_concurrency: int = 2
+    enrich_max_pending: int = 500
+    enrich_batch_size: int = 20
+    # Ручной запуск (POST /admin/run-scraper, /events/scrape-now): повторные запросы
+    # присоединяются к идущему или завершившемуся не раньше N секунд назад запуску
+    trigger_coalesce_seconds: float = 60
+    # Верхняя граница ожидания в очереди + выполнения ручного запуска
+    trigger_lock_seconds: int = 60 * 60
+    # Сколько хранится статус задачи ручного запуска
+    trigger_job_ttl_seconds: int = 24 * 60 * 60
+    # Circuit breaker источников: после N неудач подряд источник на паузе,
+    # пауза удваивается после каждой неудачной пробы
+    breaker_failure_threshold: int = 3
+    breaker_base_cooldown_seconds: float = 600
+    breaker_max_cooldown_seconds: float = 6 * 60 * 60
+    # История запусков (scraper_runs) старше N дней удаляется задачей обслуживания
+    runs_retention_days: int = 90
+    # Сколько живет хеш содержимого страницы; по истечении страница обрабатывается заново
+    content_hash_ttl_seconds: int = 24 * 60 * 60
+
+
+class ChatSettings(BaseModel):
+    # Исходящая очередь WebSocket-соединения (кадров) и таймаут отправки одного кадра
+    send_queue_size: int = 100
+    send_timeout_seconds: float = 10
+    # Очередь переполнена: "disconnect" - закрыть соединение, "drop_oldest" - выкинуть старый кадр
+    slow_consumer_policy: str = "disconnect"
+    # {"type": "ping"} клиентам; без входящих кадров дольше idle_timeout соединение закрывается
+    heartbeat_interval_seconds: float = 25
+    idle_timeout_seconds: float = 90
+
+
+class SchedulerSettings(BaseModel):
+    # false - процесс не участвует в выборах и никогда не запускает задачи по расписанию
+    enabled: bool = True
+    # Аренда лидера в Redis: TTL и период продления (должен быть меньше TTL)
+    leader_lease_seconds: float = 30
+    leader_renew_seconds: float = 10
+
+
+class WorkerSettings(BaseModel):
+    # Фоновый воркер (python -m app.worker): параллельных задач очереди и
+    # таймаут BRPOP (как часто проверяется сигнал остановки)
+    queue_concurrency: int = 2
+    queue_poll_seconds: float = 5
+
+
 class AppSettings(BaseModel):
     project_name: str = "EventHub"
     debug: bool = False
@@ -32,6 +148,12 @@ class Settings(BaseSettings):
     database: DatabaseSettings = DatabaseSettings()
     redis: RedisSettings = RedisSettings()
     security: SecuritySettings = SecuritySettings()
+    hashing: HashingSettings = HashingSettings()
+    cache: CacheSettings = CacheSettings()
+    scraper: ScraperSettings = ScraperSettings()
+    chat: ChatSettings = ChatSettings()
+    scheduler: SchedulerSettings = SchedulerSettings()
+    worker: WorkerSettings = WorkerSettings()
     app: AppSettings = AppSettings()
 
     model_config = SettingsConfigDict(
@@ -0,0 +1,79 @@
+"""
+Асинхронное хеширование паролей.
+
+bcrypt занимает 100-300 мс CPU на вызов, поэтому выполняется в ограниченном
+пуле потоков (bcrypt отпускает GIL). Если очередь переполнена, запрос сразу
+получает 503, а не ждет и не тормозит остальных клиентов воркера.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Пул потоков для bcrypt с лимитом глубины очереди и метриками"""
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = metrics.gauge("password_hash.pending")
+        self._rejected = metrics.counter("password_hash.rejected")
+        self._hash_latency = metrics.histogram("password_hash.hash_ms")
+        self._verify_latency = metrics.histogram("password_hash.verify_ms")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    async def _run(self, histogram, func: Callable[..., T], *args) -> T:
+        # Проверка и инкремент выполняются без await, поэтому атомарны для event loop
+        if self._pending.value >= self.max_pending:
+            self._rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self._pending.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            with histogram.time():
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending.dec()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self._hash_latency, get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            self._verify_latency, verify_password, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.hashing.workers,
+    max_pending=settings.hashing.max_pending,
+)
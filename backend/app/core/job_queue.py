@@ -0,0 +1,64 @@
+"""
+Очередь фоновых задач в Redis.
+
+API ставит задачи (enqueue), выполняет их отдельный процесс - python -m app.worker.
+Задача - JSON {"kind", "args", "enqueued_at"} в списке jobs:{name}; воркеры
+забирают их через BRPOP (FIFO). Доставка не более одного раза: задача,
+взятая воркером, который упал, теряется - владельцы задач должны это
+переживать (ручной запуск парсинга, например, отпускает single-flight по TTL).
+"""
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    kind: str
+    args: dict[str, Any] = field(default_factory=dict)
+    enqueued_at: float = 0
+
+
+class JobQueue:
+    prefix = "jobs"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._enqueued = metrics.counter(f"jobs.{name}.enqueued")
+        self._dequeued = metrics.counter(f"jobs.{name}.dequeued")
+
+    @property
+    def key(self) -> str:
+        return f"{self.prefix}:{self.name}"
+
+    async def enqueue(self, kind: str, **args: Any) -> None:
+        payload = json.dumps({"kind": kind, "args": args, "enqueued_at": time.time()})
+        await get_redis_client().lpush(self.key, payload)
+        self._enqueued.inc()
+
+    async def pop(self, timeout: float) -> Optional[QueuedJob]:
+        """Ждет задачу до timeout секунд; None - очередь пуста"""
+        item = await get_redis_client().brpop([self.key], timeout=timeout)
+        if item is None:
+            return None
+        try:
+            data = json.loads(item[1])
+            job = QueuedJob(kind=data["kind"], args=data.get("args") or {}, enqueued_at=data.get("enqueued_at", 0))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Dropping malformed job from {self.key}: {e}")
+            return None
+        self._dequeued.inc()
+        return job
+
+    async def size(self) -> int:
+        return await get_redis_client().llen(self.key)
+
+
+job_queue = JobQueue("default")
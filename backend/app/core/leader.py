@@ -0,0 +1,179 @@
+"""
+Выбор лидера между воркерами и репликами через аренду в Redis.
+
+Ключ leader:{name} хранит идентификатор держателя и живет lease_seconds.
+Каждый процесс раз в renew_seconds:
+- лидер продлевает аренду (только если ключ все еще его - Lua-скрипт);
+- остальные пытаются занять ключ через SET NX.
+
+Лидер, упавший без release(), теряет аренду по TTL, и ее подхватывает
+следующий воркер не позже чем через lease_seconds + renew_seconds. Если
+Redis недоступен, лидер слагает полномочия раньше, чем аренда могла бы
+истечь, - два лидера одновременно не работают.
+
+Лидер при каждом продлении публикует describe() в leader:{name}:info с тем же
+TTL - его читает read_lease() в процессах, не участвующих в выборах (API).
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+
+PREFIX = "leader"
+
+# Аренда планировщика фонового воркера (app.scrapers.scheduler)
+SCHEDULER_LEADER = "scraper-scheduler"
+
+# Продлить/снять аренду, только если ключ все еще принадлежит нам
+_RENEW = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class LeaseInfo:
+    # Держатель аренды; None - лидера сейчас нет
+    holder: Optional[str]
+    remaining_seconds: Optional[float]
+    info: dict[str, Any] = field(default_factory=dict)
+
+
+async def read_lease(name: str) -> LeaseInfo:
+    """Текущий держатель аренды name, сколько ей осталось и что лидер о себе опубликовал"""
+    key = f"{PREFIX}:{name}"
+    client = get_redis_client()
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.get(key)
+        pipe.pttl(key)
+        pipe.get(f"{key}:info")
+        holder, ttl_ms, info = await pipe.execute()
+    if not holder:
+        return LeaseInfo(holder=None, remaining_seconds=None)
+    return LeaseInfo(
+        holder=holder,
+        remaining_seconds=ttl_ms / 1000 if ttl_ms > 0 else None,
+        info=json.loads(info) if info else {},
+    )
+
+
+class LeaderElection:
+    def __init__(
+        self,
+        name: str,
+        lease_seconds: float,
+        renew_seconds: float,
+        on_elected: Optional[Callback] = None,
+        on_demoted: Optional[Callback] = None,
+        describe: Optional[Callable[[], dict[str, Any]]] = None,
+    ) -> None:
+        if renew_seconds >= lease_seconds:
+            raise ValueError("renew_seconds must be shorter than lease_seconds")
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.renew_seconds = renew_seconds
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.describe = describe
+        self.identity = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._renewed_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._elections = metrics.counter(f"leader.{name}.elections")
+        self._leader = metrics.gauge(f"leader.{name}.is_leader")
+
+    @property
+    def key(self) -> str:
+        return f"{PREFIX}:{self.name}"
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=f"leader-{self.name}")
+
+    async def stop(self) -> None:
+        """Останавливает участие в выборах и сразу освобождает аренду, если она наша"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if not self.is_leader:
+            return
+        try:
+            client = get_redis_client()
+            if await client.eval(_RELEASE, 1, self.key, self.identity):
+                await client.delete(f"{self.key}:info")
+        except Exception as e:
+            logger.warning(f"[{self.name}] Failed to release leadership: {e}")
+        await self._demote("shutdown")
+
+    async def _loop(self) -> None:
+        while True:
+            await self._tick()
+            await asyncio.sleep(self.renew_seconds)
+
+    async def _tick(self) -> None:
+        now = time.monotonic()
+        lease_ms = int(self.lease_seconds * 1000)
+        try:
+            client = get_redis_client()
+            if self.is_leader:
+                if await client.eval(_RENEW, 1, self.key, self.identity, lease_ms):
+                    self._renewed_at = now
+                    await self._publish(lease_ms)
+                    return
+                await self._demote("lease taken over")
+            elif await client.set(self.key, self.identity, nx=True, px=lease_ms):
+                self._renewed_at = now
+                await self._elect()
+                await self._publish(lease_ms)
+        except Exception as e:
+            logger.warning(f"[{self.name}] Leader election unavailable: {e}")
+            # Не продлили - слагаем полномочия до того, как аренду сможет занять другой
+            if self.is_leader and now - self._renewed_at >= self.lease_seconds - self.renew_seconds:
+                await self._demote("lease not renewed")
+
+    async def _publish(self, lease_ms: int) -> None:
+        if self.describe is not None:
+            info = json.dumps(self.describe(), default=str)
+            await get_redis_client().set(f"{self.key}:info", info, px=lease_ms)
+
+    async def _elect(self) -> None:
+        self.is_leader = True
+        self._elections.inc()
+        self._leader.set(1)
+        logger.info(f"[{self.name}] {self.identity} became leader")
+        if self.on_elected is not None:
+            await self._callback(self.on_elected)
+
+    async def _demote(self, reason: str) -> None:
+        self.is_leader = False
+        self._leader.set(0)
+        logger.warning(f"[{self.name}] {self.identity} lost leadership: {reason}")
+        if self.on_demoted is not None:
+            await self._callback(self.on_demoted)
+
+    async def _callback(self, callback: Callback) -> None:
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"[{self.name}] Leader callback failed: {e}", exc_info=True)
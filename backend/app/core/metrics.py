@@ -0,0 +1,130 @@
+"""
+Простые in-process метрики (счетчики и латентности) без внешних зависимостей.
+
+Значения живут в памяти процесса воркера и отдаются через /admin/metrics.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class Counter:
+    """Монотонный счетчик"""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Gauge:
+    """Текущее значение (глубина очереди, число соединений и т.п.)"""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: int) -> None:
+        with self._lock:
+            self._value = value
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class LatencyHistogram:
+    """Скользящее окно последних замеров латентности (в миллисекундах)"""
+
+    def __init__(self, window: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        with self._lock:
+            self._samples.append(value_ms)
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - started) * 1000)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            samples = sorted(self._samples)
+            count = self._count
+        if not samples:
+            return {"count": count, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+        return {
+            "count": count,
+            "p50_ms": round(_percentile(samples, 0.50), 2),
+            "p95_ms": round(_percentile(samples, 0.95), 2),
+            "p99_ms": round(_percentile(samples, 0.99), 2),
+            "max_ms": round(samples[-1], 2),
+        }
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float:
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class MetricsRegistry:
+    """Реестр именованных метрик процесса"""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Gauge | LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str) -> Counter:
+        return self._get_or_create(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get_or_create(name, Gauge)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        return self._get_or_create(name, LatencyHistogram)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            items = list(self._metrics.items())
+        result: dict[str, Any] = {}
+        for name, metric in sorted(items):
+            if isinstance(metric, LatencyHistogram):
+                result[name] = metric.snapshot()
+            else:
+                result[name] = metric.value
+        return result
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,98 @@
+"""
+Keyset (cursor) пагинация.
+
+Курсор - это подписанная HMAC base64url-строка со значениями (sort_key, id)
+последней строки страницы и видом списка (kind), для которого он выдан:
+у разных списков разный ключ сортировки, и курсор чужого списка отклоняется
+с 400. Клиент передает его как ?cursor=..., а следующий
+курсор возвращается в заголовке X-Next-Cursor, поэтому формат тела ответа
+(список) не меняется, а offset остается как устаревший вариант.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    key = settings.security.secret_key.encode("utf-8")
+    return hmac.new(key, payload, hashlib.sha256).digest()[:16]
+
+
+def _dump_value(value: Any) -> list:
+    if isinstance(value, datetime):
+        return ["d", value.isoformat()]
+    return ["v", value]
+
+
+def _load_value(item: list) -> Any:
+    kind, value = item
+    if kind == "d":
+        return datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    payload = json.dumps(
+        {"k": kind, "v": [_dump_value(v) for v in values]}, separators=(",", ":")
+    ).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(kind: str, cursor: Optional[str]) -> Optional[tuple]:
+    """
+    Проверяет подпись и вид списка, возвращает значения ключа; None если
+    курсор не передан
+    """
+    if not cursor:
+        return None
+    try:
+        payload_part, signature_part = cursor.split(".", 1)
+        payload = _b64decode(payload_part)
+        if not hmac.compare_digest(_sign(payload), _b64decode(signature_part)):
+            raise ValueError("bad signature")
+        data = json.loads(payload)
+        if data["k"] != kind:
+            raise ValueError("cursor of another list")
+        return tuple(_load_value(item) for item in data["v"])
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def next_cursor(
+    kind: str, items: Sequence[T], limit: int, key: Callable[[T], Sequence[Any]]
+) -> Optional[str]:
+    """Курсор на следующую страницу, если текущая заполнена целиком"""
+    if not items or len(items) < limit:
+        return None
+    return encode_cursor(kind, key(items[-1]))
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,193 @@
+"""
+Кеш аутентифицированных принципалов.
+
+get_current_user вызывается на каждом защищенном запросе, поэтому минимальные
+данные для авторизации (id, role, is_active) кешируются: сначала в локальном
+LRU воркера, затем в Redis, и только при промахе читаются из Postgres.
+Локальный TTL короче Redis TTL, так что после invalidate() другие воркеры
+увидят изменения не позже чем через principal_local_ttl_seconds.
+
+Гонка "промах -> чтение из БД -> invalidate() -> запись старого принципала"
+закрыта версиями: invalidate() увеличивает principal:{id}:version, а get()
+запоминает версию до чтения из БД и записывает принципал в Redis только если
+она не изменилась (проверка и запись - одним Lua-скриптом). Локальный кеш
+защищен так же счетчиком в памяти процесса.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+from app.models.user import User, UserRole
+from app.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Записать принципал, только если версия пользователя не изменилась с момента чтения
+_PUT_IF_VERSION = """
+if (redis.call('get', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Минимальное представление пользователя для авторизации"""
+
+    id: int
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, role=user.role, is_active=user.is_active)
+
+    def has_role(self, *roles: UserRole) -> bool:
+        return UserRole(self.role) in roles
+
+
+class PrincipalCache:
+    """Двухуровневый кеш принципалов: in-process LRU + Redis"""
+
+    key_prefix = "principal:"
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        local_ttl_seconds: int,
+        local_max_size: int,
+        user_repo: UserRepository | None = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.local_max_size = local_max_size
+        self.user_repo = user_repo or UserRepository()
+        self._local: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+        # Сколько раз пользователя инвалидировали в этом процессе (защита локального кеша)
+        self._local_versions: dict[int, int] = {}
+        self._hits_local = metrics.counter("principal_cache.hits_local")
+        self._hits_redis = metrics.counter("principal_cache.hits_redis")
+        self._misses = metrics.counter("principal_cache.misses")
+
+    def _redis_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}{user_id}:version"
+
+    def _get_local(self, user_id: int) -> Optional[Principal]:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            self._local.pop(user_id, None)
+            return None
+        self._local.move_to_end(user_id)
+        return principal
+
+    def _set_local(self, principal: Principal) -> None:
+        self._local[principal.id] = (
+            time.monotonic() + self.local_ttl_seconds,
+            principal,
+        )
+        self._local.move_to_end(principal.id)
+        while len(self._local) > self.local_max_size:
+            self._local.popitem(last=False)
+
+    async def _get_redis(self, user_id: int) -> Optional[Principal]:
+        try:
+            raw = await get_redis_client().get(self._redis_key(user_id))
+        except Exception as e:
+            logger.warning(f"Principal cache: Redis unavailable: {e}")
+            return None
+        if not raw:
+            return None
+        try:
+            return Principal(**json.loads(raw))
+        except (TypeError, ValueError):
+            return None
+
+    async def _get_version(self, user_id: int) -> Optional[str]:
+        """Версия пользователя в Redis ("" - не инвалидировался); None - Redis недоступен"""
+        try:
+            return await get_redis_client().get(self._version_key(user_id)) or ""
+        except Exception as e:
+            logger.warning(f"Principal cache: Redis unavailable: {e}")
+            return None
+
+    async def _set_redis(self, principal: Principal, version: str) -> bool:
+        try:
+            return bool(await get_redis_client().eval(
+                _PUT_IF_VERSION,
+                2,
+                self._redis_key(principal.id),
+                self._version_key(principal.id),
+                version,
+                json.dumps(asdict(principal)),
+                self.ttl_seconds,
+            ))
+        except Exception as e:
+            logger.warning(f"Principal cache: Redis unavailable: {e}")
+            return False
+
+    async def get(self, db: AsyncSession, user_id: int) -> Optional[Principal]:
+        """Возвращает принципала из кеша, при промахе загружает пользователя из БД"""
+        principal = self._get_local(user_id)
+        if principal is not None:
+            self._hits_local.inc()
+            return principal
+
+        principal = await self._get_redis(user_id)
+        if principal is not None:
+            self._hits_redis.inc()
+            self._set_local(principal)
+            return principal
+
+        self._misses.inc()
+        # Версии - до чтения из БД: если за это время был invalidate(), в кеш не пишем
+        local_version = self._local_versions.get(user_id, 0)
+        version = await self._get_version(user_id)
+        user = await self.user_repo.get(db, user_id)
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        if self._local_versions.get(user_id, 0) == local_version:
+            self._set_local(principal)
+        if version is not None:
+            await self._set_redis(principal, version)
+        return principal
+
+    async def invalidate(self, user_id: int) -> None:
+        """Сбрасывает кеш после деактивации пользователя или смены роли (после commit)"""
+        self._local.pop(user_id, None)
+        self._local_versions[user_id] = self._local_versions.get(user_id, 0) + 1
+        try:
+            client = get_redis_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.incr(self._version_key(user_id))
+                # Версия должна пережить любое чтение из БД, начатое до инвалидации
+                pipe.expire(self._version_key(user_id), self.ttl_seconds)
+                pipe.delete(self._redis_key(user_id))
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Principal cache: failed to invalidate user {user_id}: {e}")
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.cache.principal_ttl_seconds,
+    local_ttl_seconds=settings.cache.principal_local_ttl_seconds,
+    local_max_size=settings.cache.principal_local_max_size,
+)
@@ -8,15 +8,28 @@ from app.core.config import get_settings
 settings = get_settings()
 
 redis_client: Redis | None = None
+redis_bytes_client: Redis | None = None
 
 
-async def get_redis() -> AsyncGenerator[Redis, None]:
+def get_redis_client() -> Redis:
+    """Общий Redis клиент процесса (для использования вне Depends)"""
     global redis_client
     if redis_client is None:
         redis_client = Redis.from_url(settings.redis.url, decode_responses=True)
+    return redis_client
+
+
+def get_redis_bytes_client() -> Redis:
+    """Redis клиент без декодирования ответов - для хранения готовых байтов"""
+    global redis_bytes_client
+    if redis_bytes_client is None:
+        redis_bytes_client = Redis.from_url(settings.redis.url, decode_responses=False)
+    return redis_bytes_client
+
+
+async def get_redis() -> AsyncGenerator[Redis, None]:
     try:
-        yield redis_client
+        yield get_redis_client()
     finally:
         # Keep connection for reuse; do not close here
         pass
-
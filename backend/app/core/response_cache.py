@@ -0,0 +1,88 @@
+"""
+Кеш готовых (сериализованных) HTTP ответов в Redis с инвалидацией по тегам.
+
+Каждая запись - Redis hash {body, cursor}. Для каждого тега хранится set
+ключей записей; invalidate_tags() удаляет все записи с этими тегами.
+Ошибки Redis не ломают запрос: кеш просто считается промахом.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from app.core.metrics import metrics
+from app.core.redis import get_redis_bytes_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    cursor: Optional[str] = None
+
+
+class ResponseCache:
+    prefix = "respcache"
+
+    def __init__(self, namespace: str, ttl_seconds: int) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._hits = metrics.counter(f"response_cache.{namespace}.hits")
+        self._misses = metrics.counter(f"response_cache.{namespace}.misses")
+        self._errors = metrics.counter(f"response_cache.{namespace}.errors")
+
+    def key(self, params: dict[str, Any]) -> str:
+        """Ключ по нормализованным параметрам запроса (порядок и None не важны)"""
+        normalized = {k: v for k, v in params.items() if v is not None and v != []}
+        raw = json.dumps(normalized, sort_keys=True, default=str, ensure_ascii=False)
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{self.namespace}:{digest}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            data = await get_redis_bytes_client().hgetall(key)
+        except Exception as e:
+            self._errors.inc()
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+        if not data or b"body" not in data:
+            self._misses.inc()
+            return None
+        self._hits.inc()
+        cursor = data.get(b"cursor")
+        return CachedResponse(body=data[b"body"], cursor=cursor.decode("utf-8") if cursor else None)
+
+    async def set(
+        self, key: str, response: CachedResponse, tags: Iterable[str]
+    ) -> None:
+        mapping = {"body": response.body}
+        if response.cursor:
+            mapping["cursor"] = response.cursor
+        try:
+            async with get_redis_bytes_client().pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, self.ttl_seconds)
+                for tag in set(tags):
+                    pipe.sadd(self._tag_key(tag), key)
+                    pipe.expire(self._tag_key(tag), self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            self._errors.inc()
+            logger.warning(f"Response cache: failed to store {key}: {e}")
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tag_keys = [self._tag_key(tag) for tag in set(tags)]
+        if not tag_keys:
+            return
+        try:
+            client = get_redis_bytes_client()
+            keys = await client.sunion(tag_keys)
+            await client.delete(*keys, *tag_keys)
+        except Exception as e:
+            self._errors.inc()
+            logger.warning(f"Response cache: failed to invalidate {tags}: {e}")
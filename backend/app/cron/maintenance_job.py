@@ -0,0 +1,25 @@
+"""
+CRON задачи обслуживания (запускаются фоновым воркером, как и скраперы)
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.repositories.scraper_run_repository import ScraperRunRepository
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+async def purge_scraper_runs_job():
+    """Удаляет историю запусков скраперов старше scraper.runs_retention_days"""
+    before = datetime.now(timezone.utc) - timedelta(days=settings.scraper.runs_retention_days)
+    try:
+        async with AsyncSessionLocal() as db:
+            deleted = await ScraperRunRepository().delete_older_than(db, before)
+            await db.commit()
+        logger.info(f"🧹 CRON: Purged {deleted} scraper run(s) older than {before:%Y-%m-%d}")
+    except Exception as e:
+        logger.error(f"❌ CRON: Error purging scraper runs: {e}", exc_info=True)
@@ -1,23 +1,47 @@
 """
 CRON задача для периодического запуска скраперов
 """
+import asyncio
 import logging
 
-from app.services.scraper_service import run_all_scrapers
+from app.services.scrape_job_service import scrape_job_service
+from app.services.scraper_service import run_all_scrapers, run_source
 
 logger = logging.getLogger(__name__)
 
 
-async def scrape_events_job():
+async def scrape_source_job(source: str):
     """
-    CRON задача для запуска парсинга событий.
-    Вызывается планировщиком каждые 5 минут.
+    CRON задача для одного источника; расписание и таймаут - из реестра скраперов.
     """
     try:
-        logger.info("🔄 CRON: Starting scheduled event scraping...")
-        results = await run_all_scrapers()
-        logger.info(f"✅ CRON: Scraping completed. Results: {results}")
+        logger.info(f"🔄 CRON: Starting scheduled scraping of {source}...")
+        count = await run_source(source)
+        if count is None:
+            logger.info(f"⏭ CRON: {source} skipped (unknown or already running)")
+            return
+        logger.info(f"✅ CRON: {source} completed: {count} events")
     except Exception as e:
         # Логируем ошибку, но не пробрасываем - чтобы CRON продолжал работать
-        logger.error(f"❌ CRON: Error in scraping job: {e}", exc_info=True)
+        logger.error(f"❌ CRON: Error in {source} scraping job: {e}", exc_info=True)
+
 
+async def manual_scrape_job(job_id: str):
+    """
+    Задача очереди "scrape_all": ручной запуск всех источников, поставленный
+    через POST /admin/run-scraper или /events/scrape-now.
+    """
+    job = await scrape_job_service.mark_running(job_id)
+    if job is None:
+        logger.warning(f"Scrape job {job_id} expired before it was started")
+        return
+    try:
+        results = await run_all_scrapers()
+    except asyncio.CancelledError:
+        await scrape_job_service.finish(job, error="Cancelled on shutdown", cancelled=True)
+        raise
+    except Exception as e:
+        logger.error(f"❌ Scrape job {job_id} failed: {e}", exc_info=True)
+        await scrape_job_service.finish(job, error=str(e))
+        return
+    await scrape_job_service.finish(job, results=results)
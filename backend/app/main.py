@@ -6,7 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routers import admin, auth, chats, events, internship, organizer, profiles, teams
 from app.core.config import get_settings
-from app.scrapers.scheduler import start_scheduler, stop_scheduler
+from app.core.hashing import password_hasher
+from app.services.chat_hub import connection_manager
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,11 +23,11 @@ async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
     # Startup
     logger.info("Starting EventHub application...")
-    await start_scheduler()
     yield
     # Shutdown
     logger.info("Shutting down EventHub application...")
-    await stop_scheduler()
+    await connection_manager.close()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -1,3 +1,3 @@
 from .base import Base  # noqa: F401
-from . import user, profile, event, team, chat, internship  # noqa: F401
+from . import user, profile, event, team, chat, internship, scraper_run  # noqa: F401
 
@@ -1,8 +1,8 @@
 from enum import Enum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text
 from typing import Optional
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -18,6 +18,14 @@ class EventType(str, Enum):
 
 class Event(Base, TimestampMixin):
     __tablename__ = "events"
+    __table_args__ = (
+        Index("ix_events_city_type_date_start", "city", "type", "date_start", "id"),
+        Index("ix_events_date_start_id", "date_start", "id"),
+        Index("ix_events_organizer_id_date_start", "organizer_id", "date_start"),
+        Index("ix_events_tags", "tags", postgresql_using="gin"),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        Index("uq_events_source_fingerprint", "source", "fingerprint", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255))
@@ -35,6 +43,13 @@ class Event(Base, TimestampMixin):
     tags: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=True)
     source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # internal / external
     source_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    # Ключ дедупликации внешних событий (см. event_repository.event_fingerprint)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Хеш полей карточки листинга и хеш карточки, для которой уже загружена страница деталей
+    card_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    enriched_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Полнотекстовый индекс (title, tags, description; russian + english), заполняется триггером в БД
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     organizer: Mapped["User | None"] = relationship("User", back_populates="events_organized")
     registrations: Mapped[list["EventRegistration"]] = relationship(
@@ -51,6 +66,9 @@ class EventRegistrationStatus(str, Enum):
 
 class EventRegistration(Base, TimestampMixin):
     __tablename__ = "event_registrations"
+    __table_args__ = (
+        Index("ix_event_registrations_event_id_user_id", "event_id", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     event_id: Mapped[int] = mapped_column(
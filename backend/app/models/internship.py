@@ -1,7 +1,7 @@
 from enum import Enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, Float, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, Float, func, text
 from typing import Optional
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -34,6 +34,16 @@ class CompletionStatus(str, Enum):
 class InternshipSlot(Base, TimestampMixin):
     """Слот микро-стажировки (2-4 часа)"""
     __tablename__ = "internship_slots"
+    __table_args__ = (
+        Index(
+            "ix_internship_slots_published_slot_start",
+            "slot_start",
+            "id",
+            postgresql_where=text("status = 'published'"),
+        ),
+        Index("ix_internship_slots_status_slot_start", "status", "slot_start"),
+        Index("ix_internship_slots_required_skills", "required_skills", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255))
@@ -0,0 +1,46 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ScraperRunStatus(str, Enum):
+    SUCCESS = "success"
+    NOT_MODIFIED = "not_modified"  # 304 на условный GET
+    UNCHANGED = "unchanged"  # хеш содержимого совпал
+    SKIPPED = "skipped"  # circuit breaker открыт
+    FETCH_FAILED = "fetch_failed"
+    FAILED = "failed"
+
+
+class ScraperRun(Base):
+    """Один запуск одного скрапера: тайминги стадий, объемы и результат"""
+
+    __tablename__ = "scraper_runs"
+    __table_args__ = (
+        Index("ix_scraper_runs_source_started_at", "source", "started_at"),
+        Index("ix_scraper_runs_started_at", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    source: Mapped[str] = mapped_column(String(100))
+    status: Mapped[str] = mapped_column(String(50))
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    duration_ms: Mapped[int] = mapped_column(Integer, default=0)
+    fetch_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    http_status: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    bytes_received: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    pages_fetched: Mapped[int] = mapped_column(Integer, default=0)
+    parse_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    cards_found: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    events_parsed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    inserted: Mapped[int] = mapped_column(Integer, default=0)
+    updated: Mapped[int] = mapped_column(Integer, default=0)
+    unchanged: Mapped[int] = mapped_column(Integer, default=0)
+    db_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    error_class: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
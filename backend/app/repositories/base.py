@@ -1,6 +1,7 @@
-from typing import Generic, Optional, Sequence, Type, TypeVar
+from typing import Generic, Iterable, Optional, Sequence, Type, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import Base
@@ -9,6 +10,13 @@ from app.models.base import Base
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def keyset_after(columns: Sequence, after: Sequence, descending: bool = False):
+    """Условие keyset-пагинации: (sort_key, id) строго после значений курсора"""
+    if descending:
+        return tuple_(*columns) < tuple_(*after)
+    return tuple_(*columns) > tuple_(*after)
+
+
 class BaseRepository(Generic[ModelType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
@@ -17,27 +25,88 @@ class BaseRepository(Generic[ModelType]):
         result = await db.execute(select(self.model).where(self.model.id == id_))
         return result.scalar_one_or_none()
 
-    async def list(self, db: AsyncSession, offset: int = 0, limit: int = 100) -> Sequence[ModelType]:
-        result = await db.execute(
-            select(self.model).offset(offset).limit(limit)
-        )
+    async def list(
+        self,
+        db: AsyncSession,
+        offset: int = 0,
+        limit: int = 100,
+        after: Optional[tuple] = None,
+    ) -> Sequence[ModelType]:
+        stmt = select(self.model).order_by(self.model.id)
+        if after:
+            stmt = stmt.where(keyset_after([self.model.id], after))
+        else:
+            stmt = stmt.offset(offset)
+        result = await db.execute(stmt.limit(limit))
         return result.scalars().all()
 
     async def create(self, db: AsyncSession, obj_in: dict) -> ModelType:
-        obj = self.model(**obj_in)
-        db.add(obj)
-        await db.flush()
-        await db.refresh(obj)
-        return obj
+        # INSERT ... RETURNING заполняет объект (id, server defaults) за один запрос
+        stmt = insert(self.model).values(**obj_in).returning(self.model)
+        result = await db.execute(stmt)
+        return result.scalar_one()
 
     async def update(self, db: AsyncSession, db_obj: ModelType, obj_in: dict) -> ModelType:
-        for field, value in obj_in.items():
-            setattr(db_obj, field, value)
-        await db.flush()
-        await db.refresh(db_obj)
-        return db_obj
+        if not obj_in:
+            return db_obj
+        mapper = inspect(self.model)
+        pk_values = mapper.primary_key_from_instance(db_obj)
+        stmt = (
+            update(self.model)
+            .where(and_(*(col == value for col, value in zip(mapper.primary_key, pk_values))))
+            .values(**obj_in)
+            .returning(self.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        return result.scalar_one()
 
     async def delete(self, db: AsyncSession, db_obj: ModelType) -> None:
         await db.delete(db_obj)
         await db.flush()
 
+    async def bulk_create(self, db: AsyncSession, objs_in: Iterable[dict]) -> Sequence[ModelType]:
+        """Вставляет пачку строк одним batched INSERT ... RETURNING (insertmanyvalues)"""
+        objs_in = list(objs_in)
+        if not objs_in:
+            return []
+        result = await db.scalars(insert(self.model).returning(self.model), objs_in)
+        return result.all()
+
+    async def bulk_upsert(
+        self,
+        db: AsyncSession,
+        objs_in: Iterable[dict],
+        *,
+        conflict_cols: Sequence[str],
+        update_cols: Optional[Sequence[str]] = None,
+    ) -> Sequence[ModelType]:
+        """
+        INSERT ... ON CONFLICT (conflict_cols) DO UPDATE ... RETURNING для пачки строк.
+
+        По умолчанию обновляются все переданные колонки, кроме conflict_cols и первичного ключа.
+        """
+        objs_in = list(objs_in)
+        if not objs_in:
+            return []
+        table = self.model.__table__
+        if update_cols is None:
+            skip = set(conflict_cols) | {col.name for col in table.primary_key}
+            update_cols = [key for key in objs_in[0] if key not in skip]
+
+        stmt = pg_insert(self.model)
+        set_ = {col: stmt.excluded[col] for col in update_cols}
+        # onupdate не срабатывает для ON CONFLICT, поэтому updated_at выставляем явно
+        if "updated_at" in table.c and "updated_at" not in set_:
+            set_["updated_at"] = func.now()
+        if set_:
+            stmt = stmt.on_conflict_do_update(index_elements=list(conflict_cols), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+
+        result = await db.scalars(
+            stmt.returning(self.model),
+            objs_in,
+            execution_options={"populate_existing": True},
+        )
+        return result.all()
@@ -2,9 +2,10 @@ from typing import Optional, Sequence
 
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models.chat import Chat, ChatParticipant, ChatType, Message
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, keyset_after
 
 
 class ChatRepository(BaseRepository[Chat]):
@@ -22,6 +23,7 @@ class ChatRepository(BaseRepository[Chat]):
                 ChatParticipant.user_id.in_([user1_id, user2_id]),
             )
             .group_by(Chat.id)
+            .options(selectinload(Chat.participants))
         )
         result = await db.execute(stmt)
         # Additional filtering in Python to ensure exactly two participants
@@ -36,21 +38,34 @@ class ChatParticipantRepository(BaseRepository[ChatParticipant]):
     def __init__(self) -> None:
         super().__init__(ChatParticipant)
 
+    async def list_user_ids(self, db: AsyncSession, chat_id: int) -> list[int]:
+        result = await db.execute(
+            select(ChatParticipant.user_id).where(ChatParticipant.chat_id == chat_id)
+        )
+        return list(result.scalars().all())
+
 
 class MessageRepository(BaseRepository[Message]):
     def __init__(self) -> None:
         super().__init__(Message)
 
     async def list_by_chat(
-        self, db: AsyncSession, chat_id: int, offset: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        chat_id: int,
+        offset: int = 0,
+        limit: int = 100,
+        after: Optional[tuple] = None,
     ) -> Sequence[Message]:
         stmt = (
             select(Message)
             .where(Message.chat_id == chat_id)
-            .order_by(Message.created_at.asc())
-            .offset(offset)
-            .limit(limit)
+            .order_by(Message.created_at.asc(), Message.id.asc())
         )
-        result = await db.execute(stmt)
+        if after:
+            stmt = stmt.where(keyset_after([Message.created_at, Message.id], after))
+        else:
+            stmt = stmt.offset(offset)
+        result = await db.execute(stmt.limit(limit))
         return result.scalars().all()
 
@@ -1,11 +1,62 @@
-from datetime import datetime
-from typing import Optional, Sequence
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Sequence
 
-from sqlalchemy import and_, select
+from sqlalchemy import Boolean, and_, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.event import Event, EventRegistration
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, keyset_after
+
+
+# Колонки, которые скрапер перезаписывает при повторной встрече события
+SCRAPED_UPDATE_COLUMNS = (
+    "title",
+    "description",
+    "date_start",
+    "date_end",
+    "city",
+    "type",
+    "banner",
+    "source_url",
+    "is_online",
+    "tags",
+)
+
+# Колонки листинга перезаписываются, только если изменилась сама карточка (card_hash)
+LISTING_UPDATE_COLUMNS = SCRAPED_UPDATE_COLUMNS + ("card_hash",)
+
+# Колонки, которые дописывает обогащение со страницы деталей
+ENRICHED_UPDATE_COLUMNS = ("description", "date_end", "enriched_hash")
+
+# asyncpg ограничивает запрос 32767 параметрами
+UPSERT_CHUNK_SIZE = 1000
+
+
+def event_fingerprint(
+    source_url: Optional[str], title: str, date_start: Optional[datetime]
+) -> str:
+    """Отпечаток внешнего события: source_url, а без него - title + date_start"""
+    if source_url:
+        raw = f"url:{source_url.strip()}"
+    else:
+        if date_start is not None:
+            # Наивные даты скраперов БД хранит как UTC
+            if date_start.tzinfo is None:
+                date_start = date_start.replace(tzinfo=timezone.utc)
+            date_start = date_start.astimezone(timezone.utc)
+        raw = f"title:{title.strip().lower()}|{date_start.isoformat() if date_start else ''}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def card_hash(row: dict[str, Any]) -> str:
+    """Хеш полей карточки листинга: изменился - событие перезаписывается и обогащается заново"""
+    payload = json.dumps(
+        [row.get(col) for col in SCRAPED_UPDATE_COLUMNS], default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class EventRepository(BaseRepository[Event]):
@@ -21,9 +72,18 @@ class EventRepository(BaseRepository[Event]):
         type: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
+        tags: Optional[list[str]] = None,
+        q: Optional[str] = None,
         offset: int = 0,
         limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> Sequence[Event]:
+        """
+        Поиск событий по фильтрам.
+
+        Если передан q - полнотекстовый поиск по search_vector с сортировкой по ts_rank
+        (только offset-пагинация), иначе сортировка по (date_start, id) с поддержкой курсора.
+        """
         from sqlalchemy import or_, func
         
         stmt = select(Event)
@@ -46,13 +106,33 @@ class EventRepository(BaseRepository[Event]):
             conditions.append(Event.date_start >= date_from)
         if date_to:
             conditions.append(Event.date_end <= date_to)
+        if tags:
+            # Хотя бы один тег совпадает (GIN индекс ix_events_tags)
+            conditions.append(Event.tags.overlap(tags))
+        ts_query = None
+        if q:
+            # Запрос понимает и русскую, и английскую морфологию
+            ts_query = func.websearch_to_tsquery("russian", q).op("||")(
+                func.websearch_to_tsquery("english", q)
+            )
+            conditions.append(Event.search_vector.op("@@")(ts_query))
+        elif after:
+            conditions.append(keyset_after([Event.date_start, Event.id], after))
         
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
-        # Сортируем по дате начала (ближайшие события первыми)
-        stmt = stmt.order_by(Event.date_start.asc())
-        stmt = stmt.offset(offset).limit(limit)
+        if ts_query is not None:
+            stmt = stmt.order_by(
+                func.ts_rank(Event.search_vector, ts_query).desc(), Event.id.asc()
+            )
+            stmt = stmt.offset(offset)
+        else:
+            # Сортируем по дате начала (ближайшие события первыми), id - для стабильного курсора
+            stmt = stmt.order_by(Event.date_start.asc(), Event.id.asc())
+            if not after:
+                stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         
         try:
             result = await db.execute(stmt)
@@ -65,6 +145,104 @@ class EventRepository(BaseRepository[Event]):
             logger.error(f"Error in event repository search: {e}", exc_info=True)
             return []  # Всегда возвращаем список, даже при ошибке
 
+    async def list_by_organizer(
+        self, db: AsyncSession, organizer_id: int
+    ) -> Sequence[Event]:
+        stmt = (
+            select(Event)
+            .where(Event.organizer_id == organizer_id)
+            .order_by(Event.date_start.asc())
+        )
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    async def upsert_scraped(
+        self,
+        db: AsyncSession,
+        rows: Iterable[dict[str, Any]],
+        update_columns: Sequence[str] = LISTING_UPDATE_COLUMNS,
+        compare_columns: Sequence[str] = ("card_hash",),
+        same_card_only: bool = False,
+    ) -> tuple[list[Event], int, int, int]:
+        """
+        Пакетный UPSERT внешних событий по (source, fingerprint).
+
+        Один многострочный INSERT ... ON CONFLICT DO UPDATE ... RETURNING (xmax = 0)
+        на чанк: xmax = 0 у вставленных строк. Существующая строка обновляется
+        (update_columns), только если отличается хоть одна из compare_columns;
+        строки без изменений не перезаписываются и не возвращаются.
+        same_card_only - не обновлять строки, чья карточка успела измениться
+        (для результатов обогащения, посчитанных по старой карточке).
+
+        Returns:
+            (измененные/новые события, inserted, updated, unchanged)
+        """
+        # Дубликаты внутри одного INSERT ... ON CONFLICT запрещены - оставляем последний
+        unique: dict[tuple, dict[str, Any]] = {}
+        for row in rows:
+            unique[(row["source"], row["fingerprint"])] = row
+        batch = list(unique.values())
+
+        events: list[Event] = []
+        inserted = updated = 0
+        for start in range(0, len(batch), UPSERT_CHUNK_SIZE):
+            chunk = batch[start:start + UPSERT_CHUNK_SIZE]
+            stmt = pg_insert(Event).values(chunk)
+            excluded = [stmt.excluded[col] for col in compare_columns]
+            current = [Event.__table__.c[col] for col in compare_columns]
+            changed = tuple_(*current).is_distinct_from(tuple_(*excluded))
+            if same_card_only:
+                changed = and_(Event.__table__.c.card_hash == stmt.excluded.card_hash, changed)
+            stmt = (
+                stmt.on_conflict_do_update(
+                    index_elements=["source", "fingerprint"],
+                    set_={
+                        **{col: stmt.excluded[col] for col in update_columns},
+                        "updated_at": func.now(),
+                    },
+                    where=changed,
+                )
+                .returning(Event, literal_column("xmax = 0", Boolean).label("inserted"))
+                .execution_options(populate_existing=True)
+            )
+            result = await db.execute(stmt)
+            for event, is_new in result.all():
+                events.append(event)
+                if is_new:
+                    inserted += 1
+                else:
+                    updated += 1
+        return events, inserted, updated, len(batch) - inserted - updated
+
+    async def known_fingerprints(
+        self, db: AsyncSession, source: str, fingerprints: Iterable[str]
+    ) -> set[str]:
+        """Какие из отпечатков уже есть в БД (по уникальному индексу source + fingerprint)"""
+        fingerprints = list(set(fingerprints))
+        if not fingerprints:
+            return set()
+        stmt = select(Event.fingerprint).where(
+            Event.source == source, Event.fingerprint.in_(fingerprints)
+        )
+        result = await db.execute(stmt)
+        return set(result.scalars().all())
+
+    async def needs_enrichment(
+        self, db: AsyncSession, source: str, fingerprints: Iterable[str]
+    ) -> set[str]:
+        """Отпечатки событий со ссылкой, для текущей карточки которых еще не загружены детали"""
+        fingerprints = list(set(fingerprints))
+        if not fingerprints:
+            return set()
+        stmt = select(Event.fingerprint).where(
+            Event.source == source,
+            Event.fingerprint.in_(fingerprints),
+            Event.source_url.is_not(None),
+            Event.enriched_hash.is_distinct_from(Event.card_hash),
+        )
+        result = await db.execute(stmt)
+        return set(result.scalars().all())
+
     async def get_participants(self, db: AsyncSession, event_id: int) -> Sequence[EventRegistration]:
         stmt = select(EventRegistration).where(EventRegistration.event_id == event_id)
         result = await db.execute(stmt)
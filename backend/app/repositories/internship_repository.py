@@ -5,7 +5,7 @@ from sqlalchemy import and_, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.internship import InternshipSlot, SlotApplication, SlotCompletion, SlotStatus, ApplicationStatus
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, keyset_after
 
 
 class InternshipSlotRepository(BaseRepository[InternshipSlot]):
@@ -23,6 +23,7 @@ class InternshipSlotRepository(BaseRepository[InternshipSlot]):
         skills: Optional[list[str]] = None,
         offset: int = 0,
         limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> Sequence[InternshipSlot]:
         stmt = select(InternshipSlot)
         conditions = []
@@ -40,11 +41,18 @@ class InternshipSlotRepository(BaseRepository[InternshipSlot]):
             conditions.append(
                 InternshipSlot.required_skills.overlap(skills)
             )
+        if after:
+            conditions.append(
+                keyset_after([InternshipSlot.slot_start, InternshipSlot.id], after)
+            )
 
         if conditions:
             stmt = stmt.where(and_(*conditions))
 
-        stmt = stmt.order_by(InternshipSlot.slot_start).offset(offset).limit(limit)
+        stmt = stmt.order_by(InternshipSlot.slot_start, InternshipSlot.id)
+        if not after:
+            stmt = stmt.offset(offset)
+        stmt = stmt.limit(limit)
         result = await db.execute(stmt)
         return result.scalars().all()
 
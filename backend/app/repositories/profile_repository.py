@@ -10,7 +10,7 @@ from app.models.profile import (
     ProfileSkill,
     Skill,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, keyset_after
 
 
 class ProfileRepository(BaseRepository[Profile]):
@@ -27,6 +27,7 @@ class ProfileRepository(BaseRepository[Profile]):
         skill_names: Optional[List[str]] = None,
         offset: int = 0,
         limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> Sequence[Profile]:
         stmt = select(Profile)
 
@@ -35,6 +36,8 @@ class ProfileRepository(BaseRepository[Profile]):
             conditions.append(Profile.city == city)
         if experience_level:
             conditions.append(Profile.experience_level == experience_level)
+        if after:
+            conditions.append(keyset_after([Profile.id], after))
 
         if conditions:
             stmt = stmt.where(and_(*conditions))
@@ -46,8 +49,10 @@ class ProfileRepository(BaseRepository[Profile]):
         if skill_names:
             stmt = stmt.join(ProfileSkill).join(Skill).where(Skill.name.in_(skill_names))
 
-        stmt = stmt.offset(offset).limit(limit)
-        result = await db.execute(stmt)
+        stmt = stmt.order_by(Profile.id)
+        if not after:
+            stmt = stmt.offset(offset)
+        result = await db.execute(stmt.limit(limit))
         return result.scalars().unique().all()
 
     async def get_by_user_id(self, db: AsyncSession, user_id: int) -> Optional[Profile]:
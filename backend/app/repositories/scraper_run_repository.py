@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.scraper_run import ScraperRun, ScraperRunStatus
+from app.repositories.base import BaseRepository, keyset_after
+
+
+class ScraperRunRepository(BaseRepository[ScraperRun]):
+    def __init__(self) -> None:
+        super().__init__(ScraperRun)
+
+    async def list_recent(
+        self,
+        db: AsyncSession,
+        *,
+        source: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[tuple] = None,
+    ) -> Sequence[ScraperRun]:
+        """Запуски от новых к старым"""
+        stmt = select(ScraperRun).order_by(ScraperRun.started_at.desc(), ScraperRun.id.desc())
+        if source:
+            stmt = stmt.where(ScraperRun.source == source)
+        if after:
+            stmt = stmt.where(
+                keyset_after([ScraperRun.started_at, ScraperRun.id], after, descending=True)
+            )
+        result = await db.execute(stmt.limit(limit))
+        return result.scalars().all()
+
+    async def duration_stats(self, db: AsyncSession, since: datetime) -> list[dict]:
+        """p50/p95 длительности запуска и стадий по источникам с момента since"""
+
+        def percentile(fraction: float, column):
+            return func.percentile_cont(fraction).within_group(column)
+
+        stmt = (
+            select(
+                ScraperRun.source,
+                func.count().label("runs"),
+                func.sum(
+                    case((ScraperRun.status.in_([
+                        ScraperRunStatus.FAILED.value, ScraperRunStatus.FETCH_FAILED.value
+                    ]), 1), else_=0)
+                ).label("failures"),
+                percentile(0.5, ScraperRun.duration_ms).label("duration_p50_ms"),
+                percentile(0.95, ScraperRun.duration_ms).label("duration_p95_ms"),
+                percentile(0.5, ScraperRun.fetch_ms).label("fetch_p50_ms"),
+                percentile(0.95, ScraperRun.fetch_ms).label("fetch_p95_ms"),
+                percentile(0.5, ScraperRun.parse_ms).label("parse_p50_ms"),
+                percentile(0.95, ScraperRun.parse_ms).label("parse_p95_ms"),
+                percentile(0.5, ScraperRun.db_ms).label("db_p50_ms"),
+                percentile(0.95, ScraperRun.db_ms).label("db_p95_ms"),
+            )
+            .where(ScraperRun.started_at >= since)
+            .group_by(ScraperRun.source)
+            .order_by(ScraperRun.source)
+        )
+        result = await db.execute(stmt)
+        return [dict(row._mapping) for row in result]
+
+    async def delete_older_than(self, db: AsyncSession, before: datetime) -> int:
+        """Удаляет историю запусков старше before; возвращает число удаленных строк"""
+        result = await db.execute(delete(ScraperRun).where(ScraperRun.started_at < before))
+        return result.rowcount or 0
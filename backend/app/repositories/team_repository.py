@@ -4,7 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.team import Team, TeamMember, TeamOpenPosition
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, keyset_after
 
 
 class TeamRepository(BaseRepository[Team]):
@@ -18,11 +18,16 @@ class TeamRepository(BaseRepository[Team]):
         name: Optional[str] = None,
         offset: int = 0,
         limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> Sequence[Team]:
         stmt = select(Team)
         if name:
             stmt = stmt.where(Team.name.ilike(f"%{name}%"))
-        stmt = stmt.offset(offset).limit(limit)
+        if after:
+            stmt = stmt.where(keyset_after([Team.id], after))
+        else:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(Team.id).limit(limit)
         result = await db.execute(stmt)
         return result.scalars().all()
 
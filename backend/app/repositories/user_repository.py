@@ -1,10 +1,10 @@
-from typing import Optional
+from typing import Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, keyset_after
 
 
 class UserRepository(BaseRepository[User]):
@@ -15,3 +15,21 @@ class UserRepository(BaseRepository[User]):
         result = await db.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
 
+
+    async def list_recent(
+        self,
+        db: AsyncSession,
+        offset: int = 0,
+        limit: int = 50,
+        after: Optional[tuple] = None,
+    ) -> Sequence[User]:
+        """Пользователи от новых к старым"""
+        stmt = select(User).order_by(User.created_at.desc(), User.id.desc())
+        if after:
+            stmt = stmt.where(
+                keyset_after([User.created_at, User.id], after, descending=True)
+            )
+        else:
+            stmt = stmt.offset(offset)
+        result = await db.execute(stmt.limit(limit))
+        return result.scalars().all()
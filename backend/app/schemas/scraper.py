@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.scrapers.circuit_breaker import BreakerState
+from app.services.scrape_job_service import ScrapeJob, ScrapeJobStatus
+
+
+class SourceHealthRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    source: str
+    state: BreakerState
+    failures: int
+    cooldown_seconds: float
+    opened_until: Optional[datetime]
+    last_error: Optional[str]
+    updated_at: Optional[datetime]
+
+
+class ScraperRunRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    source: str
+    status: str
+    started_at: datetime
+    duration_ms: int
+    fetch_ms: Optional[int]
+    http_status: Optional[int]
+    bytes_received: Optional[int]
+    pages_fetched: int
+    parse_ms: Optional[int]
+    cards_found: Optional[int]
+    events_parsed: Optional[int]
+    inserted: int
+    updated: int
+    unchanged: int
+    db_ms: Optional[int]
+    error_class: Optional[str]
+    error_message: Optional[str]
+
+
+class ScraperRunStats(BaseModel):
+    source: str
+    runs: int
+    failures: int
+    duration_p50_ms: Optional[float]
+    duration_p95_ms: Optional[float]
+    fetch_p50_ms: Optional[float]
+    fetch_p95_ms: Optional[float]
+    parse_p50_ms: Optional[float]
+    parse_p95_ms: Optional[float]
+    db_p50_ms: Optional[float]
+    db_p95_ms: Optional[float]
+
+
+class ScraperRunsReport(BaseModel):
+    stats: List[ScraperRunStats]
+    runs: List[ScraperRunRead]
+
+
+class ScheduledJobRead(BaseModel):
+    id: str
+    name: str
+    next_run_time: Optional[datetime]
+
+
+class SchedulerStatusRead(BaseModel):
+    # Держатель аренды лидера; None - лидера сейчас нет
+    leader: Optional[str]
+    lease_remaining_seconds: Optional[float]
+    # Расписание, опубликованное лидером
+    jobs: List[ScheduledJobRead]
+    # Задач в очереди фонового воркера
+    queued_jobs: int
+
+
+class ScrapeJobRead(BaseModel):
+    id: str
+    status: ScrapeJobStatus
+    requested_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    results: Dict[str, int]
+    total: int
+    error: Optional[str]
+    attached: int
+    # Запрос присоединился к уже идущему или недавно завершенному запуску
+    coalesced: bool = False
+
+    @classmethod
+    def from_job(cls, job: ScrapeJob, coalesced: bool = False) -> "ScrapeJobRead":
+        def timestamp(value: float) -> Optional[datetime]:
+            return datetime.fromtimestamp(value, tz=timezone.utc) if value else None
+
+        return cls(
+            id=job.id,
+            status=job.status,
+            requested_at=timestamp(job.requested_at),
+            started_at=timestamp(job.started_at),
+            finished_at=timestamp(job.finished_at),
+            results=job.results,
+            total=job.total,
+            error=job.error,
+            attached=job.attached,
+            coalesced=coalesced,
+        )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 
 from app.models.user import UserRole
 
@@ -17,9 +17,17 @@ class UserCreate(BaseModel):
 
 
 class UserUpdate(BaseModel):
+    # Поля необязательны, но явный null недопустим: колонки NOT NULL
     role: UserRole | None = None
     is_active: bool | None = None
 
+    @field_validator("role", "is_active", mode="before")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
 
 class UserRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -1,48 +1,155 @@
+import asyncio
 import logging
-from abc import ABC, abstractmethod
+from abc import ABC
 from datetime import datetime
-from typing import Any, Optional
-from urllib.parse import urljoin
-
-from bs4 import BeautifulSoup
-from sqlalchemy import and_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Optional, Union
 
+from app.core.config import get_settings
 from app.core.db import AsyncSessionLocal
-from app.models.event import Event
-from app.repositories.event_repository import EventRepository
-from app.utils.http_client import HttpClient
+from app.core.metrics import metrics
+from app.models.scraper_run import ScraperRunStatus
+from app.repositories.event_repository import EventRepository, card_hash, event_fingerprint
+from app.scrapers.circuit_breaker import circuit_breaker
+from app.scrapers.content_state import ContentHashStore, content_hash
+from app.scrapers.enrichment import enrichment_queue
+from app.scrapers.extraction import (
+    DETAIL_SPEC,
+    Extractor,
+    SourceSpec,
+    json_ld_event,
+    parse_iso_datetime,
+)
+from app.scrapers.frontier import CrawlFrontier
+from app.scrapers.parse_pool import parse_pool
+from app.scrapers.run_log import ScrapeRun, record as record_run
+from app.scrapers.transport import scraper_transport
+from app.services.event_cache import event_cache, event_tags
+from app.utils.http_cache import HttpValidatorCache
+from app.utils.http_client import NOT_MODIFIED, HttpClient, NotModified
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 
 class BaseScraper(ABC):
     """Базовый класс для всех скраперов событий"""
 
+    # Декларативное описание карточек источника; используется parse() по умолчанию
+    spec: Optional[SourceSpec] = None
+    # Страница деталей события (см. parse_detail); по умолчанию - JSON-LD и мета-теги
+    detail_spec: SourceSpec = DETAIL_SPEC
+    # Расписание по умолчанию; переопределяется settings.scraper.schedules (см. registry)
+    schedule_interval_seconds: float = 30 * 60
+    schedule_jitter_seconds: float = 60
+    run_timeout_seconds: float = 5 * 60
+
     def __init__(self, name: str, base_url: str):
         self.name = name
         self.base_url = base_url
         self.event_repo = EventRepository()
-        # Используем HttpClient с таймаутом 5 секунд и 3 ретраями
-        self.http_client = HttpClient(
-            timeout=5.0,
-            max_retries=3,
-            retry_delay=1.0,
-        )
+        self.content_hashes = ContentHashStore(settings.scraper.content_hash_ttl_seconds)
+        self._http_client: Optional[HttpClient] = None
+        # Заполняется parse() реализаций: число карточек-кандидатов до фильтрации
+        self.last_cards_found: Optional[int] = None
+        # Заполняется parse(): ссылки пагинации листинга
+        self.last_links: list[str] = []
+        self._extractor: Optional[Extractor] = None
+        self._detail_extractor: Optional[Extractor] = None
+        self._runs_skipped = metrics.counter(f"scraper.{name}.runs_skipped")
+        self._runs_processed = metrics.counter(f"scraper.{name}.runs_processed")
 
-    async def fetch_html(self, url: str) -> Optional[str]:
+    @property
+    def http_client(self) -> HttpClient:
+        # Создается лениво: экземпляры в процессах парсинга HTTP не используют
+        if self._http_client is None:
+            # HttpClient поверх общего транспорта с таймаутом 5 секунд и 3 ретраями
+            self._http_client = HttpClient(
+                transport=scraper_transport,
+                timeout=5.0,
+                max_retries=3,
+                retry_delay=1.0,
+                validator_cache=(
+                    HttpValidatorCache(settings.scraper.http_cache_dir)
+                    if settings.scraper.http_cache_dir
+                    else None
+                ),
+            )
+        return self._http_client
+
+    @http_client.setter
+    def http_client(self, client: HttpClient) -> None:
+        # Подмена клиента, например ReplayHttpClient для офлайн-бенчмарка
+        self._http_client = client
+
+    async def fetch_html(self, url: str) -> Union[str, NotModified, None]:
         """
         Асинхронно получает HTML содержимое страницы с автоматическими ретраями.
         
         Returns:
-            str: HTML содержимое или None в случае ошибки
+            str: HTML содержимое, NOT_MODIFIED (страница не менялась) или None в случае ошибки
         """
-        return await self.http_client.get(url)
+        return await self.http_client.get(url, conditional=True)
+
+    @property
+    def extractor(self) -> Extractor:
+        # Селекторы компилируются один раз на экземпляр (в воркере пула экземпляр кешируется)
+        if self._extractor is None:
+            if self.spec is None:
+                raise NotImplementedError(f"{type(self).__name__} must define spec or override parse()")
+            if type(self).build_event is BaseScraper.build_event:
+                raise NotImplementedError(f"{type(self).__name__} defines spec but not build_event()")
+            self._extractor = Extractor(self.spec, self.base_url)
+        return self._extractor
 
-    @abstractmethod
     def parse(self, html: str) -> list[dict[str, Any]]:
-        """Парсит HTML и возвращает список словарей с данными событий"""
-        pass
+        """
+        Парсит HTML и возвращает список словарей с данными событий.
+        По умолчанию извлекает поля карточек по self.spec и собирает события build_event().
+        Выполняется в отдельном процессе (см. parse_pool): только чистые функции от html.
+        """
+        records, self.last_cards_found, self.last_links = self.extractor.extract(html)
+        logger.info(f"[{self.name}] Found {self.last_cards_found} potential event cards")
+
+        events = []
+        for i, record in enumerate(records, 1):
+            try:
+                event_data = self.build_event(record)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Error parsing event card {i}: {e}")
+                continue
+            if event_data and event_data.get("title"):
+                events.append(event_data)
+        return events
+
+    def build_event(self, record: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """
+        Собирает событие из значений полей одной карточки; None - карточка не событие.
+        Обязателен для скраперов со spec (проверяется один раз в extractor).
+        """
+        raise NotImplementedError
+
+    def parse_detail(self, html: str) -> dict[str, Any]:
+        """
+        Извлекает со страницы деталей события description и date_end (None - не найдено).
+        Выполняется в процессе parse_pool, как и parse().
+        """
+        if self._detail_extractor is None:
+            self._detail_extractor = Extractor(self.detail_spec, self.base_url)
+        records = self._detail_extractor.extract(html).records
+        if not records:
+            return {"description": None, "date_end": None}
+        record = records[0]
+        event = json_ld_event(record["json_ld"])
+
+        description = event.get("description") if isinstance(event.get("description"), str) else None
+        if not description and record["paragraphs"]:
+            description = "\n\n".join(record["paragraphs"])[:5000]
+        if not description:
+            description = record["meta_description"] or None
+
+        date_end = parse_iso_datetime(event.get("endDate")) or parse_iso_datetime(record["end_date"])
+        return {"description": description, "date_end": date_end}
 
     def normalize_event(self, data: dict[str, Any]) -> dict[str, Any]:
         """Нормализует данные события для сохранения в БД"""
@@ -69,57 +176,116 @@ class BaseScraper(ABC):
         if not isinstance(normalized["date_start"], datetime):
             raise ValueError("start_date must be a datetime object")
 
+        normalized["card_hash"] = card_hash(normalized)
+        normalized["fingerprint"] = event_fingerprint(
+            normalized["source_url"], normalized["title"], normalized["date_start"]
+        )
+
         return normalized
 
-    async def save_or_update(self, event_data: dict[str, Any], db: AsyncSession) -> Event:
-        """Сохраняет или обновляет событие в БД (UPSERT)"""
-        try:
-            normalized = self.normalize_event(event_data)
+    async def save_events(
+        self, events_data: list[dict[str, Any]], run: Optional[ScrapeRun] = None
+    ) -> int:
+        """
+        Нормализует и сохраняет пачку событий одним UPSERT-запросом.
+        Возвращает количество сохраненных (новых + обновленных + без изменений) событий.
+        """
+        run = run or ScrapeRun(source=self.name)
+        normalized = []
+        for i, event_data in enumerate(events_data, 1):
+            try:
+                normalized.append(self.normalize_event(event_data))
+            except Exception as e:
+                logger.error(f"[{self.name}] ❌ Error processing event {i}: {e}")
+        if not normalized:
+            return 0
 
-            # Ищем существующее событие по source_url или title + start_date
-            conditions = [Event.source == "external"]
-            
-            if normalized["source_url"]:
-                # Если есть source_url, ищем по нему
-                conditions.append(Event.source_url == normalized["source_url"])
-            else:
-                # Иначе ищем по title + start_date
-                conditions.append(Event.title == normalized["title"])
-                conditions.append(Event.date_start == normalized["date_start"])
-            
-            stmt = select(Event).where(and_(*conditions))
-            result = await db.execute(stmt)
-            existing_event = result.scalar_one_or_none()
-
-            if existing_event:
-                # Обновляем существующее событие
-                logger.info(f"[{self.name}] Updating event: {normalized['title']}")
-                for key, value in normalized.items():
-                    setattr(existing_event, key, value)
-                await db.flush()
-                await db.refresh(existing_event)
-                return existing_event
-            else:
-                # Создаем новое событие
-                logger.info(f"[{self.name}] Creating new event: {normalized['title']}")
-                event = await self.event_repo.create(db, normalized)
-                return event
+        with run.stage("db"):
+            async with AsyncSessionLocal() as db:
+                events, run.inserted, run.updated, run.unchanged = await self.event_repo.upsert_scraped(
+                    db, normalized
+                )
+                await db.commit()
+        logger.info(
+            f"[{self.name}] ✅ Saved {len(normalized)}/{len(events_data)} events to DB "
+            f"(inserted={run.inserted}, updated={run.updated}, unchanged={run.unchanged})"
+        )
+
+        cache_tags: set[str] = set()
+        for event in events:
+            cache_tags |= event_tags(event.id, event.city, event.type)
+        await event_cache.invalidate(cache_tags)
 
+        if settings.scraper.enrich_enabled:
+            await self._enqueue_enrichment(normalized)
+        return run.inserted + run.updated + run.unchanged
+
+    async def _enqueue_enrichment(self, rows: list[dict[str, Any]]) -> None:
+        """Ставит в очередь страницы деталей для новых и изменившихся карточек"""
+        by_fingerprint = {row["fingerprint"]: row for row in rows if row["source_url"]}
+        try:
+            async with AsyncSessionLocal() as db:
+                stale = await self.event_repo.needs_enrichment(db, "external", by_fingerprint.keys())
         except Exception as e:
-            logger.error(f"[{self.name}] Error saving event: {e}")
-            raise
+            logger.warning(f"[{self.name}] Could not select events for enrichment: {e}")
+            return
+        if stale:
+            queued = enrichment_queue.submit(self, [by_fingerprint[fp] for fp in stale])
+            logger.info(f"[{self.name}] Queued {queued}/{len(stale)} event(s) for detail enrichment")
 
     async def scrape(self) -> int:
         """
         Основной метод для запуска парсинга.
         Возвращает количество обработанных событий или 0 в случае ошибки.
+        Каждый запуск (включая пропуски) записывается в scraper_runs.
         """
+        run = ScrapeRun(source=self.name)
+        try:
+            return await self._scrape(run)
+        except asyncio.CancelledError:
+            # Запуск отменен по таймауту (scraper_service.run_scraper) или при остановке
+            run.fail(ScraperRunStatus.FAILED, TimeoutError("scrape was cancelled"))
+            raise
+        finally:
+            run.finish()
+            await record_run(run)
+
+    async def _scrape(self, run: ScrapeRun) -> int:
         logger.info(f"[{self.name}] 🚀 Starting scraping from {self.base_url}")
         count = 0
 
+        decision = await circuit_breaker.allow(self.name)
+        if not decision.allowed:
+            logger.info(f"[{self.name}] ⏸ Circuit open, source is skipped until its probe window")
+            run.status = ScraperRunStatus.SKIPPED
+            return 0
+        if decision.probe:
+            # Пробный запрос к "больному" источнику - одна попытка без ретраев
+            self.http_client.max_retries = 1
+
         try:
             # Получаем HTML с автоматическими ретраями
-            html = await self.fetch_html(self.base_url)
+            with run.stage("fetch"):
+                html = await self.fetch_html(self.base_url)
+            run.pages_fetched = 1
+            run.http_status = self.http_client.last_status_code
+            run.bytes_received = self.http_client.bytes_received
+
+            if html is None:
+                error = self.http_client.last_error
+                run.fail(ScraperRunStatus.FETCH_FAILED, error)
+                await circuit_breaker.record_failure(
+                    self.name, f"{type(error).__name__}: {error}" if error else "fetch failed"
+                )
+            else:
+                await circuit_breaker.record_success(self.name)
+
+            # Источник не изменился (304) - ни парсинг, ни БД не нужны
+            if html is NOT_MODIFIED:
+                logger.info(f"[{self.name}] ✅ Not modified since last run, skipping")
+                self._runs_skipped.inc()
+                run.status = ScraperRunStatus.NOT_MODIFIED
+                return 0
             
             # Если не удалось получить HTML, возвращаем 0
             if not html:
@@ -127,45 +293,143 @@ class BaseScraper(ABC):
                 return 0
             
             logger.info(f"[{self.name}] ✅ HTML fetched, length: {len(html)} chars")
+
+            # Сайты без ETag/Last-Modified: сравниваем хеш нормализованного HTML
+            digest = content_hash(html)
+            if digest == await self.content_hashes.get(self.base_url):
+                logger.info(f"[{self.name}] ✅ Content unchanged since last run, skipping")
+                self._runs_skipped.inc()
+                run.status = ScraperRunStatus.UNCHANGED
+                await self.http_client.commit_validators()
+                return 0
             
             # Парсим события
             try:
-                events_data = self.parse(html)
+                with run.stage("parse"):
+                    parsed = await parse_pool.parse(self, html)
+                events_data = parsed.events
+                run.cards_found = parsed.cards_found
                 logger.info(f"[{self.name}] ✅ Parsed {len(events_data)} events from HTML")
             except Exception as e:
                 logger.error(f"[{self.name}] ❌ Error parsing HTML: {e}", exc_info=True)
+                run.fail(ScraperRunStatus.FAILED, e)
                 return 0
 
+            # Следующие страницы листинга; пробный запрос к "больному" источнику их не трогает
+            page_digests = [(self.base_url, digest)]
+            if parsed.links and not decision.probe and settings.scraper.crawl_max_pages > 1:
+                more_events, more_digests = await self._crawl(run, parsed.links)
+                events_data = events_data + more_events
+                page_digests += more_digests
+            run.events_parsed = len(events_data)
+            run.bytes_received = self.http_client.bytes_received
+
             # Сохраняем события в БД
             if events_data:
-                async with AsyncSessionLocal() as db:
-                    for i, event_data in enumerate(events_data, 1):
-                        try:
-                            await self.save_or_update(event_data, db)
-                            count += 1
-                            if i <= 3:  # Логируем первые 3 для диагностики
-                                logger.info(f"[{self.name}] 💾 Saved event {i}: {event_data.get('title', 'Unknown')[:50]}")
-                        except Exception as e:
-                            logger.error(f"[{self.name}] ❌ Error processing event {i}: {e}")
-                            continue
-
-                    await db.commit()
-                    logger.info(f"[{self.name}] ✅ Successfully saved {count}/{len(events_data)} events to DB")
+                count = await self.save_events(events_data, run)
             else:
                 logger.warning(f"[{self.name}] ⚠️ No events found in HTML")
 
+            # Страница обработана полностью - теперь можно доверять 304 и хешу в следующий раз
+            await self.http_client.commit_validators()
+            for url, page_digest in page_digests:
+                await self.content_hashes.set(url, page_digest)
+            self._runs_processed.inc()
+
         except Exception as e:
             logger.error(f"[{self.name}] ❌ Error during scraping: {e}", exc_info=True)
+            run.fail(ScraperRunStatus.FAILED, e)
             # Возвращаем 0 вместо проброса исключения
             return 0
 
         return count
 
+    async def _crawl(
+        self, run: ScrapeRun, links: list[str]
+    ) -> tuple[list[dict[str, Any]], list[tuple[str, str]]]:
+        """
+        Обходит пагинацию листинга, начиная со ссылок первой страницы.
+
+        Листинг идет от новых событий к старым, поэтому страницы уровня
+        качаются в порядке ссылок небольшими пачками (по лимиту на хост), и обход
+        останавливается целиком на первой странице, которая не изменилась с
+        прошлого запуска или все события которой уже есть в БД: дальше - только
+        более старые страницы.
+
+        Returns:
+            (события со всех страниц, [(url, хеш содержимого)] для фиксации после сохранения)
+        """
+        frontier = CrawlFrontier(
+            self.base_url, settings.scraper.crawl_max_depth, settings.scraper.crawl_max_pages
+        )
+        frontier.add(links, depth=1)
+        batch_size = max(1, settings.scraper.http_per_host_concurrency)
+        events_data: list[dict[str, Any]] = []
+        digests: list[tuple[str, str]] = []
+        crawled = 0
+
+        while level := frontier.next_level():
+            for start in range(0, len(level), batch_size):
+                batch = level[start:start + batch_size]
+                with run.stage("fetch"):
+                    pages = await asyncio.gather(
+                        *(self.http_client.get(url, conditional=True) for url, _ in batch),
+                        return_exceptions=True,
+                    )
+                run.pages_fetched += len(batch)
+                crawled += len(batch)
+
+                for (url, depth), html in zip(batch, pages):
+                    if isinstance(html, BaseException) or not html:
+                        logger.warning(f"[{self.name}] ⚠️ Failed to fetch page {url}: {html}")
+                        continue
+                    digest = None if html is NOT_MODIFIED else content_hash(html)
+                    if digest is None or digest == await self.content_hashes.get(url):
+                        logger.info(f"[{self.name}] Page {url} unchanged, stopping crawl")
+                        return self._crawled(crawled, events_data, digests)
+                    try:
+                        with run.stage("parse"):
+                            parsed = await parse_pool.parse(self, html)
+                    except Exception as e:
+                        logger.warning(f"[{self.name}] ⚠️ Error parsing page {url}: {e}")
+                        # Иначе следующий запуск получит 304 и страницу больше не разберет
+                        self.http_client.discard_validators(url)
+                        continue
+
+                    run.cards_found = (run.cards_found or 0) + (parsed.cards_found or 0)
+                    events_data.extend(parsed.events)
+                    digests.append((url, digest))
+                    if await self._all_known(parsed.events):
+                        logger.info(f"[{self.name}] Page {url} has no new events, stopping crawl")
+                        return self._crawled(crawled, events_data, digests)
+                    frontier.add(parsed.links, depth=depth + 1)
+
+        return self._crawled(crawled, events_data, digests)
+
+    def _crawled(
+        self, crawled: int, events_data: list[dict[str, Any]], digests: list[tuple[str, str]]
+    ) -> tuple[list[dict[str, Any]], list[tuple[str, str]]]:
+        logger.info(f"[{self.name}] Crawled {crawled} more page(s), {len(events_data)} events")
+        return events_data, digests
+
+    async def _all_known(self, events_data: list[dict[str, Any]]) -> bool:
+        fingerprints = set()
+        for event_data in events_data:
+            try:
+                fingerprints.add(self.normalize_event(event_data)["fingerprint"])
+            except ValueError:
+                continue
+        if not fingerprints:
+            return True
+        async with AsyncSessionLocal() as db:
+            known = await self.event_repo.known_fingerprints(db, "external", fingerprints)
+        return known >= fingerprints
+
     async def close(self):
         """Закрывает HTTP клиент"""
-        if hasattr(self, "http_client"):
+        if self._http_client is not None:
             try:
-                await self.http_client.close()
+                await self._http_client.close()
             except Exception as e:
                 logger.warning(f"[{self.name}] Error closing HTTP client: {e}")
 
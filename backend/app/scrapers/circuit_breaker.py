@@ -0,0 +1,184 @@
+"""
+Circuit breaker для источников скраперов.
+
+Состояния источника (хранятся в Redis, общие для всех воркеров):
+- closed: источник здоров, скрапер запускается как обычно;
+- open: после failure_threshold неудач подряд источник не опрашивается
+  до opened_until - мертвый сайт ничего не стоит;
+- half_open: окно паузы истекло, ровно один воркер делает пробный запрос
+  (без ретраев). Успех закрывает цепь, неудача снова открывает ее с
+  удвоенной паузой (до max_cooldown).
+"""
+import logging
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class SourceHealth:
+    source: str
+    state: BreakerState = BreakerState.CLOSED
+    failures: int = 0
+    cooldown_seconds: float = 0
+    opened_until: float = 0
+    last_error: Optional[str] = None
+    updated_at: float = 0
+
+    @classmethod
+    def from_redis(cls, source: str, data: dict) -> "SourceHealth":
+        if not data:
+            return cls(source=source)
+        return cls(
+            source=source,
+            state=BreakerState(data.get("state", BreakerState.CLOSED.value)),
+            failures=int(data.get("failures", 0)),
+            cooldown_seconds=float(data.get("cooldown_seconds", 0)),
+            opened_until=float(data.get("opened_until", 0)),
+            last_error=data.get("last_error") or None,
+            updated_at=float(data.get("updated_at", 0)),
+        )
+
+    def to_redis(self) -> dict:
+        data = asdict(self)
+        data.pop("source")
+        data["state"] = self.state.value
+        data["last_error"] = self.last_error or ""
+        return data
+
+
+@dataclass(frozen=True)
+class BreakerDecision:
+    allowed: bool
+    # Пробный запрос в half-open: без ретраев и альтернативных URL
+    probe: bool = False
+
+
+class CircuitBreaker:
+    prefix = "scraper:breaker"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        base_cooldown_seconds: float,
+        max_cooldown_seconds: float,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.base_cooldown_seconds = base_cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self._skipped = metrics.counter("scraper.breaker.skipped")
+        self._opened = metrics.counter("scraper.breaker.opened")
+
+    def _key(self, source: str) -> str:
+        return f"{self.prefix}:{source}"
+
+    def _probe_key(self, source: str) -> str:
+        return f"{self.prefix}:{source}:probe"
+
+    async def get(self, source: str) -> SourceHealth:
+        data = await get_redis_client().hgetall(self._key(source))
+        return SourceHealth.from_redis(source, data)
+
+    async def _save(self, health: SourceHealth) -> None:
+        health.updated_at = time.time()
+        await get_redis_client().hset(self._key(health.source), mapping=health.to_redis())
+
+    async def allow(self, source: str) -> BreakerDecision:
+        try:
+            health = await self.get(source)
+            if health.state == BreakerState.CLOSED:
+                return BreakerDecision(allowed=True)
+            if time.time() < health.opened_until:
+                self._skipped.inc()
+                return BreakerDecision(allowed=False)
+            # Окно паузы истекло: пробует только воркер, взявший probe-ключ
+            acquired = await get_redis_client().set(
+                self._probe_key(source), "1", nx=True, ex=max(int(health.cooldown_seconds), 60)
+            )
+            if not acquired:
+                self._skipped.inc()
+                return BreakerDecision(allowed=False)
+            health.state = BreakerState.HALF_OPEN
+            await self._save(health)
+            logger.info(f"[{source}] Circuit half-open, probing")
+            return BreakerDecision(allowed=True, probe=True)
+        except Exception as e:
+            # Без Redis работаем как без breaker'а
+            logger.warning(f"[{source}] Circuit breaker unavailable: {e}")
+            return BreakerDecision(allowed=True)
+
+    async def record_success(self, source: str) -> None:
+        try:
+            health = await self.get(source)
+            if health.state == BreakerState.CLOSED and health.failures == 0:
+                return
+            if health.state != BreakerState.CLOSED:
+                logger.info(f"[{source}] Circuit closed after successful probe")
+            await self._save(SourceHealth(source=source))
+            await get_redis_client().delete(self._probe_key(source))
+        except Exception as e:
+            logger.warning(f"[{source}] Circuit breaker unavailable: {e}")
+
+    async def record_failure(self, source: str, error: str) -> None:
+        try:
+            health = await self.get(source)
+            health.failures += 1
+            health.last_error = error[:500]
+            if health.state == BreakerState.HALF_OPEN:
+                # Проба не удалась - пауза удваивается
+                health.cooldown_seconds = min(
+                    max(health.cooldown_seconds, self.base_cooldown_seconds) * 2,
+                    self.max_cooldown_seconds,
+                )
+                self._open(health)
+            elif health.state == BreakerState.CLOSED and health.failures >= self.failure_threshold:
+                health.cooldown_seconds = self.base_cooldown_seconds
+                self._open(health)
+            await self._save(health)
+            await get_redis_client().delete(self._probe_key(source))
+        except Exception as e:
+            logger.warning(f"[{source}] Circuit breaker unavailable: {e}")
+
+    def _open(self, health: SourceHealth) -> None:
+        health.state = BreakerState.OPEN
+        health.opened_until = time.time() + health.cooldown_seconds
+        self._opened.inc()
+        logger.warning(
+            f"[{health.source}] Circuit opened for {health.cooldown_seconds:.0f}s "
+            f"after {health.failures} failure(s): {health.last_error}"
+        )
+
+    async def list(self) -> list[SourceHealth]:
+        client = get_redis_client()
+        result = []
+        async for key in client.scan_iter(match=f"{self.prefix}:*"):
+            if key.endswith(":probe"):
+                continue
+            source = key[len(self.prefix) + 1:]
+            result.append(SourceHealth.from_redis(source, await client.hgetall(key)))
+        return sorted(result, key=lambda h: h.source)
+
+    async def reset(self, source: str) -> None:
+        await get_redis_client().delete(self._key(source), self._probe_key(source))
+
+
+circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.scraper.breaker_failure_threshold,
+    base_cooldown_seconds=settings.scraper.breaker_base_cooldown_seconds,
+    max_cooldown_seconds=settings.scraper.breaker_max_cooldown_seconds,
+)
@@ -0,0 +1,67 @@
+"""
+Хеш содержимого страниц источников для пропуска неизменившихся страниц.
+
+Многие сайты не отдают ETag/Last-Modified, поэтому после загрузки считаем
+хеш нормализованного HTML: без скриптов, стилей, CSRF-токенов, nonce и
+временных меток, которые меняются на каждый запрос. Если хеш совпал с
+прошлым успешным запуском, парсинг и запись в БД пропускаются.
+"""
+import hashlib
+import logging
+import re
+from typing import Optional
+
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+_VOLATILE_PATTERNS = [
+    # Встроенные скрипты и стили (аналитика, build id, state гидратации)
+    re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL),
+    re.compile(r"<style\b[^>]*>.*?</style>", re.IGNORECASE | re.DOTALL),
+    re.compile(r"<!--.*?-->", re.DOTALL),
+    # CSRF: <input name="csrfmiddlewaretoken" value=...>, <meta name="csrf-token" content=...>
+    re.compile(r"<(?:input|meta)\b[^>]*(?:csrf|xsrf|_token)[^>]*>", re.IGNORECASE),
+    re.compile(r"\s(?:nonce|data-csrf[\w-]*|data-timestamp|data-time)=(?:\"[^\"]*\"|'[^']*')", re.IGNORECASE),
+    # Временные метки генерации страницы и cache-buster'ы (?v=1700000000000).
+    # Даты в тексте не трогаем - это данные событий.
+    re.compile(r"<meta\b[^>]*(?:generated|timestamp|server-time)[^>]*>", re.IGNORECASE),
+    re.compile(r"([?&](?:v|t|ts|_|cb|timestamp)=)\d{9,}"),
+]
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_html(html: str) -> str:
+    for pattern in _VOLATILE_PATTERNS:
+        html = pattern.sub(lambda m: m.group(1) if m.re.groups else "", html)
+    return _WHITESPACE.sub(" ", html).strip()
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(normalize_html(html).encode("utf-8")).hexdigest()
+
+
+class ContentHashStore:
+    """Последний успешно обработанный хеш страницы по URL (Redis)"""
+
+    prefix = "scraper:content_hash"
+
+    def __init__(self, ttl_seconds: int) -> None:
+        # TTL гарантирует периодическую полную переобработку даже без изменений
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, url: str) -> str:
+        return f"{self.prefix}:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+    async def get(self, url: str) -> Optional[str]:
+        try:
+            return await get_redis_client().get(self._key(url))
+        except Exception as e:
+            logger.warning(f"Content hash store unavailable: {e}")
+            return None
+
+    async def set(self, url: str, digest: str) -> None:
+        try:
+            await get_redis_client().set(self._key(url), digest, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Content hash store: failed to store hash for {url}: {e}")
@@ -0,0 +1,179 @@
+"""
+Фоновое обогащение внешних событий данными со страниц деталей.
+
+Карточка листинга дает мало: описание часто пустое, date_end нет вообще.
+Страница деталей загружается только для событий, у которых карточка новая
+или изменилась: в БД хранятся card_hash (хеш полей карточки) и
+enriched_hash (card_hash, для которого детали уже загружены), кандидаты -
+строки, где они различаются.
+
+save_events() отдает кандидатов в EnrichmentQueue и не ждет ее. Очередь
+обрабатывает их фиксированным числом воркеров (HTTP через общий транспорт,
+разбор - в parse_pool) и пачками сохраняет через тот же UPSERT, что и
+листинг, но только колонки обогащения. Очередь живет в памяти процесса:
+потерянные при рестарте задачи вернутся при следующем изменении страницы
+листинга, потому что enriched_hash у них не обновился.
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.core.metrics import metrics
+from app.repositories.event_repository import ENRICHED_UPDATE_COLUMNS, EventRepository
+from app.scrapers.parse_pool import parse_pool
+from app.scrapers.transport import scraper_transport
+from app.services.event_cache import event_cache, event_tags
+from app.utils.http_client import HttpClient
+
+if TYPE_CHECKING:
+    from app.scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def merge_detail(row: dict[str, Any], detail: dict[str, Any]) -> dict[str, Any]:
+    """Строка листинга + поля со страницы деталей; помечается как обогащенная для текущей карточки"""
+    merged = {**row, "enriched_hash": row["card_hash"]}
+    description = (detail.get("description") or "").strip()
+    if len(description) > len(row.get("description") or ""):
+        merged["description"] = description
+    date_end, date_start = detail.get("date_end"), row.get("date_start")
+    if date_end is not None:
+        # Наивные и aware даты не сравниваются; сравниваем только однородные
+        comparable = date_start is not None and (date_end.tzinfo is None) == (date_start.tzinfo is None)
+        if not comparable or date_end >= date_start:
+            merged["date_end"] = date_end
+    return merged
+
+
+class EnrichmentQueue:
+    def __init__(self, concurrency: int, max_pending: int, batch_size: int) -> None:
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.event_repo = EventRepository()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._http: Optional[HttpClient] = None
+        # Отпечатки в очереди или в работе - одно событие не загружается дважды
+        self._pending: set[str] = set()
+        self._results: list[dict[str, Any]] = []
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._queued = metrics.counter("scraper.enrich.queued")
+        self._dropped = metrics.counter("scraper.enrich.dropped")
+        self._enriched = metrics.counter("scraper.enrich.enriched")
+        self._failed = metrics.counter("scraper.enrich.failed")
+        self._depth = metrics.gauge("scraper.enrich.pending")
+
+    def _ensure_started(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._flush_lock = asyncio.Lock()
+        # Без кеша валидаторов: детали загружаются только при изменении карточки
+        self._http = HttpClient(transport=scraper_transport, timeout=5.0, max_retries=2, retry_delay=1.0)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"enrich-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Enrichment queue started with {self.concurrency} worker(s)")
+
+    def submit(self, scraper: "BaseScraper", rows: list[dict[str, Any]]) -> int:
+        """Ставит нормализованные строки в очередь без ожидания; возвращает число принятых"""
+        self._ensure_started()
+        accepted = 0
+        for row in rows:
+            fingerprint = row["fingerprint"]
+            if not row.get("source_url") or fingerprint in self._pending:
+                continue
+            if len(self._pending) >= self.max_pending:
+                self._dropped.inc()
+                continue
+            self._pending.add(fingerprint)
+            self._queue.put_nowait((scraper, row))
+            accepted += 1
+        self._queued.inc(accepted)
+        self._depth.set(len(self._pending))
+        return accepted
+
+    async def _worker(self) -> None:
+        while True:
+            scraper, row = await self._queue.get()
+            try:
+                enriched = await self._enrich(scraper, row)
+                if enriched is not None:
+                    self._results.append(enriched)
+            except Exception as e:
+                self._failed.inc()
+                logger.warning(f"[{scraper.name}] Enrichment failed for {row['source_url']}: {e}")
+            finally:
+                self._pending.discard(row["fingerprint"])
+                self._depth.set(len(self._pending))
+                self._queue.task_done()
+            if len(self._results) >= self.batch_size or self._queue.empty():
+                await self._flush()
+
+    async def _enrich(self, scraper: "BaseScraper", row: dict[str, Any]) -> Optional[dict[str, Any]]:
+        html = await self._http.get(row["source_url"])
+        if not isinstance(html, str) or not html:
+            # Не помечаем как обогащенное - попробуем при следующем изменении листинга
+            self._failed.inc()
+            return None
+        detail = await parse_pool.parse_detail(scraper, html)
+        return merge_detail(row, detail)
+
+    async def _flush(self) -> None:
+        async with self._flush_lock:
+            batch, self._results = self._results, []
+            if not batch:
+                return
+            try:
+                async with AsyncSessionLocal() as db:
+                    events, inserted, updated, _ = await self.event_repo.upsert_scraped(
+                        db,
+                        batch,
+                        update_columns=ENRICHED_UPDATE_COLUMNS,
+                        compare_columns=ENRICHED_UPDATE_COLUMNS,
+                        same_card_only=True,
+                    )
+                    await db.commit()
+            except Exception as e:
+                self._failed.inc(len(batch))
+                logger.error(f"Failed to save {len(batch)} enriched event(s): {e}")
+                return
+            self._enriched.inc(len(batch))
+            logger.info(f"Enriched {len(batch)} event(s) from detail pages (changed={inserted + updated})")
+
+            cache_tags: set[str] = set()
+            for event in events:
+                cache_tags |= event_tags(event.id, event.city, event.type)
+            await event_cache.invalidate(cache_tags)
+
+    async def drain(self) -> None:
+        """Дожидается обработки всего, что уже в очереди (для разовых скриптов)"""
+        if self._queue is not None:
+            await self._queue.join()
+            await self._flush()
+
+    async def close(self) -> None:
+        if self._queue is None:
+            return
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await self._flush()
+        self._workers = []
+        self._queue = None
+        self._pending.clear()
+        logger.info("Enrichment queue stopped")
+
+
+enrichment_queue = EnrichmentQueue(
+    concurrency=settings.scraper.enrich_concurrency,
+    max_pending=settings.scraper.enrich_max_pending,
+    batch_size=settings.scraper.enrich_batch_size,
+)
@@ -0,0 +1,279 @@
+"""
+Декларативное извлечение карточек событий из HTML.
+
+Источник описывается спецификацией SourceSpec:
+- cards - селекторы карточек, пробуются по порядку, первый непустой выигрывает;
+- fields - типизированные поля (Text, Attr, Url, Exists) со своими
+  селекторами относительно карточки;
+- pagination - поле со ссылками на следующие страницы листинга
+  (пагинация, кнопки "load more"), селекторы относительно документа.
+
+Селекторы - XPath или CSS (префикс "css:", нужен пакет cssselect) -
+компилируются один раз при создании Extractor. Страница разбирается lxml
+один раз, поиск по классам и структуре выполняется внутри libxml2, без
+повторных обходов всего документа из Python на каждую карточку.
+"""
+import json
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional, Pattern, Union
+from urllib.parse import urljoin
+
+from lxml import etree
+from lxml import html as lxml_html
+
+_LOWER_CLASS = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+HEADINGS = ("h1", "h2", "h3", "h4")
+IMAGE_ATTRS = ("src", "data-src", "data-lazy-src", "data-original")
+URL_PATTERN = re.compile(r"https?://[^\s'\"\)]+")
+
+
+def class_contains(*words: str) -> str:
+    """XPath-условие: в @class есть любое из слов без учета регистра"""
+    return "(" + " or ".join(f"contains({_LOWER_CLASS}, '{word}')" for word in words) + ")"
+
+
+def has_class(name: str) -> str:
+    """XPath-условие: у элемента есть класс name (точное совпадение одного из классов)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def has_heading(*tags: str) -> str:
+    """XPath-условие: внутри элемента есть заголовок"""
+    return "(" + " or ".join(f".//{tag}" for tag in (tags or HEADINGS)) + ")"
+
+
+def slugify(text: str, limit: int = 50) -> str:
+    slug = re.sub(r"[^\w\s-]", "", text.lower())
+    return re.sub(r"[-\s]+", "-", slug)[:limit]
+
+
+def compile_selector(selector: str) -> etree.XPath:
+    if selector.startswith("css:"):
+        try:
+            from lxml.cssselect import CSSSelector
+        except ImportError as e:
+            raise RuntimeError(f"CSS selector {selector!r} requires the 'cssselect' package") from e
+        return CSSSelector(selector[4:], translator="html")
+    return etree.XPath(selector, smart_strings=False)
+
+
+class Field(ABC):
+    """
+    Поле карточки. Селекторы пробуются по порядку; значение - первый
+    результат, прошедший where. С many=True - все значения первого
+    селектора, давшего хоть одно.
+    """
+
+    def __init__(
+        self,
+        *selectors: str,
+        where: Optional[Callable[[Any], bool]] = None,
+        many: bool = False,
+        default: Any = None,
+    ) -> None:
+        if not selectors:
+            raise ValueError("Field needs at least one selector")
+        self.selectors = selectors
+        self.where = where
+        self.many = many
+        self.default = default
+
+    @abstractmethod
+    def convert(self, node: Any, base_url: str) -> Any:
+        """Результат XPath (элемент или строка) -> значение поля; None - пропустить"""
+
+
+class Text(Field):
+    """Текст элемента: куски текста без крайних пробелов, склеенные без разделителя"""
+
+    def __init__(self, *selectors: str, default: str = "", **kwargs: Any) -> None:
+        super().__init__(*selectors, default=default, **kwargs)
+
+    def convert(self, node: Any, base_url: str) -> Optional[str]:
+        if isinstance(node, str):
+            text = node.strip()
+        else:
+            text = "".join(part.strip() for part in node.itertext())
+        return text or None
+
+
+class Attr(Field):
+    """
+    Значение атрибута. Селектор может указывать на сам атрибут (.//a/@href)
+    или на элемент - тогда берется первый непустой из attrs.
+    pattern - вырезать из значения первое совпадение регулярки.
+    """
+
+    def __init__(
+        self,
+        *selectors: str,
+        attrs: tuple[str, ...] = ("href",),
+        pattern: Optional[Union[str, Pattern[str]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*selectors, **kwargs)
+        self.attrs = attrs
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+
+    def convert(self, node: Any, base_url: str) -> Optional[str]:
+        if isinstance(node, str):
+            raw = node
+        else:
+            raw = next((node.get(name) for name in self.attrs if node.get(name)), None)
+        if not raw:
+            return None
+        raw = raw.strip()
+        if self.pattern is not None:
+            match = self.pattern.search(raw)
+            return match.group(0) if match else None
+        return raw or None
+
+
+class Url(Attr):
+    """Как Attr, но относительные ссылки разрешаются от base_url источника"""
+
+    def convert(self, node: Any, base_url: str) -> Optional[str]:
+        raw = super().convert(node, base_url)
+        return urljoin(base_url, raw) if raw else None
+
+
+class Exists(Field):
+    """True, если хотя бы один селектор что-то нашел"""
+
+    def __init__(self, *selectors: str, **kwargs: Any) -> None:
+        super().__init__(*selectors, default=False, **kwargs)
+
+    def convert(self, node: Any, base_url: str) -> bool:
+        return True
+
+
+# Типичная разметка пагинации: rel=next, блок .pagination, кнопки "load more" с data-url
+PAGINATION = Url(
+    "//link[@rel='next'] | //a[@rel='next']",
+    f"//*[{class_contains('pagination', 'pager')}]//a",
+    f"//*[{class_contains('load-more', 'loadmore', 'show-more')}] | //*[@data-next-url]",
+    attrs=("href", "data-url", "data-href", "data-next-url"),
+    many=True,
+)
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    cards: tuple[str, ...]
+    fields: dict[str, Field]
+    pagination: Optional[Field] = None
+
+
+class ExtractedPage(NamedTuple):
+    records: list[dict[str, Any]]
+    cards_found: int
+    # Ссылки на следующие страницы листинга в порядке появления, без дедупликации
+    links: list[str]
+
+
+class Extractor:
+    """Скомпилированная SourceSpec: один разбор страницы, один проход по карточкам"""
+
+    def __init__(self, spec: SourceSpec, base_url: str) -> None:
+        self.base_url = base_url
+        self._cards = [compile_selector(selector) for selector in spec.cards]
+        self._fields = [
+            (name, field, [compile_selector(selector) for selector in field.selectors])
+            for name, field in spec.fields.items()
+        ]
+        self._pagination = (
+            (spec.pagination, [compile_selector(selector) for selector in spec.pagination.selectors])
+            if spec.pagination is not None
+            else None
+        )
+
+    def extract(self, html: str) -> ExtractedPage:
+        """Возвращает значения полей по каждой карточке, число карточек и ссылки пагинации"""
+        if not html or not html.strip():
+            return ExtractedPage([], 0, [])
+        try:
+            root = lxml_html.document_fromstring(html)
+        except ValueError:
+            # lxml не принимает str с XML-декларацией кодировки
+            root = lxml_html.document_fromstring(html.encode("utf-8"))
+
+        cards: list = []
+        for selector in self._cards:
+            cards = selector(root)
+            if cards:
+                break
+        links: list[str] = []
+        if self._pagination is not None:
+            links = self._value(root, *self._pagination) or []
+        return ExtractedPage([self.extract_card(card) for card in cards], len(cards), links)
+
+    def extract_card(self, card: Any) -> dict[str, Any]:
+        return {name: self._value(card, field, selectors) for name, field, selectors in self._fields}
+
+    def _value(self, card: Any, field: Field, selectors: list[etree.XPath]) -> Any:
+        values = []
+        for selector in selectors:
+            for node in selector(card):
+                value = field.convert(node, self.base_url)
+                if value is None or (field.where is not None and not field.where(value)):
+                    continue
+                if not field.many:
+                    return value
+                values.append(value)
+            if values:
+                return values
+        return values if field.many else field.default
+
+
+# Страница деталей события целиком - одна "карточка"
+DETAIL_SPEC = SourceSpec(
+    cards=("/html",),
+    fields={
+        "json_ld": Text("//script[@type='application/ld+json']", many=True),
+        "paragraphs": Text(
+            "//article//p",
+            "//main//p",
+            f"//*[{class_contains('description', 'content')}]//p",
+            many=True,
+        ),
+        "meta_description": Text(
+            "//meta[@property='og:description']/@content",
+            "//meta[@name='description']/@content",
+        ),
+        "end_date": Attr("//*[@itemprop='endDate']", attrs=("content", "datetime")),
+    },
+)
+
+
+def json_ld_event(blocks: list[str]) -> dict[str, Any]:
+    """Первый объект schema.org Event из блоков JSON-LD (в т.ч. внутри @graph и списков)"""
+    stack: list[Any] = []
+    for block in blocks:
+        try:
+            stack.append(json.loads(block))
+        except ValueError:
+            continue
+    while stack:
+        item = stack.pop(0)
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            types = item.get("@type")
+            types = types if isinstance(types, list) else [types]
+            if any(isinstance(t, str) and t.endswith("Event") for t in types):
+                return item
+            stack.extend(item.get("@graph") or [])
+    return {}
+
+
+def parse_iso_datetime(value: Any) -> Optional[datetime]:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
@@ -0,0 +1,70 @@
+"""
+Очередь страниц листинга для одного запуска скрапера.
+
+Первая страница (base_url) обрабатывается как раньше, ссылки пагинации с
+нее и со следующих страниц попадают во фронтир. Фронтир:
+- нормализует и дедуплицирует URL (фрагмент, порядок query-параметров,
+  псевдонимы первой страницы вида ?page=1 и /page/1);
+- пропускает ссылки на другие хосты и не-HTTP схемы;
+- ограничивает глубину (переходов от первой страницы) и общее число страниц.
+
+Страницы одного уровня отдаются в порядке листинга (в каком ссылки стояли
+на странице); скрапер качает их небольшими пачками и прекращает обход, как
+только дошел до уже известных событий. Лимит на хост и паузы между запросами
+обеспечивает общий транспорт (transport.py).
+"""
+import re
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Параметры номера страницы: ?page=1 - та же первая страница, что и без параметра
+PAGE_PARAMS = {"page", "p", "pg", "paged"}
+_FIRST_PAGE_PATH = re.compile(r"/page/1/?$")
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (key.lower() in PAGE_PARAMS and value == "1")
+    ))
+    path = _FIRST_PAGE_PATH.sub("", parts.path).rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+class CrawlFrontier:
+    def __init__(self, start_url: str, max_depth: int, max_pages: int) -> None:
+        self.host = urlsplit(start_url).netloc.lower()
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self._seen = {normalize_url(start_url)}
+        self._pending: list[tuple[str, int]] = []
+
+    def add(self, urls: Iterable[str], depth: int) -> int:
+        """Добавляет ссылки, найденные на странице глубины depth - 1; возвращает число новых"""
+        if depth > self.max_depth:
+            return 0
+        added = 0
+        for url in urls:
+            if len(self._seen) >= self.max_pages:
+                break
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or parts.netloc.lower() != self.host:
+                continue
+            normalized = normalize_url(url)
+            if normalized in self._seen:
+                continue
+            self._seen.add(normalized)
+            self._pending.append((url, depth))
+            added += 1
+        return added
+
+    def next_level(self) -> list[tuple[str, int]]:
+        """Забирает все ожидающие страницы (один уровень обхода) в порядке добавления"""
+        batch, self._pending = self._pending, []
+        return batch
+
+    @property
+    def pages_scheduled(self) -> int:
+        return len(self._seen)
@@ -2,218 +2,158 @@ import logging
 import re
 from datetime import datetime, timedelta
 from typing import Any, Optional
-from urllib.parse import urljoin
-
-from bs4 import BeautifulSoup
 
 from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.extraction import (
+    IMAGE_ATTRS,
+    PAGINATION,
+    URL_PATTERN,
+    Attr,
+    SourceSpec,
+    Text,
+    Url,
+    class_contains,
+    has_heading,
+    slugify,
+)
 
 logger = logging.getLogger(__name__)
 
+MONTHS = ["ноя", "дек", "янв", "фев", "мар", "апр", "май", "июн", "июл", "авг", "сен", "окт"]
+EVENT_KEYWORDS = [
+    "hackathon", "хакатон", "event", "событие", "workshop",
+    "воркшоп", "seminar", "семинар", "competition", "конкурс",
+    "tech", "тех", "innovation", "инновация",
+]
+LOCATION_WORDS = ["астана", "astana", "алматы", "almaty", "онлайн", "online", "офлайн", "offline"]
+NU_LOGO = "https://upload.wikimedia.org/wikipedia/en/thumb/4/4a/Nazarbayev_University_logo.svg/200px-Nazarbayev_University_logo.svg.png"
 
-class NUScraper(BaseScraper):
-    """Парсер событий с сайта Nazarbayev University"""
-
-    def __init__(self):
-        # Пробуем разные страницы NU для поиска событий
-        super().__init__("NU", "https://nu.edu.kz/en/news-events")
-
-    def parse(self, html: str) -> list[dict[str, Any]]:
-        """Парсит HTML страницу NU и извлекает события"""
-        soup = BeautifulSoup(html, "lxml")
-        events = []
 
-        try:
-            # Ищем карточки событий - пробуем разные селекторы
-            event_cards = soup.find_all("article", class_=lambda x: x and (
-                "event" in str(x).lower() or "card" in str(x).lower()
-            ))
-            
-            if not event_cards:
-                event_cards = soup.find_all("div", class_=lambda x: x and (
-                    "event" in str(x).lower() or "card" in str(x).lower() or "post" in str(x).lower()
-                ))
-            
-            if not event_cards:
-                # Ищем по структуре - элементы с заголовком и ссылкой
-                event_cards = soup.find_all(["div", "article", "li"], recursive=True)
-                event_cards = [
-                    card for card in event_cards
-                    if (card.find("h1") or card.find("h2") or card.find("h3") or card.find("h4"))
-                    and (card.find("a", href=True) or "nu.edu.kz" in str(card))
-                ]
+def _has_month(text: str) -> bool:
+    lowered = text.lower()
+    return any(m in lowered for m in MONTHS)
 
-            logger.info(f"[{self.name}] Found {len(event_cards)} potential event cards")
 
-            for i, card in enumerate(event_cards, 1):
-                try:
-                    event_data = self._parse_event_card(card)
-                    if event_data and event_data.get("title"):
-                        # Фильтруем только релевантные события
-                        title_lower = event_data.get("title", "").lower()
-                        if any(keyword in title_lower for keyword in [
-                            "hackathon", "хакатон", "event", "событие", "workshop", 
-                            "воркшоп", "seminar", "семинар", "competition", "конкурс",
-                            "tech", "тех", "innovation", "инновация"
-                        ]):
-                            logger.info(f"[{self.name}] ✅ Parsed event: {event_data.get('title')[:50]}")
-                            events.append(event_data)
-                        else:
-                            logger.debug(f"[{self.name}] Skipped non-event: {event_data.get('title')[:50]}")
-                    else:
-                        logger.warning(f"[{self.name}] ❌ Failed to parse event card {i}")
-                except Exception as e:
-                    logger.warning(f"[{self.name}] Error parsing event card {i}: {e}", exc_info=True)
-                    continue
+def _is_description(text: str) -> bool:
+    return (
+        30 < len(text) < 1000
+        and not _has_month(text)
+        and not re.match(r"^\d+:\d+", text)
+        and len(text.split()) > 5
+    )
 
-        except Exception as e:
-            logger.error(f"[{self.name}] Error parsing HTML: {e}")
 
-        return events
+def _is_date(text: str) -> bool:
+    # Ищем дату в разных форматах
+    return bool(
+        _has_month(text)
+        or re.match(r"\d{1,2}[./]\d{1,2}[./]\d{2,4}", text)
+        or re.match(r"\d{4}-\d{2}-\d{2}", text)
+    )
 
-    def _parse_event_card(self, card) -> Optional[dict[str, Any]]:
-        """Парсит отдельную карточку события"""
-        try:
-            # 1. Заголовок
-            title_elem = (
-                card.find("h1") or 
-                card.find("h2") or 
-                card.find("h3") or 
-                card.find("h4") or
-                card.find("a", class_=lambda x: x and "title" in str(x).lower())
-            )
-            
-            if not title_elem:
-                return None
-                
-            title = title_elem.get_text(strip=True)
-            if not title or len(title) < 5:
-                return None
 
-            # 2. Описание
-            description = ""
-            desc_candidates = card.find_all(["div", "p", "span"])
-            for desc in desc_candidates:
-                if desc.find(["h1", "h2", "h3", "h4"]):
-                    continue
-                text = desc.get_text(strip=True)
-                if (30 < len(text) < 1000 and 
-                    text != title and 
-                    not any(m in text.lower() for m in ["ноя", "дек", "янв", "фев", "мар", "апр", "май", "июн", "июл", "авг", "сен", "окт"]) and
-                    not re.match(r'^\d+:\d+', text) and
-                    len(text.split()) > 5):
-                    description = text
-                    break
+def _is_location(text: str) -> bool:
+    return (
+        3 < len(text) < 50
+        and not _has_month(text)
+        and ":" not in text
+        and not re.match(r"^\d+:\d+", text)
+        # Проверяем, похоже ли на локацию
+        and any(word in text.lower() for word in LOCATION_WORDS)
+    )
 
-            # 3. Дата
-            date_str = ""
-            all_spans = card.find_all(["span", "time", "div"])
-            for elem in all_spans:
-                text = elem.get_text(strip=True)
-                # Ищем дату в разных форматах
-                if (any(m in text.lower() for m in ["ноя", "дек", "янв", "фев", "мар", "апр", "май", "июн", "июл", "авг", "сен", "окт"]) or
-                    re.match(r'\d{1,2}[./]\d{1,2}[./]\d{2,4}', text) or
-                    re.match(r'\d{4}-\d{2}-\d{2}', text)):
-                    date_str = text
-                    break
-            
-            if date_str:
-                start_date = self._parse_date(date_str)
-            else:
-                # Если дата не найдена, ставим через неделю
-                start_date = datetime.now() + timedelta(days=7)
 
-            # 4. Локация
-            location = ""
-            for elem in all_spans:
-                text = elem.get_text(strip=True)
-                if (len(text) > 3 and len(text) < 50 and 
-                    not any(m in text.lower() for m in ["ноя", "дек", "янв", "фев", "мар", "апр", "май", "июн", "июл", "авг", "сен", "окт"]) and
-                    ":" not in text and
-                    text != date_str and
-                    not re.match(r'^\d+:\d+', text)):
-                    # Проверяем, похоже ли на локацию
-                    if any(word in text.lower() for word in ["астана", "astana", "алматы", "almaty", "онлайн", "online", "офлайн", "offline"]):
-                        location = text
-                        break
-            
-            if not location:
-                location = "Астана"  # NU находится в Астане
+def _is_image(src: str) -> bool:
+    return not src.endswith(".svg") and not src.endswith(".gif")
 
-            # 5. Ссылка
-            source_url = None
-            # Ищем ссылку в атрибутах карточки
-            for attr_name in card.attrs:
-                attr_value = str(card.get(attr_name, ""))
-                if "nu.edu.kz" in attr_value or "/event/" in attr_value or "/news/" in attr_value:
-                    url_match = re.search(r"https?://[^\s'\"\)]+", attr_value)
-                    if url_match:
-                        source_url = url_match.group(0)
-                        break
-            
-            # Ищем ссылку в тегах <a>
-            if not source_url:
-                all_links = card.find_all("a", href=True)
-                for link in all_links:
-                    href = link.get("href", "")
-                    if href and ("/event/" in href or "/news/" in href or "nu.edu.kz" in href):
-                        source_url = urljoin(self.base_url, href) if not href.startswith("http") else href
-                        break
-            
-            # Если ссылка не найдена, создаем на основе заголовка
-            if not source_url:
-                slug = re.sub(r'[^\w\s-]', '', title.lower())
-                slug = re.sub(r'[-\s]+', '-', slug)[:50]
-                source_url = f"{self.base_url}/event/{slug}"
 
-            # 6. Изображение
-            image_url = None
-            imgs = card.find_all("img")
-            for img in imgs:
-                img_src = img.get("src") or img.get("data-src") or img.get("data-lazy-src") or img.get("data-original")
-                if img_src and not img_src.endswith(".svg") and not img_src.endswith(".gif"):
-                    # Предпочитаем изображения, которые выглядят как баннеры событий
-                    if any(keyword in img_src.lower() for keyword in ["event", "news", "image", "photo", "banner"]):
-                        image_url = urljoin(self.base_url, img_src) if not img_src.startswith("http") else img_src
-                        break
-                    elif not image_url:  # Если не нашли специальное, берем первое подходящее
-                        image_url = urljoin(self.base_url, img_src) if not img_src.startswith("http") else img_src
-            
-            # Если не нашли изображение, используем логотип NU
-            if not image_url:
-                image_url = "https://upload.wikimedia.org/wikipedia/en/thumb/4/4a/Nazarbayev_University_logo.svg/200px-Nazarbayev_University_logo.svg.png"
+class NUScraper(BaseScraper):
+    """Парсер событий с сайта Nazarbayev University"""
 
-            # 7. Категория
-            category = "other"
-            title_lower = title.lower()
-            desc_lower = description.lower()
-            if "хакатон" in title_lower or "hackathon" in title_lower:
-                category = "hackathon"
-            elif "турнир" in title_lower or "tournament" in title_lower or "конкурс" in title_lower or "competition" in title_lower:
-                category = "tournament"
-            elif any(x in title_lower or x in desc_lower for x in ["семинар", "workshop", "воркшоп", "лекция", "lecture", "митап", "meetup"]):
-                category = "seminar"
+    # Страница университета меняется редко
+    schedule_interval_seconds = 60 * 60
+    schedule_jitter_seconds = 5 * 60
+
+    spec = SourceSpec(
+        cards=(
+            f"//article[{class_contains('event', 'card')}]",
+            f"//div[{class_contains('event', 'card', 'post')}]",
+            # Ищем по структуре - элементы с заголовком и ссылкой
+            "//*[self::div or self::article or self::li]"
+            f"[{has_heading()} and (.//a[@href] or .//@*[contains(., 'nu.edu.kz')])]",
+        ),
+        fields={
+            "title": Text(".//h1", ".//h2", ".//h3", ".//h4", f".//a[{class_contains('title')}]"),
+            "description": Text(
+                f".//*[self::div or self::p or self::span][not({has_heading()})]", where=_is_description
+            ),
+            "date": Text(".//*[self::span or self::time or self::div]", where=_is_date),
+            # NU находится в Астане
+            "location": Text(".//*[self::span or self::time or self::div]", where=_is_location, default="Астана"),
+            "card_url": Attr(
+                "./@*[contains(., 'nu.edu.kz') or contains(., '/event/') or contains(., '/news/')]",
+                pattern=URL_PATTERN,
+            ),
+            "link": Url(".//a/@href[contains(., '/event/') or contains(., '/news/') or contains(., 'nu.edu.kz')]"),
+            "images": Url(".//img", attrs=IMAGE_ATTRS, where=_is_image, many=True),
+        },
+        pagination=PAGINATION,
+    )
 
-            # 8. Онлайн/офлайн
-            is_online = "онлайн" in location.lower() or "online" in location.lower()
+    def __init__(self):
+        # Пробуем разные страницы NU для поиска событий
+        super().__init__("NU", "https://nu.edu.kz/en/news-events")
 
-            return {
-                "title": title,
-                "description": description,
-                "start_date": start_date,
-                "end_date": None,
-                "location": location,
-                "category": category,
-                "source_url": source_url,
-                "image_url": image_url,
-                "is_online": is_online,
-                "tags": ["NU", "Nazarbayev University"],
-            }
+    def build_event(self, record: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Собирает событие из полей карточки и отсеивает нерелевантные карточки"""
+        title = record["title"]
+        if not title or len(title) < 5:
+            return None
 
-        except Exception as e:
-            logger.warning(f"[{self.name}] Error parsing event card: {e}", exc_info=True)
+        # Фильтруем только релевантные события
+        title_lower = title.lower()
+        if not any(keyword in title_lower for keyword in EVENT_KEYWORDS):
+            logger.debug(f"[{self.name}] Skipped non-event: {title[:50]}")
             return None
 
+        description = record["description"] if record["description"] != title else ""
+        # Если дата не найдена, ставим через неделю
+        date_str = record["date"]
+        start_date = self._parse_date(date_str) if date_str else datetime.now() + timedelta(days=7)
+        location = record["location"]
+
+        source_url = record["card_url"] or record["link"] or f"{self.base_url}/event/{slugify(title)}"
+
+        # Предпочитаем изображения, которые выглядят как баннеры событий, иначе первое подходящее
+        images = record["images"]
+        image_url = next(
+            (src for src in images if any(k in src.lower() for k in ["event", "news", "image", "photo", "banner"])),
+            images[0] if images else NU_LOGO,
+        )
+
+        category = "other"
+        desc_lower = description.lower()
+        if "хакатон" in title_lower or "hackathon" in title_lower:
+            category = "hackathon"
+        elif "турнир" in title_lower or "tournament" in title_lower or "конкурс" in title_lower or "competition" in title_lower:
+            category = "tournament"
+        elif any(x in title_lower or x in desc_lower for x in ["семинар", "workshop", "воркшоп", "лекция", "lecture", "митап", "meetup"]):
+            category = "seminar"
+
+        logger.info(f"[{self.name}] ✅ Parsed event: {title[:50]}")
+        return {
+            "title": title,
+            "description": description,
+            "start_date": start_date,
+            "end_date": None,
+            "location": location,
+            "category": category,
+            "source_url": source_url,
+            "image_url": image_url,
+            "is_online": "онлайн" in location.lower() or "online" in location.lower(),
+            "tags": ["NU", "Nazarbayev University"],
+        }
+
     def _parse_date(self, date_str: str) -> datetime:
         """Парсит строку с датой в datetime объект"""
         if not date_str:
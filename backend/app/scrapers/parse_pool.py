@@ -0,0 +1,250 @@
+"""
+Парсинг HTML скраперов в пуле процессов.
+
+Разбор HTML в lxml и извлечение карточек держат GIL десятки миллисекунд, поэтому
+parse() выполняется не в event loop API, а в ProcessPoolExecutor. В процесс
+уходят только имя класса скрапера и HTML, обратно - список простых dict.
+
+Ограничения на один парс:
+- таймаут (SIGALRM внутри воркера + запасной wait_for снаружи); если воркер
+  завис в C-коде, процессы пула убиваются, а парсы других скраперов из этого
+  пула повторяются в новом;
+- лимит памяти процесса (RLIMIT_AS) - превышение дает MemoryError, а не OOM хоста;
+- максимальный размер HTML, который вообще отправляется в пул.
+"""
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import signal
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Callable, Iterator, NamedTuple, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+if TYPE_CHECKING:
+    from app.scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class ParseResult(NamedTuple):
+    events: list[dict[str, Any]]
+    # Сколько карточек-кандидатов нашел парсер (до фильтрации), если он это сообщает
+    cards_found: Optional[int]
+    # Ссылки пагинации листинга (см. SourceSpec.pagination)
+    links: list[str] = []
+
+
+class ParseTimeoutError(TimeoutError):
+    pass
+
+
+class ParseTooLargeError(ValueError):
+    pass
+
+
+# --- Код, выполняемый в процессе-воркере ---
+
+_worker_scrapers: dict[str, "BaseScraper"] = {}
+
+
+def _init_worker(memory_limit_bytes: int) -> None:
+    # Воркер не должен реагировать на Ctrl+C родителя - его завершает shutdown()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if memory_limit_bytes > 0:
+        try:
+            import resource
+
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"Parse worker: memory limit is not applied: {e}")
+
+
+def _on_alarm(signum, frame) -> None:
+    raise ParseTimeoutError("parse timed out")
+
+
+def _plain(value: Any) -> Any:
+    """Приводит значения к простым типам: NavigableString и т.п. тянут за собой все дерево"""
+    if value is None or isinstance(value, (bool, int, float, datetime, date)):
+        return value
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_plain(v) for v in value]
+    return str(value)
+
+
+def _worker_scraper(scraper_path: str) -> "BaseScraper":
+    scraper = _worker_scrapers.get(scraper_path)
+    if scraper is None:
+        module_name, class_name = scraper_path.split(":")
+        scraper = getattr(importlib.import_module(module_name), class_name)()
+        _worker_scrapers[scraper_path] = scraper
+    return scraper
+
+
+@contextmanager
+def _alarm(timeout: float) -> Iterator[None]:
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _parse_in_worker(scraper_path: str, html: str, timeout: float) -> ParseResult:
+    scraper = _worker_scraper(scraper_path)
+    scraper.last_cards_found = None
+    scraper.last_links = []
+    with _alarm(timeout):
+        events = [_plain(item) for item in scraper.parse(html)]
+        return ParseResult(events, scraper.last_cards_found, list(scraper.last_links))
+
+
+def _parse_detail_in_worker(scraper_path: str, html: str, timeout: float) -> dict[str, Any]:
+    scraper = _worker_scraper(scraper_path)
+    with _alarm(timeout):
+        return _plain(scraper.parse_detail(html))
+
+
+# --- Сторона event loop ---
+
+
+class ParsePool:
+    """Пул процессов для BaseScraper.parse() с таймаутом, лимитом памяти и метриками"""
+
+    def __init__(
+        self,
+        workers: int,
+        timeout_seconds: float,
+        memory_limit_mb: int,
+        max_html_mb: int,
+        max_tasks_per_child: int,
+    ) -> None:
+        self.workers = workers
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.max_html_bytes = max_html_mb * 1024 * 1024
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: ProcessPoolExecutor | None = None
+        self._latency = metrics.histogram("scraper.parse_ms")
+        self._timeouts = metrics.counter("scraper.parse_timeouts")
+        self._memory_errors = metrics.counter("scraper.parse_memory_errors")
+        self._restarts = metrics.counter("scraper.parse_pool_restarts")
+        self._resubmitted = metrics.counter("scraper.parse_resubmitted")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: форк процесса с запущенным event loop и потоками небезопасен
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_bytes,),
+                # Периодически пересоздаем воркеры, чтобы вернуть память после больших страниц
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Убивает процессы сломанного или зависшего пула; следующий вызов создаст новый.
+        Зависший в C-коде воркер сам не завершится и держит до memory_limit_mb памяти.
+        Парсы других скраперов, ждавшие в этом пуле, получат BrokenProcessPool и
+        будут повторены в новом пуле (см. _submit), а не отменены.
+        """
+        if executor is not self._executor:
+            # Уже пересоздан другим вызовом
+            return
+        self._restarts.inc()
+        self._executor = None
+        # Публичного способа убить воркеры у ProcessPoolExecutor нет
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.kill()
+            except Exception as e:
+                logger.warning(f"Failed to kill parse worker {process.pid}: {e}")
+        executor.shutdown(wait=False, cancel_futures=False)
+
+    async def parse(self, scraper: "BaseScraper", html: str) -> ParseResult:
+        """Страница листинга: scraper.parse() -> события, число карточек, ссылки пагинации"""
+        self._check_size(html)
+        if self.workers <= 0:
+            # Пул отключен (локальная отладка) - парсим в потоке, не блокируя loop
+            scraper.last_cards_found = None
+            scraper.last_links = []
+            with self._latency.time():
+                events = await asyncio.to_thread(scraper.parse, html)
+            return ParseResult(events, scraper.last_cards_found, list(scraper.last_links))
+        return await self._submit(scraper, _parse_in_worker, html)
+
+    async def parse_detail(self, scraper: "BaseScraper", html: str) -> dict[str, Any]:
+        """Страница деталей события: scraper.parse_detail() -> поля для обогащения"""
+        self._check_size(html)
+        if self.workers <= 0:
+            with self._latency.time():
+                return await asyncio.to_thread(scraper.parse_detail, html)
+        return await self._submit(scraper, _parse_detail_in_worker, html)
+
+    def _check_size(self, html: str) -> None:
+        if len(html) > self.max_html_bytes:
+            raise ParseTooLargeError(f"HTML is too large to parse: {len(html)} chars")
+
+    async def _submit(self, scraper: "BaseScraper", func: Callable[..., Any], html: str) -> Any:
+        scraper_path = f"{type(scraper).__module__}:{type(scraper).__qualname__}"
+        loop = asyncio.get_running_loop()
+        # Вторая попытка - только если пул пересоздали из-за чужого парса
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                with self._latency.time():
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(executor, func, scraper_path, html, self.timeout_seconds),
+                        # Запас на pickle и старт воркера; срабатывает, если SIGALRM не помог
+                        timeout=self.timeout_seconds + 10,
+                    )
+            except ParseTimeoutError:
+                self._timeouts.inc()
+                raise
+            except asyncio.TimeoutError:
+                self._timeouts.inc()
+                # Воркер завис в C-коде и не отреагировал на SIGALRM - убиваем пул
+                self._restart(executor)
+                raise ParseTimeoutError(f"[{scraper.name}] parse timed out")
+            except MemoryError:
+                self._memory_errors.inc()
+                raise
+            except BrokenProcessPool:
+                if executor is not self._executor and attempt == 0:
+                    self._resubmitted.inc()
+                    logger.info(f"[{scraper.name}] Parse pool was restarted, resubmitting")
+                    continue
+                # Воркер убит (например, OOM killer) - следующий вызов создаст новый пул
+                self._restart(executor)
+                raise
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+parse_pool = ParsePool(
+    workers=settings.scraper.parse_workers,
+    timeout_seconds=settings.scraper.parse_timeout_seconds,
+    memory_limit_mb=settings.scraper.parse_memory_limit_mb,
+    max_html_mb=settings.scraper.parse_max_html_mb,
+    max_tasks_per_child=settings.scraper.parse_max_tasks_per_child,
+)
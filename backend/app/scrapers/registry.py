@@ -0,0 +1,112 @@
+"""
+Реестр плагинов-скраперов и их расписаний.
+
+Источники:
+- settings.scraper.plugins - список "module:Class";
+- entry points группы "eventhub.scrapers" установленных пакетов
+  (значение - класс-наследник BaseScraper).
+
+Расписание источника берется из атрибутов класса (schedule_interval_seconds,
+schedule_jitter_seconds, run_timeout_seconds) и может быть переопределено
+через settings.scraper.schedules[<имя источника>].
+"""
+import importlib
+import logging
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Optional
+
+from app.core.config import get_settings
+from app.scrapers.base_scraper import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+ENTRY_POINT_GROUP = "eventhub.scrapers"
+
+
+@dataclass(frozen=True)
+class ScraperPlugin:
+    name: str
+    path: str
+    scraper_class: type[BaseScraper]
+    interval_seconds: float
+    jitter_seconds: float
+    timeout_seconds: float
+    enabled: bool = True
+
+    def create(self) -> BaseScraper:
+        return self.scraper_class()
+
+
+def _load_class(path: str) -> type[BaseScraper]:
+    module_name, class_name = path.split(":")
+    scraper_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(scraper_class, type) and issubclass(scraper_class, BaseScraper)):
+        raise TypeError(f"{path} is not a BaseScraper subclass")
+    return scraper_class
+
+
+class ScraperRegistry:
+    def __init__(self) -> None:
+        self._plugins: Optional[dict[str, ScraperPlugin]] = None
+
+    def _discover(self) -> list[str]:
+        paths = list(settings.scraper.plugins)
+        try:
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                if entry_point.value not in paths:
+                    paths.append(entry_point.value)
+        except Exception as e:
+            logger.warning(f"Could not read scraper entry points: {e}")
+        return paths
+
+    def _load(self) -> dict[str, ScraperPlugin]:
+        plugins: dict[str, ScraperPlugin] = {}
+        for path in self._discover():
+            try:
+                scraper_class = _load_class(path)
+                # Имя источника задается в __init__ скрапера
+                name = scraper_class().name
+            except Exception as e:
+                logger.error(f"Failed to load scraper plugin {path}: {e}")
+                continue
+            if name in plugins:
+                logger.warning(f"Duplicate scraper name {name!r} from {path}, keeping {plugins[name].path}")
+                continue
+            override = settings.scraper.schedules.get(name)
+            plugins[name] = ScraperPlugin(
+                name=name,
+                path=path,
+                scraper_class=scraper_class,
+                interval_seconds=(
+                    override and override.interval_seconds or scraper_class.schedule_interval_seconds
+                ),
+                jitter_seconds=(
+                    override.jitter_seconds
+                    if override and override.jitter_seconds is not None
+                    else scraper_class.schedule_jitter_seconds
+                ),
+                timeout_seconds=(
+                    override and override.timeout_seconds or scraper_class.run_timeout_seconds
+                ),
+                enabled=override.enabled if override else True,
+            )
+        unknown = set(settings.scraper.schedules) - set(plugins)
+        if unknown:
+            logger.warning(f"Schedules configured for unknown scrapers: {sorted(unknown)}")
+        return plugins
+
+    def plugins(self, enabled_only: bool = True) -> list[ScraperPlugin]:
+        if self._plugins is None:
+            self._plugins = self._load()
+        return [p for p in self._plugins.values() if p.enabled or not enabled_only]
+
+    def get(self, name: str) -> Optional[ScraperPlugin]:
+        if self._plugins is None:
+            self._plugins = self._load()
+        return self._plugins.get(name)
+
+
+scraper_registry = ScraperRegistry()
@@ -0,0 +1,75 @@
+"""
+Запись истории запусков скраперов в таблицу scraper_runs.
+
+ScrapeRun накапливает тайминги стадий (fetch / parse / db) и счетчики
+одного запуска одного источника; record() пишет строку в отдельной
+короткой сессии. Ошибка записи истории не влияет на сам скрейп.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from app.core.db import AsyncSessionLocal
+from app.models.scraper_run import ScraperRunStatus
+from app.repositories.scraper_run_repository import ScraperRunRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScrapeRun:
+    source: str
+    status: ScraperRunStatus = ScraperRunStatus.SUCCESS
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    duration_ms: int = 0
+    fetch_ms: Optional[int] = None
+    http_status: Optional[int] = None
+    bytes_received: Optional[int] = None
+    pages_fetched: int = 0
+    parse_ms: Optional[int] = None
+    cards_found: Optional[int] = None
+    events_parsed: Optional[int] = None
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    db_ms: Optional[int] = None
+    error_class: Optional[str] = None
+    error_message: Optional[str] = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Замер стадии: with run.stage("fetch"): ... -> fetch_ms; повторные замеры суммируются"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            key = f"{name}_ms"
+            setattr(self, key, (getattr(self, key) or 0) + int((time.perf_counter() - start) * 1000))
+
+    def fail(self, status: ScraperRunStatus, error: Optional[BaseException]) -> None:
+        self.status = status
+        if error is not None:
+            self.error_class = type(error).__name__
+            self.error_message = str(error)[:2000]
+
+    def finish(self) -> None:
+        self.duration_ms = int((time.perf_counter() - self._started) * 1000)
+
+    def as_row(self) -> dict:
+        row = asdict(self)
+        row.pop("_started")
+        row["status"] = self.status.value
+        return row
+
+
+async def record(run: ScrapeRun) -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            await ScraperRunRepository().create(db, run.as_row())
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"[{run.source}] Failed to record scraper run: {e}")
@@ -1,57 +1,115 @@
 import logging
+import random
+from datetime import datetime, timedelta
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
-from app.cron.scraper_job import scrape_events_job
+from app.core.config import get_settings
+from app.core.leader import SCHEDULER_LEADER, LeaderElection
+from app.cron.maintenance_job import purge_scraper_runs_job
+from app.cron.scraper_job import scrape_source_job
+from app.scrapers.enrichment import enrichment_queue
+from app.scrapers.parse_pool import parse_pool
+from app.scrapers.registry import scraper_registry
+from app.scrapers.transport import scraper_transport
 
 logger = logging.getLogger(__name__)
 
-scheduler = AsyncIOScheduler()
+settings = get_settings()
 
+scheduler = AsyncIOScheduler()
 
-async def start_scheduler():
-    """
-    Запускает планировщик задач для парсинга событий.
-    Парсинг запускается каждые 5 минут в фоновом режиме.
-    """
-    logger.info("Starting event scraper scheduler...")
 
-    # Запускаем парсинг сразу при старте приложения (в фоне, не блокируя)
-    logger.info("Scheduling initial scrape on startup...")
-    try:
-        # Запускаем сразу при старте (через 10 секунд, чтобы дать время БД подключиться)
-        from apscheduler.triggers.date import DateTrigger
-        from datetime import datetime, timedelta
-        
-        initial_trigger = DateTrigger(run_date=datetime.now() + timedelta(seconds=10))
+def _schedule_jobs() -> None:
+    for plugin in scraper_registry.plugins():
+        # Первый запуск - вскоре после избрания, с разбросом по источникам
+        first_run = datetime.now() + timedelta(seconds=10 + random.uniform(0, plugin.jitter_seconds))
         scheduler.add_job(
-            scrape_events_job,
-            trigger=initial_trigger,
-            id="initial_scrape",
-            name="Initial event scrape",
+            scrape_source_job,
+            trigger=IntervalTrigger(seconds=plugin.interval_seconds, jitter=plugin.jitter_seconds),
+            args=[plugin.name],
+            id=f"scrape:{plugin.name}",
+            name=f"Scrape {plugin.name}",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=int(plugin.interval_seconds),
+            next_run_time=first_run,
+        )
+        logger.info(
+            f"Scheduled {plugin.name}: every {plugin.interval_seconds:.0f}s "
+            f"(jitter {plugin.jitter_seconds:.0f}s, timeout {plugin.timeout_seconds:.0f}s)"
         )
-        logger.info("Initial scrape scheduled to run in 10 seconds")
-    except Exception as e:
-        logger.error(f"Error scheduling initial scrape: {e}", exc_info=True)
 
-    # Добавляем задачу на запуск всех скраперов каждые 5 минут
     scheduler.add_job(
-        scrape_events_job,
-        trigger=IntervalTrigger(minutes=5),
-        id="run_all_scrapers",
-        name="Run all event scrapers",
+        purge_scraper_runs_job,
+        trigger=IntervalTrigger(hours=24, jitter=60 * 60),
+        id="maintenance:purge-scraper-runs",
+        name="Purge old scraper runs",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
 
+
+def _describe() -> dict:
+    """Расписание лидера для GET /admin/scheduler (публикуется в Redis вместе с арендой)"""
+    return {
+        "jobs": [
+            {"id": job.id, "name": job.name, "next_run_time": job.next_run_time}
+            for job in scheduler.get_jobs()
+        ]
+    }
+
+
+async def _on_elected() -> None:
+    _schedule_jobs()
+
+
+async def _on_demoted() -> None:
+    # Уже идущие запуски доработают; новых этот процесс не начинает
+    scheduler.remove_all_jobs()
+    logger.info("Scrape jobs removed: this worker is no longer the scheduler leader")
+
+
+scheduler_leader = LeaderElection(
+    SCHEDULER_LEADER,
+    lease_seconds=settings.scheduler.leader_lease_seconds,
+    renew_seconds=settings.scheduler.leader_renew_seconds,
+    on_elected=_on_elected,
+    on_demoted=_on_demoted,
+    describe=_describe,
+)
+
+
+async def start_scheduler():
+    """
+    Запускает планировщик задач для парсинга событий.
+    Вызывается фоновым воркером (app.worker), не API. Задачи ставит только
+    лидер (scheduler_leader) - один процесс на все реплики воркера; остальные
+    держат пустой планировщик и подхватывают расписание, если лидер пропадет.
+    У каждого источника из реестра своя задача со своим интервалом и jitter;
+    max_instances=1 и coalesce - запуски одного источника не накладываются,
+    пропущенные во время долгого запуска схлопываются в один.
+    """
+    logger.info("Starting event scraper scheduler...")
+    # Один пул соединений на все запуски скраперов (ручные запуски из очереди - тоже)
+    await scraper_transport.start()
     scheduler.start()
-    logger.info("✅ Event scraper scheduler started. Scrapers will run every 5 minutes.")
+    if settings.scheduler.enabled:
+        scheduler_leader.start()
+    logger.info("✅ Event scraper scheduler started.")
 
 
 async def stop_scheduler():
     """Останавливает планировщик задач"""
     logger.info("Stopping event scraper scheduler...")
+    # Сразу отдаем аренду, чтобы другой воркер не ждал ее истечения
+    await scheduler_leader.stop()
     scheduler.shutdown(wait=True)
+    # Дописываем уже загруженные детали до остановки пула и транспорта
+    await enrichment_queue.close()
+    parse_pool.shutdown()
+    await scraper_transport.close()
     logger.info("Event scraper scheduler stopped.")
-
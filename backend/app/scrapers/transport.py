@@ -0,0 +1,155 @@
+"""
+Общий HTTP транспорт подсистемы скраперов.
+
+Один httpx.AsyncClient на процесс: keep-alive соединения, DNS и TLS-сессии
+переиспользуются между запусками скраперов, опционально HTTP/2. Поверх
+пула соединений - глобальный лимит одновременных запросов, лимит на хост и
+минимальный интервал между запросами к одному хосту.
+Создается в start_scheduler() и закрывается в stop_scheduler().
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class ScraperTransport:
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        http2: bool,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        global_concurrency: int,
+        per_host_concurrency: int,
+        per_host_delay: float = 0.0,
+    ) -> None:
+        self.timeout = timeout
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.global_concurrency = global_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        # Монотонное время, раньше которого следующий запрос к хосту не начнется
+        self._host_next_at: dict[str, float] = {}
+        self._in_flight = metrics.gauge("scraper.http.in_flight")
+        self._wait = metrics.histogram("scraper.http.slot_wait_ms")
+
+    def _http2_available(self) -> bool:
+        if not self.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested for scrapers, but 'h2' is not installed; using HTTP/1.1")
+            return False
+        return True
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        http2 = self._http2_available()
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            http2=http2,
+            limits=self.limits,
+            headers={"User-Agent": USER_AGENT},
+        )
+        self._global = asyncio.Semaphore(self.global_concurrency)
+        logger.info(
+            f"Scraper transport started (http2={http2}, "
+            f"max_connections={self.limits.max_connections})"
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("Scraper transport is not started")
+        return self._client
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Ожидает свободный слот (глобальный и для хоста url) на время одного запроса"""
+        if self._client is None:
+            # Запуск вне планировщика (например, ручной скрейп) - поднимаем транспорт лениво
+            await self.start()
+        host = urlsplit(url).hostname or ""
+        host_semaphore = self._hosts.get(host)
+        if host_semaphore is None:
+            host_semaphore = self._hosts[host] = asyncio.Semaphore(self.per_host_concurrency)
+        with self._wait.time():
+            await self._global.acquire()
+            try:
+                await host_semaphore.acquire()
+            except BaseException:
+                self._global.release()
+                raise
+            try:
+                await self._polite_delay(host)
+            except BaseException:
+                host_semaphore.release()
+                self._global.release()
+                raise
+        self._in_flight.inc()
+        try:
+            yield
+        finally:
+            self._in_flight.dec()
+            host_semaphore.release()
+            self._global.release()
+
+    async def _polite_delay(self, host: str) -> None:
+        if self.per_host_delay <= 0:
+            return
+        # Время старта резервируется до сна, чтобы параллельные запросы к хосту шли по очереди
+        now = time.monotonic()
+        start_at = max(now, self._host_next_at.get(host, 0.0))
+        self._host_next_at[host] = start_at + self.per_host_delay
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            self._hosts.clear()
+            self._host_next_at.clear()
+            await client.aclose()
+            logger.info("Scraper transport closed")
+
+
+scraper_transport = ScraperTransport(
+    timeout=settings.scraper.http_timeout_seconds,
+    http2=settings.scraper.http2,
+    max_connections=settings.scraper.http_max_connections,
+    max_keepalive_connections=settings.scraper.http_max_keepalive_connections,
+    keepalive_expiry=settings.scraper.http_keepalive_expiry_seconds,
+    global_concurrency=settings.scraper.http_global_concurrency,
+    per_host_concurrency=settings.scraper.http_per_host_concurrency,
+    per_host_delay=settings.scraper.http_per_host_delay_seconds,
+)
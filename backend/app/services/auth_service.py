@@ -3,20 +3,21 @@ from datetime import datetime
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import (
-    create_access_token,
-    create_refresh_token,
-    get_password_hash,
-    verify_password,
-)
+from app.core.hashing import PasswordHasher, password_hasher
+from app.core.security import create_access_token, create_refresh_token
 from app.models.user import User, UserRole
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth import UserCreate
 
 
 class AuthService:
-    def __init__(self, user_repo: UserRepository | None = None) -> None:
+    def __init__(
+        self,
+        user_repo: UserRepository | None = None,
+        hasher: PasswordHasher | None = None,
+    ) -> None:
         self.user_repo = user_repo or UserRepository()
+        self.hasher = hasher or password_hasher
 
     async def register_user(self, db: AsyncSession, user_in: UserCreate) -> User:
         existing = await self.user_repo.get_by_email(db, user_in.email)
@@ -25,7 +26,7 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email already exists",
             )
-        hashed_password = get_password_hash(user_in.password)
+        hashed_password = await self.hasher.hash(user_in.password)
         user = await self.user_repo.create(
             db,
             {
@@ -41,7 +42,7 @@ class AuthService:
         self, db: AsyncSession, email: str, password: str
     ) -> User:
         user = await self.user_repo.get_by_email(db, email)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await self.hasher.verify(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -0,0 +1,313 @@
+"""
+Доставка сообщений чатов в открытые WebSocket'ы на всех воркерах и репликах.
+
+Сокеты живут в памяти процесса, поэтому сообщение публикуется в Redis-канал
+chat:{chat_id}:messages, а каждый процесс подписан ровно на каналы тех
+чатов, для которых у него есть локальные сокеты (подписка - при первом
+сокете чата, отписка - после последнего). Одно PubSub-соединение на
+процесс; слушатель получает сообщения и рассылает их локальным сокетам.
+
+Свои же публикации процесс получает через подписку, так что путь доставки
+один и дублей нет. Если Redis недоступен, сообщение доставляется только
+локальным сокетам. Неудавшаяся подписка повторяется в фоне с растущей
+паузой; пока чат не подписан, его сообщения этим процессом доставляются
+локальным сокетам напрямую.
+
+Локальная рассылка не ждет клиентов: у каждого соединения своя ограниченная
+очередь исходящих кадров и задача-писатель. Сообщение сериализуется в JSON
+один раз (из pub/sub оно уже приходит строкой), в очереди лежит готовый
+текст. Медленный клиент с переполненной очередью отключается (или теряет
+самые старые кадры - settings.chat.slow_consumer_policy), остальные этого
+не замечают. Раз в heartbeat_interval_seconds клиентам уходит
+{"type": "ping"}; соединение без входящих кадров дольше idle_timeout_seconds
+закрывается (клиенту достаточно отвечать {"type": "pong"}).
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from fastapi import WebSocket, status
+from redis.asyncio.client import PubSub
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+PING = json.dumps({"type": "ping"})
+
+
+class ClientConnection:
+    """Один WebSocket и его очередь исходящих кадров"""
+
+    def __init__(self, chat_id: int, websocket: WebSocket, queue_size: int) -> None:
+        self.chat_id = chat_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.last_seen = time.monotonic()
+        self.writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def touch(self) -> None:
+        """Входящий кадр от клиента - соединение живо"""
+        self.last_seen = time.monotonic()
+
+
+class ConnectionManager:
+    prefix = "chat"
+
+    def __init__(
+        self,
+        queue_size: int,
+        send_timeout_seconds: float,
+        slow_consumer_policy: str,
+        heartbeat_interval_seconds: float,
+        idle_timeout_seconds: float,
+    ) -> None:
+        if slow_consumer_policy not in ("disconnect", "drop_oldest"):
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer_policy}")
+        self.queue_size = queue_size
+        self.send_timeout_seconds = send_timeout_seconds
+        self.slow_consumer_policy = slow_consumer_policy
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.active_connections: dict[int, list[ClientConnection]] = {}
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._resubscribe: Optional[asyncio.Task] = None
+        # Чаты, на каналы которых подписан PubSub этого процесса
+        self._subscribed: set[int] = set()
+        self._closing: set[asyncio.Task] = set()
+        # Подписки и отписки идут по одному соединению - не перемешиваем их
+        self._subscribe_lock: Optional[asyncio.Lock] = None
+        self._published = metrics.counter("chat.ws.published")
+        self._delivered = metrics.counter("chat.ws.delivered")
+        self._publish_failed = metrics.counter("chat.ws.publish_failed")
+        self._subscribe_failed = metrics.counter("chat.ws.subscribe_failed")
+        self._dropped = metrics.counter("chat.ws.dropped")
+        self._slow_disconnects = metrics.counter("chat.ws.slow_disconnects")
+        self._idle_evicted = metrics.counter("chat.ws.idle_evicted")
+        self._send_failed = metrics.counter("chat.ws.send_failed")
+        self._connections = metrics.gauge("chat.ws.connections")
+        # Кадров во всех очередях процесса
+        self._queue_depth = metrics.gauge("chat.ws.queue_depth")
+        self._send_ms = metrics.histogram("chat.ws.send_ms")
+
+    def _channel(self, chat_id: int) -> str:
+        return f"{self.prefix}:{chat_id}:messages"
+
+    def _chat_id(self, channel: str) -> Optional[int]:
+        try:
+            return int(channel.split(":")[1])
+        except (IndexError, ValueError):
+            return None
+
+    async def connect(self, chat_id: int, websocket: WebSocket) -> ClientConnection:
+        await websocket.accept()
+        conn = ClientConnection(chat_id, websocket, self.queue_size)
+        conn.writer = asyncio.create_task(self._write(conn), name=f"chat-ws-writer-{chat_id}")
+        connections = self.active_connections.setdefault(chat_id, [])
+        connections.append(conn)
+        self._connections.inc()
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop(), name="chat-ws-heartbeat")
+        if len(connections) == 1:
+            await self._subscribe(chat_id)
+        return conn
+
+    async def disconnect(self, conn: ClientConnection) -> None:
+        """Убирает соединение из рассылки; повторный вызов ничего не делает"""
+        connections = self.active_connections.get(conn.chat_id, [])
+        if conn not in connections:
+            return
+        connections.remove(conn)
+        conn.closed = True
+        self._connections.dec()
+        self._queue_depth.dec(conn.queue.qsize())
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+        if not connections:
+            self.active_connections.pop(conn.chat_id, None)
+            await self._unsubscribe(conn.chat_id)
+
+    async def publish(self, chat_id: int, message: dict[str, Any]) -> None:
+        """Отправляет сообщение всем сокетам чата на всех воркерах"""
+        text = json.dumps(message)
+        try:
+            await get_redis_client().publish(self._channel(chat_id), text)
+            self._published.inc()
+        except Exception as e:
+            self._publish_failed.inc()
+            logger.warning(f"Chat {chat_id}: publish failed, delivering locally only: {e}")
+            await self.broadcast(chat_id, text)
+            return
+        if chat_id in self.active_connections and chat_id not in self._subscribed:
+            # Подписка еще не восстановлена - через pub/sub локальные сокеты его не получат
+            await self.broadcast(chat_id, text)
+
+    async def broadcast(self, chat_id: int, text: str) -> None:
+        """Ставит готовый JSON-кадр в очереди локальных сокетов чата, не дожидаясь отправки"""
+        for conn in list(self.active_connections.get(chat_id, [])):
+            await self._offer(conn, text)
+
+    async def _offer(self, conn: ClientConnection, text: str) -> None:
+        if conn.closed:
+            return
+        if conn.queue.full():
+            if self.slow_consumer_policy == "disconnect":
+                self._slow_disconnects.inc()
+                logger.info(f"Chat {conn.chat_id}: disconnecting slow consumer ({conn.queue.qsize()} queued)")
+                await self._evict(conn, status.WS_1008_POLICY_VIOLATION, "Slow consumer")
+                return
+            conn.queue.get_nowait()
+            self._queue_depth.dec()
+            self._dropped.inc()
+        conn.queue.put_nowait(text)
+        self._queue_depth.inc()
+
+    async def _write(self, conn: ClientConnection) -> None:
+        while True:
+            text = await conn.queue.get()
+            if conn.closed:
+                # Очередь закрытого соединения уже списана в disconnect()
+                return
+            self._queue_depth.dec()
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(conn.websocket.send_text(text), timeout=self.send_timeout_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._send_failed.inc()
+                logger.info(f"Chat {conn.chat_id}: send failed, closing connection: {e!r}")
+                await self._evict(conn, status.WS_1011_INTERNAL_ERROR, "Send failed")
+                return
+            self._send_ms.observe((time.perf_counter() - started) * 1000)
+            if text is not PING:
+                self._delivered.inc()
+
+    async def _evict(self, conn: ClientConnection, code: int, reason: str) -> None:
+        """
+        Убирает соединение из рассылки и закрывает его со стороны сервера в фоне -
+        закрытие медленного клиента не должно задерживать рассылку остальным.
+        Обработчик сокета после закрытия получит disconnect.
+        """
+        await self.disconnect(conn)
+        task = asyncio.create_task(self._close(conn, code, reason))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, conn: ClientConnection, code: int, reason: str) -> None:
+        try:
+            await asyncio.wait_for(conn.websocket.close(code=code, reason=reason), timeout=self.send_timeout_seconds)
+        except Exception:
+            # Клиент уже ушел или не читает - соединение все равно брошено
+            pass
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval_seconds)
+            deadline = time.monotonic() - self.idle_timeout_seconds
+            for connections in list(self.active_connections.values()):
+                for conn in list(connections):
+                    if conn.last_seen < deadline:
+                        self._idle_evicted.inc()
+                        await self._evict(conn, status.WS_1001_GOING_AWAY, "Idle timeout")
+                    elif not conn.queue.full():
+                        conn.queue.put_nowait(PING)
+                        self._queue_depth.inc()
+
+    async def _subscribe(self, chat_id: int) -> None:
+        if self._subscribe_lock is None:
+            self._subscribe_lock = asyncio.Lock()
+        try:
+            async with self._subscribe_lock:
+                if self._pubsub is None:
+                    self._pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.subscribe(self._channel(chat_id))
+                self._subscribed.add(chat_id)
+            if self._listener is None:
+                self._listener = asyncio.create_task(self._listen(), name="chat-pubsub-listener")
+        except Exception as e:
+            self._subscribe_failed.inc()
+            logger.warning(f"Chat {chat_id}: subscribe failed, delivering locally until retry succeeds: {e}")
+            if self._resubscribe is None:
+                self._resubscribe = asyncio.create_task(self._resubscribe_loop(), name="chat-pubsub-resubscribe")
+
+    async def _resubscribe_loop(self) -> None:
+        """Повторяет подписку чатов с локальными сокетами, пока все не подписаны"""
+        delay = 1.0
+        try:
+            while missing := [chat_id for chat_id in self.active_connections if chat_id not in self._subscribed]:
+                await asyncio.sleep(delay)
+                for chat_id in missing:
+                    if chat_id in self.active_connections:
+                        await self._subscribe(chat_id)
+                delay = min(delay * 2, 30.0)
+        finally:
+            self._resubscribe = None
+
+    async def _unsubscribe(self, chat_id: int) -> None:
+        if self._pubsub is None or chat_id not in self._subscribed:
+            return
+        try:
+            async with self._subscribe_lock:
+                # Пока ждали блокировку, в чат мог зайти новый сокет
+                if chat_id not in self.active_connections:
+                    await self._pubsub.unsubscribe(self._channel(chat_id))
+                    self._subscribed.discard(chat_id)
+        except Exception as e:
+            logger.warning(f"Chat {chat_id}: unsubscribe failed: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py сам переподключается и восстанавливает подписки
+                logger.warning(f"Chat pub/sub listener error: {e}")
+                await asyncio.sleep(1)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            chat_id = self._chat_id(message["channel"])
+            if chat_id is None:
+                continue
+            # Кадр уже сериализован отправителем - рассылаем как есть
+            await self.broadcast(chat_id, message["data"])
+
+    async def close(self) -> None:
+        tasks = [task for task in (self._listener, self._heartbeat, self._resubscribe) if task is not None]
+        tasks.extend(self._closing)
+        for connections in self.active_connections.values():
+            tasks.extend(conn.writer for conn in connections if conn.writer is not None)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._listener = None
+        self._heartbeat = None
+        self._resubscribe = None
+        self._subscribed.clear()
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close chat pub/sub: {e}")
+            self._pubsub = None
+
+
+connection_manager = ConnectionManager(
+    queue_size=settings.chat.send_queue_size,
+    send_timeout_seconds=settings.chat.send_timeout_seconds,
+    slow_consumer_policy=settings.chat.slow_consumer_policy,
+    heartbeat_interval_seconds=settings.chat.heartbeat_interval_seconds,
+    idle_timeout_seconds=settings.chat.idle_timeout_seconds,
+)
@@ -0,0 +1,107 @@
+"""
+Кеш участников чатов для проверки членства.
+
+Проверка "отправитель - участник чата" нужна на каждое сообщение, в т.ч. на
+каждый кадр WebSocket. Множество user_id участников кешируется как и
+принципалы: локальный TTL-кеш воркера, затем Redis (chat:{id}:participants),
+и только при промахе - запрос в Postgres. Пустые множества не кешируются:
+чат без участников - это несуществующий чат или чат, который еще создается.
+
+Участники пишутся только при создании чата, изменения состава в API нет,
+поэтому кеш не сбрасывается. Появится добавление/удаление участников -
+после commit нужно удалять chat:{id}:participants (и ждать local_ttl_seconds
+на других воркерах).
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+from app.repositories.chat_repository import ChatParticipantRepository
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class ChatParticipantCache:
+    def __init__(
+        self,
+        ttl_seconds: int,
+        local_ttl_seconds: int,
+        local_max_size: int,
+        participant_repo: ChatParticipantRepository | None = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.local_max_size = local_max_size
+        self.participant_repo = participant_repo or ChatParticipantRepository()
+        self._local: OrderedDict[int, tuple[float, frozenset[int]]] = OrderedDict()
+        self._hits_local = metrics.counter("chat_participants_cache.hits_local")
+        self._hits_redis = metrics.counter("chat_participants_cache.hits_redis")
+        self._misses = metrics.counter("chat_participants_cache.misses")
+
+    def _redis_key(self, chat_id: int) -> str:
+        return f"chat:{chat_id}:participants"
+
+    def _get_local(self, chat_id: int) -> Optional[frozenset[int]]:
+        entry = self._local.get(chat_id)
+        if entry is None:
+            return None
+        expires_at, participants = entry
+        if expires_at < time.monotonic():
+            self._local.pop(chat_id, None)
+            return None
+        self._local.move_to_end(chat_id)
+        return participants
+
+    def _set_local(self, chat_id: int, participants: frozenset[int]) -> None:
+        self._local[chat_id] = (time.monotonic() + self.local_ttl_seconds, participants)
+        self._local.move_to_end(chat_id)
+        while len(self._local) > self.local_max_size:
+            self._local.popitem(last=False)
+
+    async def get(self, db: AsyncSession, chat_id: int) -> frozenset[int]:
+        participants = self._get_local(chat_id)
+        if participants is not None:
+            self._hits_local.inc()
+            return participants
+
+        try:
+            raw = await get_redis_client().get(self._redis_key(chat_id))
+        except Exception as e:
+            logger.warning(f"Chat participants cache: Redis unavailable: {e}")
+            raw = None
+        if raw:
+            participants = frozenset(json.loads(raw))
+            self._hits_redis.inc()
+            self._set_local(chat_id, participants)
+            return participants
+
+        self._misses.inc()
+        participants = frozenset(await self.participant_repo.list_user_ids(db, chat_id))
+        if participants:
+            self._set_local(chat_id, participants)
+            try:
+                await get_redis_client().set(
+                    self._redis_key(chat_id), json.dumps(sorted(participants)), ex=self.ttl_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Chat participants cache: Redis unavailable: {e}")
+        return participants
+
+    async def is_participant(self, db: AsyncSession, chat_id: int, user_id: int) -> bool:
+        return user_id in await self.get(db, chat_id)
+
+
+chat_participant_cache = ChatParticipantCache(
+    ttl_seconds=settings.cache.chat_participants_ttl_seconds,
+    local_ttl_seconds=settings.cache.chat_participants_local_ttl_seconds,
+    local_max_size=settings.cache.chat_participants_local_max_size,
+)
@@ -1,16 +1,17 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.chat import Chat, ChatParticipant, ChatType, Message
-from app.models.user import User
+from app.core.principals import Principal
+from app.models.chat import Chat, ChatType, Message
 from app.repositories.chat_repository import (
     ChatParticipantRepository,
     ChatRepository,
     MessageRepository,
 )
 from app.schemas.chat import MessageCreate
+from app.services.chat_participant_cache import chat_participant_cache
 
 
 class ChatService:
@@ -31,7 +32,7 @@ class ChatService:
         return chat
 
     async def get_or_create_personal_chat(
-        self, db: AsyncSession, current_user: User, other_user_id: int
+        self, db: AsyncSession, current_user: Principal, other_user_id: int
     ) -> Chat:
         chat = await self.chat_repo.get_personal_chat(
             db, current_user.id, other_user_id
@@ -46,17 +47,23 @@ class ChatService:
                 "event_id": None,
             },
         )
-        db.add(ChatParticipant(chat_id=chat.id, user_id=current_user.id))
-        db.add(ChatParticipant(chat_id=chat.id, user_id=other_user_id))
-        await db.flush()
-        await db.refresh(chat)
+        await self.participant_repo.bulk_create(
+            db,
+            [
+                {"chat_id": chat.id, "user_id": current_user.id},
+                {"chat_id": chat.id, "user_id": other_user_id},
+            ],
+        )
         return chat
 
     async def create_message(
-        self, db: AsyncSession, chat_id: int, sender: User, message_in: MessageCreate
+        self, db: AsyncSession, chat_id: int, sender: Principal, message_in: MessageCreate
     ) -> Message:
-        chat = await self.get_chat(db, chat_id)
-        if sender.id not in {p.user_id for p in chat.participants}:
+        # Членство - по кешу участников, без загрузки чата и chat.participants
+        participants = await chat_participant_cache.get(db, chat_id)
+        if sender.id not in participants:
+            if not participants:
+                await self.get_chat(db, chat_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User is not a participant of this chat",
@@ -64,7 +71,7 @@ class ChatService:
         message = await self.message_repo.create(
             db,
             {
-                "chat_id": chat.id,
+                "chat_id": chat_id,
                 "sender_id": sender.id,
                 "content": message_in.content,
             },
@@ -72,7 +79,14 @@ class ChatService:
         return message
 
     async def list_messages(
-        self, db: AsyncSession, chat_id: int, offset: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        chat_id: int,
+        offset: int = 0,
+        limit: int = 100,
+        after: Optional[tuple] = None,
     ) -> List[Message]:
-        return list(await self.message_repo.list_by_chat(db, chat_id, offset, limit))
+        return list(
+            await self.message_repo.list_by_chat(db, chat_id, offset, limit, after=after)
+        )
 
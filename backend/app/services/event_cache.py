@@ -0,0 +1,91 @@
+"""
+Кеш ответов GET /events/ и GET /events/{id}.
+
+Теги записей:
+- карточка события: event:{id}
+- выдача списка: events:city:{city|*} и events:type:{type|*} по фильтрам запроса
+
+Изменение события (city=c, type=t) сбрасывает event:{id}, events:city:{c},
+events:city:*, events:type:{t}, events:type:* - т.е. все выдачи, в которые
+событие может попасть (с запасом, но без устаревших ответов).
+"""
+from typing import Any, Iterable, List, Optional
+
+from pydantic import TypeAdapter
+
+from app.core.config import get_settings
+from app.core.response_cache import CachedResponse, ResponseCache
+from app.schemas.event import EventRead
+
+ANY = "*"
+
+_event_list_adapter = TypeAdapter(List[EventRead])
+
+
+def _value(value: Any) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def event_tags(event_id: Optional[int], city: Optional[str], type: Any) -> set[str]:
+    tags = {
+        f"events:city:{city or ANY}",
+        f"events:city:{ANY}",
+        f"events:type:{_value(type) or ANY}",
+        f"events:type:{ANY}",
+    }
+    if event_id is not None:
+        tags.add(f"event:{event_id}")
+    return tags
+
+
+class EventCache:
+    def __init__(self, ttl_seconds: Optional[int] = None) -> None:
+        ttl = ttl_seconds or get_settings().cache.events_ttl_seconds
+        self.lists = ResponseCache("events_list", ttl)
+        self.details = ResponseCache("events_detail", ttl)
+
+    @staticmethod
+    def serialize_list(events: List[EventRead]) -> bytes:
+        return _event_list_adapter.dump_json(events)
+
+    @staticmethod
+    def serialize_one(event: EventRead) -> bytes:
+        return event.model_dump_json().encode("utf-8")
+
+    def list_key(self, params: dict[str, Any]) -> str:
+        params = dict(params)
+        if params.get("tags"):
+            params["tags"] = sorted(set(params["tags"]))
+        if params.get("q"):
+            params["q"] = " ".join(params["q"].lower().split())
+        return self.lists.key(params)
+
+    @staticmethod
+    def list_tags(city: Optional[str], type: Optional[str]) -> set[str]:
+        return {f"events:city:{city or ANY}", f"events:type:{type or ANY}"}
+
+    def detail_key(self, event_id: int) -> str:
+        return self.details.key({"id": event_id})
+
+    async def get_list(self, key: str) -> Optional[CachedResponse]:
+        return await self.lists.get(key)
+
+    async def set_list(
+        self, key: str, body: bytes, cursor: Optional[str], tags: Iterable[str]
+    ) -> None:
+        await self.lists.set(key, CachedResponse(body=body, cursor=cursor), tags)
+
+    async def get_detail(self, event_id: int) -> Optional[CachedResponse]:
+        return await self.details.get(self.detail_key(event_id))
+
+    async def set_detail(self, event_id: int, body: bytes) -> None:
+        await self.details.set(
+            self.detail_key(event_id), CachedResponse(body=body), {f"event:{event_id}"}
+        )
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        # Теги общие для обоих неймспейсов (set-ы тегов лежат вне неймспейса)
+        await self.lists.invalidate_tags(tags)
+
+
+event_cache = EventCache()
@@ -4,13 +4,14 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principals import Principal
 from app.models.event import Event, EventRegistration, EventRegistrationStatus
-from app.models.user import User
 from app.repositories.event_repository import (
     EventRegistrationRepository,
     EventRepository,
 )
 from app.schemas.event import EventCreate, EventUpdate
+from app.services.event_cache import EventCache, event_cache, event_tags
 
 
 class EventService:
@@ -18,12 +19,25 @@ class EventService:
         self,
         event_repo: EventRepository | None = None,
         registration_repo: EventRegistrationRepository | None = None,
+        cache: EventCache | None = None,
     ) -> None:
         self.event_repo = event_repo or EventRepository()
         self.registration_repo = registration_repo or EventRegistrationRepository()
+        self.cache = cache or event_cache
+        # Теги кеша, затронутые изменениями; сбрасываются flush_cache() после commit
+        self._pending_tags: set[str] = set()
+
+    async def flush_cache(self) -> None:
+        """
+        Сбрасывает кеш по изменениям этой сессии. Вызывать после db.commit():
+        сброс до коммита позволяет параллельному GET закешировать старое состояние.
+        """
+        tags, self._pending_tags = self._pending_tags, set()
+        if tags:
+            await self.cache.invalidate(tags)
 
     async def create_event(
-        self, db: AsyncSession, organizer: User, event_in: EventCreate
+        self, db: AsyncSession, organizer: Principal, event_in: EventCreate
     ) -> Event:
         event = await self.event_repo.create(
             db,
@@ -32,10 +46,11 @@ class EventService:
                 "organizer_id": organizer.id,
             },
         )
+        self._pending_tags |= event_tags(event.id, event.city, event.type)
         return event
 
     async def update_event(
-        self, db: AsyncSession, organizer: User, event_id: int, event_in: EventUpdate
+        self, db: AsyncSession, organizer: Principal, event_id: int, event_in: EventUpdate
     ) -> Event:
         event = await self.event_repo.get(db, event_id)
         if not event:
@@ -43,7 +58,10 @@ class EventService:
         if event.organizer_id != organizer.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not event organizer")
         data = event_in.dict(exclude_unset=True)
+        # Сбрасываем выдачи и по старым, и по новым city/type
+        self._pending_tags |= event_tags(event.id, event.city, event.type)
         event = await self.event_repo.update(db, event, data)
+        self._pending_tags |= event_tags(event.id, event.city, event.type)
         return event
 
     async def get_event(self, db: AsyncSession, event_id: int) -> Event:
@@ -61,8 +79,11 @@ class EventService:
         type: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
+        tags: Optional[List[str]] = None,
+        q: Optional[str] = None,
         offset: int = 0,
         limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> List[Event]:
         """
         Безопасный поиск событий из БД.
@@ -76,8 +97,11 @@ class EventService:
                 type=type,
                 date_from=date_from,
                 date_to=date_to,
+                tags=tags,
+                q=q,
                 offset=offset,
                 limit=limit,
+                after=after,
             )
             return list(events) if events else []
         except Exception as e:
@@ -87,8 +111,13 @@ class EventService:
             logger.error(f"Error in search_events: {e}", exc_info=True)
             return []  # Всегда возвращаем список, даже при ошибке
 
+    async def list_organizer_events(
+        self, db: AsyncSession, organizer: Principal
+    ) -> List[Event]:
+        return list(await self.event_repo.list_by_organizer(db, organizer.id))
+
     async def register_for_event(
-        self, db: AsyncSession, user: User, event_id: int
+        self, db: AsyncSession, user: Principal, event_id: int
     ) -> EventRegistration:
         event = await self.get_event(db, event_id)
         existing = await self.registration_repo.get_by_event_and_user(
@@ -110,7 +139,7 @@ class EventService:
         return registration
 
     async def list_participants(
-        self, db: AsyncSession, organizer: User, event_id: int
+        self, db: AsyncSession, organizer: Principal, event_id: int
     ) -> List[EventRegistration]:
         event = await self.get_event(db, event_id)
         if event.organizer_id != organizer.id:
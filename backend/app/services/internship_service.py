@@ -5,6 +5,7 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principals import Principal
 from app.models.internship import (
     InternshipSlot,
     SlotApplication,
@@ -13,7 +14,6 @@ from app.models.internship import (
     ApplicationStatus,
     CompletionStatus,
 )
-from app.models.user import User
 from app.repositories.internship_repository import (
     InternshipSlotRepository,
     SlotApplicationRepository,
@@ -37,7 +37,7 @@ class InternshipService:
         self.completion_repo = SlotCompletionRepository()
 
     async def create_slot(
-        self, db: AsyncSession, company: User, slot_in: InternshipSlotCreate
+        self, db: AsyncSession, company: Principal, slot_in: InternshipSlotCreate
     ) -> InternshipSlot:
         """Создание слота стажировки"""
         slot_data = {
@@ -52,7 +52,7 @@ class InternshipService:
     async def update_slot(
         self,
         db: AsyncSession,
-        company: User,
+        company: Principal,
         slot_id: int,
         slot_in: InternshipSlotUpdate,
     ) -> InternshipSlot:
@@ -73,7 +73,7 @@ class InternshipService:
         return slot
 
     async def publish_slot(
-        self, db: AsyncSession, company: User, slot_id: int
+        self, db: AsyncSession, company: Principal, slot_id: int
     ) -> InternshipSlot:
         """Публикация слота"""
         slot = await self.slot_repo.get(db, slot_id)
@@ -86,13 +86,13 @@ class InternshipService:
                 status_code=status.HTTP_403_FORBIDDEN, detail="Not slot owner"
             )
 
-        slot.status = SlotStatus.PUBLISHED.value
-        await db.flush()
-        await db.refresh(slot)
+        slot = await self.slot_repo.update(
+            db, slot, {"status": SlotStatus.PUBLISHED.value}
+        )
         return slot
 
     async def apply_for_slot(
-        self, db: AsyncSession, student: User, application_in: SlotApplicationCreate
+        self, db: AsyncSession, student: Principal, application_in: SlotApplicationCreate
     ) -> SlotApplication:
         """Подача заявки на слот"""
         slot = await self.slot_repo.get(db, application_in.slot_id)
@@ -140,7 +140,7 @@ class InternshipService:
         return application
 
     async def approve_application(
-        self, db: AsyncSession, company: User, application_id: int
+        self, db: AsyncSession, company: Principal, application_id: int
     ) -> SlotApplication:
         """Одобрение заявки компанией"""
         application = await self.application_repo.get(db, application_id)
@@ -156,15 +156,15 @@ class InternshipService:
                 status_code=status.HTTP_403_FORBIDDEN, detail="Not slot owner"
             )
 
-        application.status = ApplicationStatus.APPROVED.value
-        await db.flush()
-        await db.refresh(application)
+        application = await self.application_repo.update(
+            db, application, {"status": ApplicationStatus.APPROVED.value}
+        )
         return application
 
     async def complete_slot(
         self,
         db: AsyncSession,
-        student: User,
+        student: Principal,
         completion_in: SlotCompletionCreate,
     ) -> SlotCompletion:
         """Завершение слота студентом"""
@@ -203,7 +203,7 @@ class InternshipService:
     async def confirm_completion(
         self,
         db: AsyncSession,
-        master: User,
+        master: Principal,
         completion_id: int,
         completion_in: SlotCompletionUpdate,
     ) -> SlotCompletion:
@@ -25,10 +25,7 @@ class ProfileService:
         profile = result.scalar_one_or_none()
         if profile:
             return profile
-        profile = Profile(user_id=user_id)
-        db.add(profile)
-        await db.flush()
-        await db.refresh(profile)
+        profile = await self.repo.create(db, {"user_id": user_id})
         return profile
 
     async def get_profile(self, db: AsyncSession, user_id: int) -> Profile:
@@ -123,6 +120,7 @@ class ProfileService:
         skills: Optional[List[str]] = None,
         offset: int = 0,
         limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> List[Profile]:
         return list(
             await self.repo.search(
@@ -133,6 +131,7 @@ class ProfileService:
                 skill_names=skills,
                 offset=offset,
                 limit=limit,
+                after=after,
             )
         )
 
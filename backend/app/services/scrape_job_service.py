@@ -0,0 +1,216 @@
+"""
+Ручные запуски парсинга всех источников (POST /admin/run-scraper, /events/scrape-now).
+
+Запрос не ждет парсинга: запись задачи сохраняется в Redis (scraper:job:{id}),
+в job_queue ставится "scrape_all", клиенту сразу возвращается id; статус -
+GET по id. Выполняет задачу фоновый воркер (app.worker ->
+app.cron.scraper_job.manual_scrape_job), API скраперы не импортирует.
+
+Single-flight: ключ scraper:job:current указывает на текущую задачу, пока она
+идет, и еще coalesce_seconds после завершения. Повторные запросы в это время
+присоединяются к ней (attached += 1) вместо нового полного обхода. Ключ
+ставится через SET NX, так что одновременные запросы с разных воркеров
+запускают ровно одну задачу.
+"""
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.core.job_queue import job_queue
+from app.core.metrics import metrics
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class ScrapeJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class ScrapeJob:
+    id: str
+    status: ScrapeJobStatus = ScrapeJobStatus.QUEUED
+    requested_by: str = ""
+    requested_at: float = 0
+    started_at: float = 0
+    finished_at: float = 0
+    results: dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Сколько запросов присоединилось к задаче вместо запуска новой
+    attached: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.results.values())
+
+    @classmethod
+    def from_redis(cls, job_id: str, data: dict) -> "ScrapeJob":
+        return cls(
+            id=job_id,
+            status=ScrapeJobStatus(data.get("status", ScrapeJobStatus.QUEUED.value)),
+            requested_by=data.get("requested_by", ""),
+            requested_at=float(data.get("requested_at", 0)),
+            started_at=float(data.get("started_at", 0)),
+            finished_at=float(data.get("finished_at", 0)),
+            results=json.loads(data.get("results") or "{}"),
+            error=data.get("error") or None,
+            attached=int(data.get("attached", 0)),
+        )
+
+    def to_redis(self) -> dict:
+        # attached не пишется целиком - его увеличивают через HINCRBY другие запросы
+        return {
+            "status": self.status.value,
+            "requested_by": self.requested_by,
+            "requested_at": self.requested_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "results": json.dumps(self.results),
+            "error": self.error or "",
+        }
+
+
+class ScrapeJobService:
+    prefix = "scraper:job"
+
+    def __init__(self, coalesce_seconds: float, lock_seconds: int, ttl_seconds: int) -> None:
+        self.coalesce_seconds = coalesce_seconds
+        self.lock_seconds = lock_seconds
+        self.ttl_seconds = ttl_seconds
+        self._started = metrics.counter("scraper.jobs.started")
+        self._coalesced = metrics.counter("scraper.jobs.coalesced")
+        self._failed = metrics.counter("scraper.jobs.failed")
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    @property
+    def _current_key(self) -> str:
+        return f"{self.prefix}:current"
+
+    async def _load(self, job_id: str) -> Optional[ScrapeJob]:
+        data = await get_redis_client().hgetall(self._key(job_id))
+        return ScrapeJob.from_redis(job_id, data) if data else None
+
+    async def _save(self, job: ScrapeJob) -> None:
+        client = get_redis_client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hset(self._key(job.id), mapping=job.to_redis())
+            pipe.expire(self._key(job.id), self.ttl_seconds)
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> ScrapeJob:
+        try:
+            job = await self._load(job_id)
+        except Exception as e:
+            logger.error(f"Failed to read scrape job {job_id}: {e}")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Job store unavailable")
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scrape job not found")
+        return job
+
+    async def trigger(self, requested_by: str) -> tuple[ScrapeJob, bool]:
+        """
+        Запускает парсинг всех источников или присоединяется к текущему запуску.
+        Возвращает (задача, присоединились ли к существующей).
+        """
+        try:
+            return await self._trigger(requested_by)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to trigger scrape job: {e}")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Job store unavailable")
+
+    async def _trigger(self, requested_by: str) -> tuple[ScrapeJob, bool]:
+        client = get_redis_client()
+        # Несколько попыток: текущий ключ может истечь между чтением и SET NX
+        for _ in range(3):
+            current_id = await client.get(self._current_key)
+            if current_id:
+                job = await self._load(current_id)
+                if job is not None:
+                    job.attached = await client.hincrby(self._key(job.id), "attached", 1)
+                    self._coalesced.inc()
+                    return job, True
+
+            job = ScrapeJob(id=uuid.uuid4().hex, requested_by=requested_by, requested_at=time.time())
+            # Запись задачи - до ключа current, чтобы присоединившийся всегда ее находил
+            await self._save(job)
+            # Пока задача в очереди или идет, current держится до lock_seconds: если
+            # воркер потеряет задачу, single-flight отпустит по TTL
+            if await client.set(self._current_key, job.id, nx=True, ex=self.lock_seconds):
+                try:
+                    await job_queue.enqueue("scrape_all", job_id=job.id)
+                except Exception:
+                    await client.delete(self._current_key, self._key(job.id))
+                    raise
+                self._started.inc()
+                logger.info(f"Scrape job {job.id} queued by {job.requested_by}")
+                return job, False
+            await client.delete(self._key(job.id))
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Scrape job is being started, retry")
+
+    async def mark_running(self, job_id: str) -> Optional[ScrapeJob]:
+        """Вызывается воркером перед запуском; None - запись задачи уже истекла"""
+        job = await self._load(job_id)
+        if job is None:
+            return None
+        job.status = ScrapeJobStatus.RUNNING
+        job.started_at = time.time()
+        await self._save(job)
+        return job
+
+    async def finish(
+        self,
+        job: ScrapeJob,
+        results: Optional[dict[str, int]] = None,
+        error: Optional[str] = None,
+        cancelled: bool = False,
+    ) -> None:
+        job.results = results or {}
+        job.error = error[:500] if error else None
+        job.status = ScrapeJobStatus.FAILED if error else ScrapeJobStatus.SUCCEEDED
+        job.finished_at = time.time()
+        if error:
+            self._failed.inc()
+        logger.info(
+            f"Scrape job {job.id} {job.status.value} in "
+            f"{job.finished_at - job.started_at:.1f}s: {job.results}"
+        )
+        # Отмененная задача не должна держать current - после рестарта запускаем заново
+        await self._finish(job, keep_current=not cancelled)
+
+    async def _finish(self, job: ScrapeJob, keep_current: bool) -> None:
+        try:
+            await self._save(job)
+            client = get_redis_client()
+            if await client.get(self._current_key) != job.id:
+                return
+            # Завершенная задача еще coalesce_seconds отвечает на повторные запросы
+            if keep_current and self.coalesce_seconds > 0:
+                await client.expire(self._current_key, int(self.coalesce_seconds))
+            else:
+                await client.delete(self._current_key)
+        except Exception as e:
+            logger.warning(f"Failed to store result of scrape job {job.id}: {e}")
+
+
+scrape_job_service = ScrapeJobService(
+    coalesce_seconds=settings.scraper.trigger_coalesce_seconds,
+    lock_seconds=settings.scraper.trigger_lock_seconds,
+    ttl_seconds=settings.scraper.trigger_job_ttl_seconds,
+)
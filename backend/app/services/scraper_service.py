@@ -1,23 +1,119 @@
 """
 Сервис для запуска всех скраперов параллельно
+
+Запуск источника по расписанию (run_source) и ручной запуск всех источников
+(run_all_scrapers) берут одну и ту же блокировку источника в Redis
+(scraper:run:{name}), поэтому один источник не парсится дважды одновременно:
+источник, который уже идет, пропускается. Блокировка живет таймаут запуска
+плюс запас и снимается только владельцем.
 """
 import logging
 import asyncio
-from typing import Dict, List
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
 
-from app.scrapers.astana_hub_scraper import AstanaHubScraper
-from app.scrapers.aitu_scraper import AITUScraper
-from app.scrapers.nfactorial_scraper import NFactorialScraper
-from app.scrapers.techorda_scraper import TechOrdaScraper
-from app.scrapers.nu_scraper import NUScraper
+from app.core.redis import get_redis_client
+from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.registry import scraper_registry
 
 logger = logging.getLogger(__name__)
 
+RUN_LOCK_PREFIX = "scraper:run"
+# Запас TTL блокировки сверх таймаута запуска (закрытие клиента, запись scraper_runs)
+RUN_LOCK_MARGIN_SECONDS = 60
+
+_RELEASE = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def build_scrapers() -> List[BaseScraper]:
+    """Экземпляры всех включенных источников из реестра (для запуска, бенчмарков и записи фикстур)"""
+    return [plugin.create() for plugin in scraper_registry.plugins()]
+
+
+async def run_scraper(scraper: BaseScraper, timeout: Optional[float] = None) -> int:
+    """
+    Безопасно запускает один скрапер с таймаутом и обработкой всех ошибок.
+    Возвращает количество событий или 0 в случае ошибки.
+    """
+    scraper_name = scraper.name
+    try:
+        logger.info(f"[{scraper_name}] Starting scraper...")
+        count = await asyncio.wait_for(scraper.scrape(), timeout=timeout)
+        logger.info(f"[{scraper_name}] ✅ Completed: {count} events processed")
+        return count
+    except asyncio.TimeoutError:
+        logger.error(f"[{scraper_name}] ❌ Timed out after {timeout:.0f}s")
+        return 0
+    except Exception as e:
+        logger.error(
+            f"[{scraper_name}] ❌ Failed: {e}",
+            exc_info=True
+        )
+        return 0
+    finally:
+        try:
+            await scraper.close()
+        except Exception as e:
+            logger.warning(f"[{scraper_name}] Error closing client: {e}")
+
+
+@asynccontextmanager
+async def source_run_lock(name: str, timeout: Optional[float]) -> AsyncIterator[bool]:
+    """
+    Блокировка запуска источника; отдает False, если источник уже парсится.
+    Без Redis запуск идет без блокировки (как и остальная координация воркеров).
+    """
+    key = f"{RUN_LOCK_PREFIX}:{name}"
+    token = uuid.uuid4().hex
+    ttl = int((timeout or 0) + RUN_LOCK_MARGIN_SECONDS)
+    try:
+        acquired = bool(await get_redis_client().set(key, token, nx=True, ex=ttl))
+    except Exception as e:
+        logger.warning(f"[{name}] Run lock unavailable, running without it: {e}")
+        yield True
+        return
+    if not acquired:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            await get_redis_client().eval(_RELEASE, 1, key, token)
+        except Exception as e:
+            logger.warning(f"[{name}] Failed to release run lock: {e}")
+
+
+async def _run_plugin(plugin) -> Optional[int]:
+    """Запускает источник под блокировкой; None - источник уже парсится другим запуском"""
+    async with source_run_lock(plugin.name, plugin.timeout_seconds) as acquired:
+        if not acquired:
+            logger.info(f"[{plugin.name}] Already running, skipped")
+            return None
+        return await run_scraper(plugin.create(), plugin.timeout_seconds)
+
+
+async def run_source(name: str) -> Optional[int]:
+    """Запускает один источник по имени из реестра; None - источник не найден или уже идет"""
+    plugin = scraper_registry.get(name)
+    if plugin is None:
+        logger.warning(f"Unknown scraper source: {name}")
+        return None
+    return await _run_plugin(plugin)
+
 
 async def run_all_scrapers() -> Dict[str, int]:
     """
     Запускает все скраперы параллельно и возвращает статистику.
     Если скрапер падает - возвращает 0, не ломая весь процесс.
+    Источники, которые уже парсятся (например, по расписанию), пропускаются
+    и в результат не попадают.
     
     Returns:
         Dict[str, int]: Словарь с результатами {scraper_name: events_count}
@@ -26,39 +122,13 @@ async def run_all_scrapers() -> Dict[str, int]:
     logger.info("Starting all scrapers in parallel...")
     logger.info("=" * 60)
 
-    scrapers = [
-        AstanaHubScraper(),
-        NUScraper(),
-        AITUScraper(),
-        NFactorialScraper(),
-        TechOrdaScraper(),
-    ]
-
-    async def run_scraper_safe(scraper) -> tuple[str, int]:
-        """
-        Безопасно запускает скрапер с обработкой всех ошибок.
-        Возвращает (name, count) или (name, 0) в случае ошибки.
-        """
-        scraper_name = scraper.name
-        try:
-            logger.info(f"[{scraper_name}] Starting scraper...")
-            count = await scraper.scrape()
-            logger.info(f"[{scraper_name}] ✅ Completed: {count} events processed")
-            return scraper_name, count
-        except Exception as e:
-            logger.error(
-                f"[{scraper_name}] ❌ Failed: {e}",
-                exc_info=True
-            )
-            return scraper_name, 0
-        finally:
-            try:
-                await scraper.close()
-            except Exception as e:
-                logger.warning(f"[{scraper_name}] Error closing client: {e}")
+    plugins = scraper_registry.plugins()
+
+    async def run_plugin(plugin) -> tuple[str, Optional[int]]:
+        return plugin.name, await _run_plugin(plugin)
 
     # Запускаем все скраперы параллельно
-    tasks = [run_scraper_safe(scraper) for scraper in scrapers]
+    tasks = [run_plugin(plugin) for plugin in plugins]
     results_list = await asyncio.gather(*tasks, return_exceptions=True)
     
     # Обрабатываем результаты
@@ -69,7 +139,8 @@ async def run_all_scrapers() -> Dict[str, int]:
             continue
         if isinstance(result, tuple) and len(result) == 2:
             name, count = result
-            results[name] = count
+            if count is not None:
+                results[name] = count
         else:
             logger.warning(f"Unexpected result format: {result}")
 
@@ -78,7 +149,7 @@ async def run_all_scrapers() -> Dict[str, int]:
     
     logger.info("=" * 60)
     logger.info(f"All scrapers completed.")
-    logger.info(f"Successful: {successful}/{len(scrapers)}")
+    logger.info(f"Successful: {successful}/{len(plugins)}")
     logger.info(f"Total events processed: {total}")
     logger.info(f"Results: {results}")
     logger.info("=" * 60)
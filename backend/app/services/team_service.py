@@ -3,8 +3,8 @@ from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.principals import Principal
 from app.models.team import Team, TeamMember, TeamOpenPosition
-from app.models.user import User
 from app.repositories.team_repository import (
     TeamMemberRepository,
     TeamOpenPositionRepository,
@@ -30,7 +30,7 @@ class TeamService:
         self.position_repo = position_repo or TeamOpenPositionRepository()
 
     async def create_team(
-        self, db: AsyncSession, owner: User, team_in: TeamCreate
+        self, db: AsyncSession, owner: Principal, team_in: TeamCreate
     ) -> Team:
         team = await self.team_repo.create(
             db,
@@ -39,10 +39,14 @@ class TeamService:
                 "owner_id": owner.id,
             },
         )
-        member = TeamMember(team_id=team.id, user_id=owner.id, role_name="owner")
-        db.add(member)
-        await db.flush()
-        await db.refresh(team)
+        await self.member_repo.create(
+            db,
+            {
+                "team_id": team.id,
+                "user_id": owner.id,
+                "role_name": "owner",
+            },
+        )
         return team
 
     async def get_team(self, db: AsyncSession, team_id: int) -> Team:
@@ -52,7 +56,7 @@ class TeamService:
         return team
 
     async def update_team(
-        self, db: AsyncSession, current_user: User, team_id: int, team_in: TeamUpdate
+        self, db: AsyncSession, current_user: Principal, team_id: int, team_in: TeamUpdate
     ) -> Team:
         team = await self.get_team(db, team_id)
         if team.owner_id != current_user.id:
@@ -62,12 +66,20 @@ class TeamService:
         return team
 
     async def search_teams(
-        self, db: AsyncSession, *, name: Optional[str] = None, offset: int = 0, limit: int = 50
+        self,
+        db: AsyncSession,
+        *,
+        name: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+        after: Optional[tuple] = None,
     ) -> List[Team]:
-        return list(await self.team_repo.search(db, name=name, offset=offset, limit=limit))
+        return list(
+            await self.team_repo.search(db, name=name, offset=offset, limit=limit, after=after)
+        )
 
     async def add_member(
-        self, db: AsyncSession, owner: User, team_id: int, user_id: int, role_name: str
+        self, db: AsyncSession, owner: Principal, team_id: int, user_id: int, role_name: str
     ) -> TeamMember:
         team = await self.get_team(db, team_id)
         if team.owner_id != owner.id:
@@ -91,7 +103,7 @@ class TeamService:
     async def create_open_position(
         self,
         db: AsyncSession,
-        owner: User,
+        owner: Principal,
         team_id: int,
         position_in: TeamOpenPositionCreate,
     ) -> TeamOpenPosition:
@@ -110,7 +122,7 @@ class TeamService:
     async def update_open_position(
         self,
         db: AsyncSession,
-        owner: User,
+        owner: Principal,
         position_id: int,
         position_in: TeamOpenPositionUpdate,
     ) -> TeamOpenPosition:
@@ -0,0 +1,59 @@
+"""
+Маленький дисковый кеш валидаторов HTTP (ETag / Last-Modified) по URL.
+
+Один JSON-файл на URL (имя - sha256 от URL), запись атомарная через
+os.replace, поэтому кеш можно делить между процессами одного хоста.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HttpValidatorCache:
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _read(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"HTTP cache: unreadable entry for {url}: {e}")
+            return None
+        return entry if entry.get("url") == url else None
+
+    def _write(self, url: str, entry: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({**entry, "url": url, "stored_at": time.time()}, f)
+            os.replace(tmp_path, self._path(url))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    async def get(self, url: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._read, url)
+
+    async def set(self, url: str, entry: dict) -> None:
+        try:
+            await asyncio.to_thread(self._write, url, entry)
+        except OSError as e:
+            logger.warning(f"HTTP cache: failed to store entry for {url}: {e}")
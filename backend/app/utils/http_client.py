@@ -3,12 +3,29 @@ HTTP клиент с таймаутами и автоматическими ре
 """
 import logging
 import asyncio
-from typing import Optional
+import random
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Optional, Union
 import httpx
 
+from app.utils.http_cache import HttpValidatorCache
+
+if TYPE_CHECKING:
+    from app.scrapers.transport import ScraperTransport
+
 logger = logging.getLogger(__name__)
 
 
+class NotModified:
+    """Сигнал 304 Not Modified: страница не менялась с прошлого успешного запроса"""
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
 class HttpClient:
     """HTTP клиент с таймаутами и ретраями"""
     
@@ -17,56 +34,132 @@ class HttpClient:
         timeout: float = 5.0,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        validator_cache: Optional[HttpValidatorCache] = None,
+        transport: Optional["ScraperTransport"] = None,
     ):
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.client = httpx.AsyncClient(
-            timeout=timeout,
-            follow_redirects=True,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            },
-        )
+        self.validator_cache = validator_cache
+        # Валидаторы ответов текущего запуска; сохраняются только через commit_validators()
+        self._pending_validators: dict[str, dict] = {}
+        # Ошибка последнего неудачного get() (для circuit breaker и логов)
+        self.last_error: Optional[BaseException] = None
+        # Статус последнего ответа и суммарный объем тел ответов (для scraper_runs)
+        self.last_status_code: Optional[int] = None
+        self.bytes_received = 0
+        # С общим транспортом клиент и пул соединений принадлежат ему, а не HttpClient
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        if transport is None:
+            self._client = httpx.AsyncClient(
+                timeout=timeout,
+                follow_redirects=True,
+                headers={
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                },
+            )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client if self._client is not None else self.transport.client
     
-    async def get(self, url: str) -> Optional[str]:
+    async def get(self, url: str, conditional: bool = False) -> Union[str, NotModified, None]:
         """
         Выполняет GET запрос с автоматическими ретраями
         
+        conditional=True: отправляет If-None-Match / If-Modified-Since из кеша
+        валидаторов и возвращает NOT_MODIFIED на 304.
+        
         Returns:
-            str: HTML содержимое страницы или None в случае ошибки
+            str: HTML содержимое страницы, NOT_MODIFIED или None в случае ошибки
         """
         last_error = None
+        headers = {}
+        if conditional and self.validator_cache is not None:
+            cached = await self.validator_cache.get(url)
+            if cached and cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached and cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
         
         for attempt in range(1, self.max_retries + 1):
             try:
                 logger.debug(f"Fetching {url} (attempt {attempt}/{self.max_retries})")
-                response = await self.client.get(url)
+                async with self.transport.slot(url) if self.transport else nullcontext():
+                    response = await self.client.get(url, headers=headers, timeout=self.timeout)
+                self.last_status_code = response.status_code
+                self.bytes_received += len(response.content)
+                if response.status_code == 304 and headers:
+                    logger.debug(f"Not modified: {url}")
+                    return NOT_MODIFIED
                 response.raise_for_status()
+                if conditional:
+                    self._remember_validators(url, response)
                 return response.text
             except httpx.TimeoutException as e:
                 last_error = e
                 logger.warning(f"Timeout fetching {url} (attempt {attempt}/{self.max_retries})")
                 if attempt < self.max_retries:
-                    await asyncio.sleep(self.retry_delay * attempt)
+                    await asyncio.sleep(self._backoff(attempt))
+            except httpx.HTTPStatusError as e:
+                last_error = e
+                logger.warning(f"HTTP error fetching {url} (attempt {attempt}/{self.max_retries}): {e}")
+                status_code = e.response.status_code
+                # 4xx (кроме 429) повтором не исправить
+                if 400 <= status_code < 500 and status_code != 429:
+                    break
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff(attempt, e.response.headers.get("Retry-After")))
             except httpx.HTTPError as e:
                 last_error = e
                 logger.warning(f"HTTP error fetching {url} (attempt {attempt}/{self.max_retries}): {e}")
                 if attempt < self.max_retries:
-                    await asyncio.sleep(self.retry_delay * attempt)
+                    await asyncio.sleep(self._backoff(attempt))
             except Exception as e:
                 last_error = e
                 logger.error(f"Unexpected error fetching {url} (attempt {attempt}/{self.max_retries}): {e}")
                 if attempt < self.max_retries:
-                    await asyncio.sleep(self.retry_delay * attempt)
+                    await asyncio.sleep(self._backoff(attempt))
         
-        logger.error(f"Failed to fetch {url} after {self.max_retries} attempts: {last_error}")
+        self.last_error = last_error
+        logger.error(f"Failed to fetch {url} after {attempt} attempt(s): {last_error}")
         return None
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Экспоненциальная пауза с джиттером; Retry-After сервера уважаем (до 30 с)"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+        return self.retry_delay * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
     
+    def _remember_validators(self, url: str, response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._pending_validators[url] = {"etag": etag, "last_modified": last_modified}
+
+    def discard_validators(self, url: str) -> None:
+        """Забывает валидаторы страницы, которую не удалось обработать, - в следующий раз она скачается целиком"""
+        self._pending_validators.pop(url, None)
+
+    async def commit_validators(self) -> None:
+        """
+        Сохраняет валидаторы полученных страниц в дисковый кеш.
+        Вызывается после успешной обработки контента: если парсинг или запись
+        в БД упали, следующий запуск скачает страницу целиком.
+        """
+        pending, self._pending_validators = self._pending_validators, {}
+        if self.validator_cache is None:
+            return
+        for url, entry in pending.items():
+            await self.validator_cache.set(url, entry)
+
     async def close(self):
-        """Закрывает HTTP клиент"""
+        """Закрывает HTTP клиент (общий транспорт закрывается в stop_scheduler)"""
+        if self._client is None:
+            return
         try:
-            await self.client.aclose()
+            await self._client.aclose()
         except Exception as e:
             logger.warning(f"Error closing HTTP client: {e}")
 
@@ -0,0 +1,57 @@
+"""
+Замена HttpClient, отдающая записанные HTML-снапшоты вместо живых сайтов.
+
+Используется бенчмарком парсеров (scripts/bench_scraper_parse.py) и для
+локальной отладки скраперов без сети. Снапшоты описывает manifest.json:
+
+    {"sources": {"AstanaHub": {"url": "https://...", "file": "AstanaHub.html", ...}}}
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+from app.utils.http_client import NotModified
+
+logger = logging.getLogger(__name__)
+
+
+class FixtureNotFound(LookupError):
+    pass
+
+
+class ReplayHttpClient:
+    """Тот же интерфейс, что у HttpClient, но ответы - файлы с диска"""
+
+    def __init__(self, pages: dict[str, Path]) -> None:
+        self.pages = pages
+        self.max_retries = 1
+        self.last_error: Optional[BaseException] = None
+        self.last_status_code: Optional[int] = None
+        self.bytes_received = 0
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, Path]) -> "ReplayHttpClient":
+        directory = Path(directory)
+        manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+        return cls(
+            {entry["url"]: directory / entry["file"] for entry in manifest["sources"].values()}
+        )
+
+    async def get(self, url: str, conditional: bool = False) -> Union[str, NotModified, None]:
+        path = self.pages.get(url)
+        if path is None or not path.exists():
+            self.last_error = FixtureNotFound(url)
+            self.last_status_code = 404
+            logger.warning(f"Replay: no fixture for {url}")
+            return None
+        html = path.read_text(encoding="utf-8")
+        self.last_status_code = 200
+        self.bytes_received += len(html.encode("utf-8"))
+        return html
+
+    async def commit_validators(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
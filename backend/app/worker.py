@@ -0,0 +1,82 @@
+"""
+Фоновый воркер EventHub: python -m app.worker
+
+- планировщик (скраперы по расписанию и обслуживание); задачи ставит только
+  лидер среди реплик воркера - см. app/core/leader.py;
+- потребитель очереди job_queue: задачи, поставленные API (ручной запуск
+  парсинга и т.п.).
+
+Скраперы, lxml, пул парсинга и APScheduler живут только здесь - API-процесс
+их не импортирует и масштабируется отдельно.
+"""
+import asyncio
+import logging
+import signal
+from typing import Awaitable, Callable
+
+from app.core.config import get_settings
+from app.core.job_queue import QueuedJob, job_queue
+from app.cron.scraper_job import manual_scrape_job
+from app.scrapers.scheduler import start_scheduler, stop_scheduler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# kind задачи очереди -> обработчик (аргументы - QueuedJob.args)
+HANDLERS: dict[str, Callable[..., Awaitable[None]]] = {
+    "scrape_all": manual_scrape_job,
+}
+
+
+async def _handle(job: QueuedJob) -> None:
+    handler = HANDLERS.get(job.kind)
+    if handler is None:
+        logger.error(f"No handler for job kind {job.kind!r}, dropping")
+        return
+    try:
+        await handler(**job.args)
+    except Exception as e:
+        logger.error(f"Job {job.kind} failed: {e}", exc_info=True)
+
+
+async def consume(stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        try:
+            job = await job_queue.pop(timeout=settings.worker.queue_poll_seconds)
+        except Exception as e:
+            logger.warning(f"Job queue unavailable: {e}")
+            await asyncio.sleep(settings.worker.queue_poll_seconds)
+            continue
+        if job is not None:
+            await _handle(job)
+
+
+async def main() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info("Starting EventHub worker...")
+    await start_scheduler()
+    consumers = [
+        asyncio.create_task(consume(stop), name=f"job-consumer-{i}")
+        for i in range(settings.worker.queue_concurrency)
+    ]
+    await stop.wait()
+
+    logger.info("Shutting down EventHub worker...")
+    # Незавершенные задачи очереди отменяются (ручной запуск отпускает single-flight)
+    for task in consumers:
+        task.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    await stop_scheduler()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк: p99 латентность GET /events/ во время шквала логинов на тот же воркер.
+
+Запуск (бэкенд должен быть запущен одним воркером):
+    python scripts/bench_login_latency.py --base-url http://localhost:8000 \
+        --email user@example.com --password secret --logins 200 --concurrency 20
+
+Скрипт сначала меряет /events/ без нагрузки, затем параллельно с логинами,
+и печатает p50/p95/p99 для обоих прогонов и число ответов 503 на логин.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(label: str, samples: list[float]) -> None:
+    if not samples:
+        print(f"{label}: no samples")
+        return
+    print(
+        f"{label}: n={len(samples)} "
+        f"mean={statistics.mean(samples):.1f}ms "
+        f"p50={_percentile(samples, 0.50):.1f}ms "
+        f"p95={_percentile(samples, 0.95):.1f}ms "
+        f"p99={_percentile(samples, 0.99):.1f}ms"
+    )
+
+
+async def _probe_events(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list[float]:
+    samples: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/events/", params={"limit": 20})
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def _hammer_logins(
+    client: httpx.AsyncClient, email: str, password: str, total: int, concurrency: int
+) -> dict[int, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: dict[int, int] = {}
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.post(
+                "/auth/login", data={"username": email, "password": password}
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return statuses
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30.0) as client:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_events(client, stop, args.probe_interval))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        _report("GET /events/ (idle)", await probe)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_events(client, stop, args.probe_interval))
+        started = time.perf_counter()
+        statuses = await _hammer_logins(
+            client, args.email, args.password, args.logins, args.concurrency
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        _report("GET /events/ (during logins)", await probe)
+        print(f"logins: {args.logins} in {elapsed:.1f}s, statuses={statuses}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Офлайн-бенчмарк парсеров скраперов на записанных HTML-снапшотах.
+
+Страницы отдает ReplayHttpClient (scripts/scraper_fixtures/manifest.json),
+parse() выполняется в текущем процессе. Для каждого источника печатает
+медиану и p95 времени парсинга, число событий, events/sec и пиковую
+память (tracemalloc), затем сравнивает с baseline.json.
+
+Запуск:
+    python scripts/bench_scraper_parse.py [--iterations 20] [--only AstanaHub]
+    python scripts/bench_scraper_parse.py --update-baseline
+
+Код выхода 1, если медиана выросла больше чем на --tolerance или парсер
+стал находить меньше событий, чем в baseline.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.scraper_service import build_scrapers
+from app.utils.replay_http_client import ReplayHttpClient
+
+FIXTURES_DIR = Path(__file__).parent / "scraper_fixtures"
+BASELINE_PATH = FIXTURES_DIR / "baseline.json"
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _measure(scraper, html: str, iterations: int) -> dict:
+    scraper.parse(html)  # прогрев: импорты, кеши регулярок
+    samples = []
+    events = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        events = scraper.parse(html)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    # Память меряем отдельным прогоном: tracemalloc сильно замедляет парсинг
+    tracemalloc.start()
+    scraper.parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median_ms = statistics.median(samples)
+    return {
+        "html_kb": round(len(html.encode("utf-8")) / 1024, 1),
+        "events": len(events),
+        "median_ms": round(median_ms, 2),
+        "p95_ms": round(_percentile(samples, 0.95), 2),
+        "events_per_sec": round(len(events) / (median_ms / 1000), 1) if median_ms else 0.0,
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="имена источников (по умолчанию все)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="допустимый рост медианы (0.5 = +50%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    replay = ReplayHttpClient.from_directory(args.fixtures)
+    baseline_path = args.fixtures / BASELINE_PATH.name
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+
+    results: dict[str, dict] = {}
+    for scraper in build_scrapers():
+        if args.only and scraper.name not in args.only:
+            continue
+        scraper.http_client = replay
+        html = await scraper.fetch_html(scraper.base_url)
+        if not isinstance(html, str):
+            print(f"SKIP {scraper.name}: no fixture for {scraper.base_url}")
+            continue
+        results[scraper.name] = _measure(scraper, html, args.iterations)
+
+    header = f"{'source':<12} {'html_kb':>8} {'events':>7} {'median_ms':>10} {'p95_ms':>8} {'events/s':>10} {'peak_mb':>8}  vs baseline"
+    print(header)
+    print("-" * len(header))
+    failures = 0
+    for name, r in results.items():
+        base = baseline.get(name)
+        verdict = "no baseline"
+        if base:
+            ratio = r["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+            verdict = f"x{ratio:.2f}"
+            if ratio > 1 + args.tolerance:
+                verdict += " REGRESSION (time)"
+                failures += 1
+            if r["events"] < base["events"]:
+                verdict += f" REGRESSION (events {base['events']} -> {r['events']})"
+                failures += 1
+        print(
+            f"{name:<12} {r['html_kb']:>8} {r['events']:>7} {r['median_ms']:>10} "
+            f"{r['p95_ms']:>8} {r['events_per_sec']:>10} {r['peak_mb']:>8}  {verdict}"
+        )
+
+    if args.update_baseline:
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+
+    print(f"\n{failures} regression(s)" if failures else "\nNo regressions")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Проверка планов запросов репозиториев на реалистичном объеме данных.
+
+Скрипт наполняет локальную БД (после `alembic upgrade head`) синтетическими
+данными внутри транзакции, выполняет ANALYZE, вызывает реальные методы
+репозиториев, перехватывает их SQL и проверяет через EXPLAIN, что каждый
+запрос использует ожидаемый индекс. В конце транзакция откатывается.
+
+Запуск:
+    python scripts/check_query_plans.py [--database-url postgresql+asyncpg://...] [--allow-skip]
+
+Код выхода 1, если хотя бы один план регрессировал (например, Seq Scan) или
+проверка не выполнилась (метод не выполнил SELECT - SKIP); с --allow-skip
+пропуски не считаются ошибкой.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.core.config import get_settings
+from app.models.internship import SlotStatus
+from app.repositories.chat_repository import ChatRepository, MessageRepository
+from app.repositories.event_repository import EventRegistrationRepository, EventRepository
+from app.repositories.internship_repository import InternshipSlotRepository
+
+
+INDEX_NODE_TYPES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+SEED_SQL = [
+    """
+    INSERT INTO users (email, hashed_password, role, is_active)
+    SELECT 'plan-' || g || '-' || :tag || '@example.com', 'x', 'user', true
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO events (title, description, date_start, city, is_online, type, organizer_id, tags, source)
+    SELECT
+        'plan event ' || g || ' ' || :tag,
+        'Описание события ' || g,
+        now() + ((g % 730) - 365) * interval '1 day' + g * interval '1 second',
+        (ARRAY['Астана', 'Алматы', 'Шымкент', 'Караганда', 'Актобе', 'Павлодар', 'Атырау', 'Костанай'])[g % 8 + 1],
+        g % 3 = 0,
+        (ARRAY['hackathon', 'quest', 'tournament', 'seminar', 'other'])[g % 5 + 1],
+        (SELECT min(id) FROM users WHERE email LIKE 'plan-%-' || :tag || '@example.com') + g % :users,
+        ARRAY['tag' || (g % 500), 'tag' || (g % 37)],
+        CASE WHEN g % 4 = 0 THEN 'internal' ELSE 'external' END
+    FROM generate_series(1, :events) AS g
+    """,
+    """
+    INSERT INTO event_registrations (event_id, user_id, status)
+    SELECT e.min_id + g % :events, u.min_id + g % :users, 'registered'
+    FROM generate_series(1, :registrations) AS g,
+         (SELECT min(id) AS min_id FROM events WHERE title LIKE 'plan event % ' || :tag) AS e,
+         (SELECT min(id) AS min_id FROM users WHERE email LIKE 'plan-%-' || :tag || '@example.com') AS u
+    """,
+    """
+    INSERT INTO chats (type) SELECT 'personal' FROM generate_series(1, :chats)
+    """,
+    """
+    INSERT INTO chat_participants (chat_id, user_id)
+    SELECT c.id, u.min_id + (c.id * 2 + side) % :users
+    FROM (SELECT id FROM chats ORDER BY id DESC LIMIT :chats) AS c,
+         (SELECT min(id) AS min_id FROM users WHERE email LIKE 'plan-%-' || :tag || '@example.com') AS u,
+         generate_series(0, 1) AS side
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO messages (chat_id, sender_id, content, created_at, updated_at)
+    SELECT c.max_id - g % :chats, u.min_id + g % :users, 'message ' || g,
+           now() - g * interval '1 second', now()
+    FROM generate_series(1, :messages) AS g,
+         (SELECT max(id) AS max_id FROM chats) AS c,
+         (SELECT min(id) AS min_id FROM users WHERE email LIKE 'plan-%-' || :tag || '@example.com') AS u
+    """,
+    """
+    INSERT INTO internship_slots (
+        title, description, company_id, operation, required_skills,
+        slot_start, slot_end, duration_hours, address, city, status,
+        max_applicants, current_applicants
+    )
+    SELECT
+        'slot ' || g, 'desc', u.min_id + g % :users, 'op',
+        ARRAY['skill' || (g % 300), 'skill' || (g % 41)],
+        now() + (g % 365) * interval '1 day',
+        now() + (g % 365) * interval '1 day' + interval '3 hours',
+        3, 'addr', 'Астана',
+        (ARRAY['draft', 'published', 'filled', 'completed', 'cancelled'])[g % 5 + 1],
+        5, g % 7
+    FROM generate_series(1, :slots) AS g,
+         (SELECT min(id) AS min_id FROM users WHERE email LIKE 'plan-%-' || :tag || '@example.com') AS u
+    """,
+]
+
+VOLUMES = {
+    "users": 5_000,
+    "events": 100_000,
+    "registrations": 200_000,
+    "chats": 20_000,
+    "messages": 300_000,
+    "slots": 30_000,
+}
+
+
+def _walk(plan: dict[str, Any]):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def _summarize(plan: dict[str, Any]) -> list[str]:
+    return [
+        f"{node['Node Type']}({node.get('Index Name') or node.get('Relation Name') or ''})"
+        for node in _walk(plan)
+    ]
+
+
+async def _seed(conn: AsyncConnection, tag: str) -> None:
+    params = {"tag": tag, **VOLUMES}
+    for sql in SEED_SQL:
+        await conn.execute(text(sql), params)
+    await conn.execute(text("ANALYZE"))
+
+
+async def _explain(conn: AsyncConnection, statement: str, parameters: Any) -> dict[str, Any]:
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    raw = result.scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return plan[0]["Plan"]
+
+
+async def _ids(conn: AsyncConnection, tag: str) -> dict[str, int]:
+    row = (
+        await conn.execute(
+            text(
+                """
+                SELECT
+                    (SELECT min(id) FROM events WHERE title LIKE 'plan event % ' || :tag) AS event_id,
+                    (SELECT min(id) FROM users WHERE email LIKE 'plan-%-' || :tag || '@example.com') AS user_id,
+                    (SELECT max(id) FROM chats) AS chat_id
+                """
+            ),
+            {"tag": tag},
+        )
+    ).one()
+    return {"event_id": row.event_id, "user_id": row.user_id, "chat_id": row.chat_id}
+
+
+def _cases(ids: dict[str, int]) -> list[tuple[str, Callable[[AsyncSession], Awaitable[Any]], set[str]]]:
+    events = EventRepository()
+    registrations = EventRegistrationRepository()
+    chats = ChatRepository()
+    messages = MessageRepository()
+    slots = InternshipSlotRepository()
+    after = (datetime.now(timezone.utc) + timedelta(days=30), 0)
+    return [
+        (
+            "EventRepository.search(city, type)",
+            lambda db: events.search(db, city="Алматы", type="hackathon", limit=50),
+            {"ix_events_city_type_date_start"},
+        ),
+        (
+            "EventRepository.search(cursor)",
+            lambda db: events.search(db, limit=50, after=after),
+            {"ix_events_date_start_id"},
+        ),
+        (
+            "EventRepository.search(tags)",
+            lambda db: events.search(db, tags=["tag42"], limit=50),
+            {"ix_events_tags", "ix_events_date_start_id"},
+        ),
+        (
+            "EventRepository.list_by_organizer",
+            lambda db: events.list_by_organizer(db, ids["user_id"]),
+            {"ix_events_organizer_id_date_start"},
+        ),
+        (
+            "EventRepository.get_participants",
+            lambda db: events.get_participants(db, ids["event_id"]),
+            {"ix_event_registrations_event_id_user_id"},
+        ),
+        (
+            "EventRegistrationRepository.get_by_event_and_user",
+            lambda db: registrations.get_by_event_and_user(db, ids["event_id"], ids["user_id"]),
+            {"ix_event_registrations_event_id_user_id"},
+        ),
+        (
+            "ChatRepository.get_personal_chat",
+            lambda db: chats.get_personal_chat(db, ids["user_id"], ids["user_id"] + 1),
+            {"ix_chat_participants_user_id"},
+        ),
+        (
+            "MessageRepository.list_by_chat",
+            lambda db: messages.list_by_chat(db, ids["chat_id"], limit=50),
+            {"ix_messages_chat_id_created_at"},
+        ),
+        (
+            "InternshipSlotRepository.get_available_slots",
+            lambda db: slots.get_available_slots(db),
+            {"ix_internship_slots_published_slot_start"},
+        ),
+        (
+            "InternshipSlotRepository.search(status)",
+            lambda db: slots.search(db, status=SlotStatus.PUBLISHED, limit=50),
+            {"ix_internship_slots_published_slot_start", "ix_internship_slots_status_slot_start"},
+        ),
+        (
+            "InternshipSlotRepository.search(skills)",
+            lambda db: slots.search(db, skills=["skill7"], limit=50),
+            {"ix_internship_slots_required_skills", "ix_internship_slots_published_slot_start", "ix_internship_slots_status_slot_start"},
+        ),
+    ]
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=get_settings().database.url)
+    parser.add_argument("--allow-skip", action="store_true", help="не считать ошибкой непроверенные запросы (SKIP)")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    captured: list[tuple[str, Any]] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    tag = uuid.uuid4().hex[:8]
+    failures = 0
+    skipped = 0
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            print(f"Seeding {VOLUMES} ...")
+            await _seed(conn, tag)
+            ids = await _ids(conn, tag)
+            db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            for name, call, expected in _cases(ids):
+                captured.clear()
+                await call(db)
+                if not captured:
+                    print(f"SKIP {name}: no SELECT captured")
+                    skipped += 1
+                    continue
+                # Первый SELECT - основной запрос метода (selectinload идет следом)
+                statement, parameters = captured[0]
+                plan = await _explain(conn, statement, parameters)
+                used = {
+                    node.get("Index Name")
+                    for node in _walk(plan)
+                    if node["Node Type"] in INDEX_NODE_TYPES
+                }
+                ok = bool(used & expected)
+                failures += 0 if ok else 1
+                print(f"{'OK  ' if ok else 'FAIL'} {name}: {' -> '.join(_summarize(plan))}")
+            await db.close()
+        finally:
+            await trans.rollback()
+    await engine.dispose()
+
+    print(f"\n{failures} plan regression(s)" if failures else "\nAll checked plans use the expected indexes")
+    if skipped:
+        print(f"{skipped} query(ies) not checked" + (" (allowed by --allow-skip)" if args.allow_skip else ""))
+        if not args.allow_skip:
+            failures += skipped
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
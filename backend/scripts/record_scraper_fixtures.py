@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Записывает HTML-снапшоты страниц источников для офлайн-бенчмарка парсеров.
+
+Для каждого скрапера скачивает его base_url и сохраняет в
+scripts/scraper_fixtures/<Source>.html, обновляя manifest.json.
+Снапшоты затем отдает ReplayHttpClient (app/utils/replay_http_client.py).
+
+Запуск (нужна сеть):
+    python scripts/record_scraper_fixtures.py [--only AstanaHub NU]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.scraper_service import build_scrapers
+from app.utils.http_client import HttpClient
+
+FIXTURES_DIR = Path(__file__).parent / "scraper_fixtures"
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="*", help="имена источников (по умолчанию все)")
+    parser.add_argument("--output", type=Path, default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    manifest_path = args.output / "manifest.json"
+    manifest = (
+        json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest_path.exists()
+        else {"sources": {}}
+    )
+
+    client = HttpClient(timeout=15.0, max_retries=2)
+    failures = 0
+    try:
+        for scraper in build_scrapers():
+            if args.only and scraper.name not in args.only:
+                continue
+            html = await client.get(scraper.base_url)
+            if not html:
+                print(f"FAIL {scraper.name}: {client.last_error}")
+                failures += 1
+                continue
+            file_name = f"{scraper.name}.html"
+            (args.output / file_name).write_text(html, encoding="utf-8")
+            manifest["sources"][scraper.name] = {
+                "url": scraper.base_url,
+                "file": file_name,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "synthetic": False,
+            }
+            print(f"OK   {scraper.name}: {len(html)} chars -> {file_name}")
+    finally:
+        await client.close()
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
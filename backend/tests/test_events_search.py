@@ -0,0 +1,23 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routers import events
+from app.core.db import get_db
+from app.core.pagination import encode_cursor
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(events.router)
+
+    async def no_db():
+        yield None
+
+    app.dependency_overrides[get_db] = no_db
+    return TestClient(app)
+
+
+def test_cursor_with_q_is_rejected():
+    cursor = encode_cursor("events", ["2026-01-01", 1])
+    response = _client().get("/events/", params={"q": "python", "cursor": cursor})
+    assert response.status_code == 400
@@ -0,0 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.user import UserRole
+from app.schemas.user import UserUpdate
+
+
+@pytest.mark.parametrize("body", [{"role": None}, {"is_active": None}])
+def test_explicit_null_is_rejected(body):
+    with pytest.raises(ValidationError):
+        UserUpdate.model_validate(body)
+
+
+def test_omitted_fields_are_not_set():
+    data = UserUpdate.model_validate({"is_active": False}).dict(exclude_unset=True)
+    assert data == {"is_active": False}
+
+
+def test_role_is_parsed():
+    assert UserUpdate.model_validate({"role": "admin"}).role == UserRole.ADMIN
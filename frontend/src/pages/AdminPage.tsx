@@ -113,10 +113,21 @@ export function AdminPage() {
   const handleRunScraper = async () => {
     setScraping(true);
     try {
-      const response = await axios.post(`${API_URL}/admin/run-scraper`, {}, {
+      // Запуск не ждет парсинга: получаем задачу и опрашиваем ее статус
+      let { data: job } = await axios.post(`${API_URL}/admin/run-scraper`, {}, {
         headers: getAuthHeaders(),
       });
-      alert(`Парсинг завершен! Обработано событий: ${Object.values(response.data).reduce((a: number, b: number) => a + b, 0)}`);
+      while (job.status === "queued" || job.status === "running") {
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+        ({ data: job } = await axios.get(`${API_URL}/admin/scrape-jobs/${job.id}`, {
+          headers: getAuthHeaders(),
+        }));
+      }
+      if (job.status === "failed") {
+        alert(`Ошибка парсинга: ${job.error || "неизвестная ошибка"}`);
+      } else {
+        alert(`Парсинг завершен! Обработано событий: ${job.total}`);
+      }
       if (activeTab === "events") {
         fetchEvents();
       }
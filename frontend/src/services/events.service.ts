@@ -83,13 +83,30 @@ export async function updateEvent(id: number, data: Partial<Event>): Promise<Eve
   return response.data;
 }
 
-// СРОЧНЫЙ запуск парсинга (для дедлайна)
+export interface ScrapeJob {
+  id: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  results: Record<string, number>;
+  total: number;
+  error: string | null;
+  attached: number;
+  coalesced: boolean;
+}
+
+// СРОЧНЫЙ запуск парсинга: сервер возвращает задачу сразу, ждем ее завершения опросом статуса
 export async function scrapeEventsNow(): Promise<{ success: boolean; message: string; results: Record<string, number>; total: number }> {
   try {
-    console.log('🚀 scrapeEventsNow: Starting urgent scraping...');
-    const response = await api.post<{ success: boolean; message: string; results: Record<string, number>; total: number }>("/events/scrape-now", {}, { timeout: 60000 });
-    console.log('✅ scrapeEventsNow: Scraping completed!', response.data);
-    return response.data;
+    let { data: job } = await api.post<ScrapeJob>("/events/scrape-now", {});
+    while (job.status === "queued" || job.status === "running") {
+      await new Promise((resolve) => setTimeout(resolve, 3000));
+      ({ data: job } = await api.get<ScrapeJob>(`/events/scrape-now/${job.id}`));
+    }
+    return {
+      success: job.status === "succeeded",
+      message: job.status === "succeeded" ? "Парсинг завершен" : `Ошибка при парсинге: ${job.error}`,
+      results: job.results,
+      total: job.total
+    };
   } catch (error: any) {
     console.error("❌ scrapeEventsNow: Error:", error);
     return {